@@ -0,0 +1,43 @@
+"""
+Microbenchmark for cache fencing (``Cache.file`` / ``Cache.tex_path``).
+
+Times the fencing work ``TeXEmitter.write_path`` does per declaration: two
+``Cache.file`` calls for the TeX and JSON artifacts plus two ``tex_path``
+conversions for the glue. Run from the repository root::
+
+    python benchmarks/bench_cache_fence.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+from lpm_paths.cache import Cache  # noqa: E402
+
+ROUNDS = 5
+NUMBER = 2000
+
+
+def declare_once(cache: Cache, i: int) -> None:
+    tex = cache.file(f"path-demo_{i}-0123456789abcdef.tex")
+    json = cache.file(f"path-demo_{i}-0123456789abcdef.json")
+    cache.tex_path(tex)
+    cache.tex_path(json)
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        cache = Cache.make("lp-cache")
+        counter = iter(range(10 ** 9))
+        best = min(timeit.repeat(lambda: declare_once(cache, next(counter) % 100), number=NUMBER, repeat=ROUNDS))
+        os.chdir(Path(__file__).resolve().parents[1])
+    print(f"fence per declaration: {best / NUMBER * 1e6:.1f} us (best of {ROUNDS} x {NUMBER})")
+
+
+if __name__ == "__main__":
+    main()
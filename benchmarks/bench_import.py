@@ -0,0 +1,67 @@
+"""
+Import-time budget for the ``lpm_paths`` package.
+
+Starts fresh interpreters with ``-X importtime`` and reads the cumulative
+time spent importing a module (default ``lpm_paths``), so interpreter
+startup itself is not counted. Exits with status 1 when the median exceeds
+the budget. Run from the repository root::
+
+    python benchmarks/bench_import.py [--module lpm_paths.client] [--budget-ms 25]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+PYTHON_DIR = Path(__file__).resolve().parents[1] / "python"
+
+ROUNDS = 7
+BUDGET_MS = 25.0
+
+
+def import_time_us(module: str) -> int:
+    """Return the cumulative import time of ``module`` in a cold interpreter, in microseconds."""
+    env = dict(os.environ, PYTHONPATH=str(PYTHON_DIR), PYTHONDONTWRITEBYTECODE="")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    for line in reversed(proc.stderr.splitlines()):
+        # "import time: self [us] | cumulative | imported package"
+        parts = [part.strip() for part in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            return int(parts[1])
+    raise RuntimeError(f"{module} did not appear in the import log")
+
+
+def measure(module: str, rounds: int = ROUNDS) -> List[int]:
+    """Time ``rounds`` cold imports, after one warm-up that compiles bytecode."""
+    import_time_us(module)
+    return [import_time_us(module) for _ in range(rounds)]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--module", default="lpm_paths")
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS)
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    args = parser.parse_args(argv)
+    times = measure(args.module, args.rounds)
+    median = statistics.median(times) / 1000
+    verdict = "ok" if median <= args.budget_ms else "OVER BUDGET"
+    print(
+        f"import {args.module}: median {median:.1f} ms, min {min(times) / 1000:.1f} ms "
+        f"({args.rounds} runs; budget {args.budget_ms:.0f} ms) {verdict}"
+    )
+    return 0 if median <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
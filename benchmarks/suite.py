@@ -0,0 +1,360 @@
+"""
+Benchmark suite for the core hot paths, with stored baselines.
+
+Covers ``LatticePath.from_bits`` (parsing and derived annotations),
+``between_polygon``, ``key_of``, ``structured_key``, ``sanitize_name`` and
+``TeXEmitter.write_path`` / ``write_between`` against a cold (empty) and a
+warm (already populated) cache, for path lengths from 10 to 10^6 steps.
+Run from the repository root::
+
+    python benchmarks/suite.py run [--quick] [--filter REGEX] [--output FILE]
+    python benchmarks/suite.py compare BASELINE CURRENT [--threshold 1.25]
+    python benchmarks/suite.py run --quick --compare benchmarks/baselines/quick.json
+
+``run`` writes a JSON document with one entry per case (best and median time
+per call, in seconds, plus the time of a fixed calibration loop measured
+around the case). ``compare`` matches cases by name and exits with
+status 1 if any case is slower than ``threshold`` times its baseline; pass
+``--compare`` to ``run`` to do both in one go, re-running regressed cases
+(``--retries``) before reporting them. Baselines are machine
+specific: record one with ``run --output`` on the machine you compare on.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+from lpm_paths.between import between_polygon  # noqa: E402
+from lpm_paths.cache import Cache  # noqa: E402
+from lpm_paths.emitters.tex import TeXEmitter  # noqa: E402
+from lpm_paths.hashing import key_of, structured_key  # noqa: E402
+from lpm_paths.sanitize import sanitize_name  # noqa: E402
+from lpm_paths.types import LatticePath  # noqa: E402
+from lpm_paths.version import EMITTER_VERSION, __version__  # noqa: E402
+
+FULL_SIZES = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+QUICK_SIZES = (10, 100, 1_000, 10_000)
+NAME_SIZES = (10, 100, 1_000)
+
+# Stop repeating a case once it has run this long (seconds).
+TIME_BUDGET = 0.5
+MAX_REPEATS = 25
+MIN_REPEATS = 3
+
+# Default slowdown ratio reported as a regression.
+THRESHOLD = 1.25
+# Differences below this many seconds per call are never regressions.
+NOISE_FLOOR = 2e-6
+
+# Builds the timed callable; not timed itself. Cold cases get a fresh setup
+# (an empty cache) for every repeat.
+Setup = Callable[[], Callable[[], object]]
+
+
+class Case(NamedTuple):
+    name: str
+    setup: Setup
+
+
+def _random_bits(n: int, seed: int) -> str:
+    rng = random.Random(seed)
+    bits = ["0"] * (n - n // 2) + ["1"] * (n // 2)
+    rng.shuffle(bits)
+    return "".join(bits)
+
+
+def _lowest(bits: str) -> str:
+    ones = bits.count("1")
+    return "0" * (len(bits) - ones) + "1" * ones
+
+
+def _derive(bits: str) -> None:
+    lp = LatticePath.from_bits(bits)
+    lp.coords, lp.upmarks, lp.corners, lp.insideCorners, lp.ellmap
+
+
+class _Scratch:
+    """Temporary working directories for emitter cases, removed at exit."""
+
+    def __init__(self) -> None:
+        self.root = tempfile.mkdtemp(prefix="lpm-bench-")
+        self.count = 0
+
+    def cache(self) -> Cache:
+        self.count += 1
+        return Cache.make(os.path.join(self.root, f"cache-{self.count}"))
+
+    def close(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def iter_cases(sizes: Tuple[int, ...], scratch: _Scratch) -> Iterator[Case]:
+    """Yield every benchmark case for the given path lengths."""
+    for n in sizes:
+        bits = _random_bits(n, seed=n)
+        low = _lowest(bits)
+        yield Case(f"from_bits/{n}", lambda bits=bits: lambda: LatticePath.from_bits(bits))
+        yield Case(f"from_bits+annotations/{n}", lambda bits=bits: lambda: _derive(bits))
+        yield Case(f"between_polygon/{n}", lambda bits=bits, low=low: lambda: between_polygon(low, bits))
+        payload = {"op": "path", "bits": bits, "name": "bench", "ver": EMITTER_VERSION}
+        yield Case(f"key_of/{n}", lambda payload=payload: lambda: key_of(payload))
+        fields = {"op": "path_geometry", "ver": EMITTER_VERSION}
+        yield Case(f"structured_key/{n}", lambda bits=bits: lambda: structured_key(fields, {"bits": bits}))
+
+        def cold_path(bits: str = bits) -> Callable[[], object]:
+            emitter = TeXEmitter(scratch.cache())
+            return lambda: emitter.write_path(bits, "bench")
+
+        def warm_path(bits: str = bits) -> Callable[[], object]:
+            emitter = TeXEmitter(scratch.cache())
+            emitter.write_path(bits, "bench")
+            return lambda: emitter.write_path(bits, "bench")
+
+        def cold_between(bits: str = bits, low: str = low) -> Callable[[], object]:
+            emitter = TeXEmitter(scratch.cache())
+            return lambda: emitter.write_between(low, bits, "L", "U")
+
+        def warm_between(bits: str = bits, low: str = low) -> Callable[[], object]:
+            emitter = TeXEmitter(scratch.cache())
+            emitter.write_between(low, bits, "L", "U")
+            return lambda: emitter.write_between(low, bits, "L", "U")
+
+        yield Case(f"write_path/cold/{n}", cold_path)
+        yield Case(f"write_path/warm/{n}", warm_path)
+        yield Case(f"write_between/cold/{n}", cold_between)
+        yield Case(f"write_between/warm/{n}", warm_between)
+    for n in NAME_SIZES:
+        name = ("Grassmannian path #" * n)[:n]
+        yield Case(f"sanitize_name/{n}", lambda name=name: lambda: sanitize_name(name))
+
+
+def calibrate() -> float:
+    """
+    Time a fixed pure-Python workload (best of a few runs, in seconds).
+
+    Stored next to every case so ``compare`` can factor out machine-wide
+    slowdowns (frequency scaling, noisy neighbours) between two runs.
+    """
+    best = float("inf")
+    for _ in range(5):
+        start = time.perf_counter()
+        total = 0
+        for i in range(20_000):
+            total += i * i
+        "".join(str(i) for i in range(2_000))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def time_case(case: Case) -> Dict[str, float]:
+    """Time one case: ``number`` calls per repeat, a fresh setup per repeat for cold cases."""
+    cold = "/cold/" in case.name
+    calibration = calibrate()
+    func = case.setup()
+    start = time.perf_counter()
+    func()
+    once = time.perf_counter() - start
+    # Calls per repeat: about 10 ms of work, but a single call for slow cases
+    # and for cold cases, where every call must see an empty cache.
+    number = 1 if cold else max(1, min(10_000, int(0.01 / once))) if once > 0 else 10_000
+    samples: List[float] = [once] if cold else []
+    spent = once
+    while len(samples) < MIN_REPEATS or (spent < TIME_BUDGET and len(samples) < MAX_REPEATS):
+        if cold:
+            func = case.setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        samples.append(elapsed / number)
+        spent += elapsed
+    return {
+        "best": min(samples),
+        "median": statistics.median(samples),
+        "repeats": len(samples),
+        "number": number,
+        "calibration": min(calibration, calibrate()),
+    }
+
+
+def run(quick: bool = False, pattern: Optional[str] = None, echo: bool = True) -> Dict[str, object]:
+    """
+    Run the suite and return the results document.
+
+    Parameters
+    ----------
+    quick : bool, optional
+        Only use path lengths up to 10^4.
+    pattern : str or None, optional
+        Regular expression; only cases whose name matches are run.
+    echo : bool, optional
+        Print one line per case as it finishes.
+
+    Returns
+    -------
+    dict
+        ``{"meta": {...}, "results": {case: {"best", "median", "repeats", "number", "calibration"}}}``.
+    """
+    scratch = _Scratch()
+    results: Dict[str, Dict[str, float]] = {}
+    cwd = os.getcwd()
+    try:
+        os.chdir(scratch.root)
+        for case in iter_cases(QUICK_SIZES if quick else FULL_SIZES, scratch):
+            if pattern and not re.search(pattern, case.name):
+                continue
+            results[case.name] = time_case(case)
+            if echo:
+                print(f"{case.name:<32} {_format_time(results[case.name]['best']):>10}", flush=True)
+    finally:
+        os.chdir(cwd)
+        scratch.close()
+    meta = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "lpm_paths": __version__,
+        "emitter": EMITTER_VERSION,
+        "quick": quick,
+    }
+    return {"meta": meta, "results": results}
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.0f} ns"
+
+
+def compare(
+    baseline: Dict[str, object],
+    current: Dict[str, object],
+    threshold: float = THRESHOLD,
+    normalize: bool = True,
+    echo: bool = True,
+) -> List[str]:
+    """
+    Compare two result documents and print a table.
+
+    Parameters
+    ----------
+    baseline, current : dict
+        Documents written by ``run``.
+    threshold : float, optional
+        Slowdown ratio (current best / baseline best) flagged as a regression.
+    normalize : bool, optional
+        Divide each ratio by the ratio of the calibration times recorded with
+        the two cases, so a machine that is uniformly slower during one run
+        does not show up as a regression.
+    echo : bool, optional
+        Print the table.
+
+    Returns
+    -------
+    list[str]
+        Names of the regressed cases.
+    """
+    base = baseline["results"]
+    cur = current["results"]
+    regressions = []
+    out = print if echo else (lambda *args: None)
+    out(f"{'case':<32} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for name in sorted(set(base) | set(cur), key=_case_order):
+        if name not in cur or name not in base:
+            out(f"{name:<32} {'(only in ' + ('baseline' if name in base else 'current') + ')':>29}")
+            continue
+        old, new = base[name]["best"], cur[name]["best"]
+        ratio = new / old if old else float("inf")
+        if normalize and base[name].get("calibration") and cur[name].get("calibration"):
+            ratio /= cur[name]["calibration"] / base[name]["calibration"]
+        status = ""
+        if ratio > threshold and new - old > NOISE_FLOOR:
+            status = "REGRESSION"
+            regressions.append(name)
+        elif ratio < 1 / threshold and old - new > NOISE_FLOOR:
+            status = "faster"
+        out(f"{name:<32} {_format_time(old):>10} {_format_time(new):>10} {ratio:>6.2f}x {status}".rstrip())
+    out(f"{len(regressions)} regression(s) at threshold {threshold:.2f}x")
+    return regressions
+
+
+def _case_order(name: str) -> Tuple[str, int]:
+    head, _, size = name.rpartition("/")
+    return (head, int(size)) if size.isdigit() else (name, 0)
+
+
+def confirm(baseline: Dict[str, object], current: Dict[str, object], threshold: float, retries: int) -> None:
+    """
+    Re-run regressed cases and keep their best result.
+
+    A one-off slowdown of the machine rarely hits the same case twice, so
+    only regressions that persist over ``retries`` re-runs are reported.
+    ``current`` is updated in place.
+    """
+    quick = bool(current["meta"].get("quick"))
+    for _ in range(retries):
+        names = compare(baseline, current, threshold, echo=False)
+        if not names:
+            return
+        again = run(quick=quick, pattern="^(" + "|".join(re.escape(name) for name in names) + ")$", echo=False)
+        for name, entry in again["results"].items():
+            old = current["results"][name]
+            if entry["best"] / entry["calibration"] < old["best"] / old["calibration"]:
+                current["results"][name] = entry
+
+
+def _load(path: str) -> Dict[str, object]:
+    with open(path, "r", encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the lpm_paths hot paths.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_run = sub.add_parser("run", help="run the suite")
+    p_run.add_argument("--quick", action="store_true", help="path lengths up to 10^4 only")
+    p_run.add_argument("--filter", help="only run cases matching this regular expression")
+    p_run.add_argument("--output", help="write the results to this JSON file")
+    p_run.add_argument("--compare", metavar="BASELINE", help="compare against a baseline file afterwards")
+    p_run.add_argument("--threshold", type=float, default=THRESHOLD, help=f"regression ratio (default {THRESHOLD})")
+    p_run.add_argument("--retries", type=int, default=2, help="re-run regressed cases this many times (default 2)")
+    p_cmp = sub.add_parser("compare", help="compare two result files")
+    p_cmp.add_argument("baseline")
+    p_cmp.add_argument("current")
+    p_cmp.add_argument("--threshold", type=float, default=THRESHOLD, help=f"regression ratio (default {THRESHOLD})")
+    p_cmp.add_argument("--raw", action="store_true", help="compare raw times without calibration")
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return 1 if compare(_load(args.baseline), _load(args.current), args.threshold, not args.raw) else 0
+    results = run(quick=args.quick, pattern=args.filter)
+    if args.compare:
+        baseline = _load(args.compare)
+        confirm(baseline, results, args.threshold, args.retries)
+    if args.output:
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+    if args.compare:
+        return 1 if compare(baseline, results, args.threshold) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,20 +2,48 @@
 Public API for lattice path utilities.
 
 Exports convenience helpers for JSON-driven path declarations.
+
+Submodules are imported on first attribute access (PEP 562), so
+``import lpm_paths`` and entry points such as ``lpm_paths.client`` or
+``lpm_paths.doctor`` only load the modules they use.
 """
 
-from .api import declare_path_from_json, path_data, between_from_json
-from .between import between_polygon
-from .hashing import key_of
-from .sanitize import sanitize_name
-from .cache import ensure_dir
-
-__all__ = [
-    "declare_path_from_json",
-    "path_data",
-    "between_from_json",
-    "between_polygon",
-    "key_of",
-    "sanitize_name",
-    "ensure_dir",
-]
+from importlib import import_module
+
+# Set without importing ``typing``, which would dominate the import time.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .api import between_from_json, declare_path_from_json, declare_paths_from_json, path_data
+    from .batch import PathBatch
+    from .between import between_polygon
+    from .cache import ensure_dir
+    from .hashing import key_of
+    from .sanitize import sanitize_name
+
+# Public name -> submodule defining it.
+_EXPORTS = {
+    "declare_path_from_json": "api",
+    "declare_paths_from_json": "api",
+    "path_data": "api",
+    "between_from_json": "api",
+    "PathBatch": "batch",
+    "between_polygon": "between",
+    "key_of": "hashing",
+    "sanitize_name": "sanitize",
+    "ensure_dir": "cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> object:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -5,12 +5,30 @@ Public JSON-driven API helpers for lattice paths.
 """
 
 import json
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional, Tuple
 
 from .cache import Cache
 from .emitters.tex import TeXEmitter
 from .errors import InputSpecError
-from .types import LatticePath
+from .memo import parse_path
+
+def _lod_options(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Read the level-of-detail keys of a JSON specification.
+
+    Parameters
+    ----------
+    spec : dict
+        Decoded specification.
+
+    Returns
+    -------
+    dict
+        ``lod_tolerance`` and ``lod_max_vertices`` keyword arguments for
+        ``TeXEmitter``, which validates them.
+    """
+    return {"lod_tolerance": spec.get("lod_tolerance"), "lod_max_vertices": spec.get("lod_max_vertices")}
 
 def declare_path_from_json(spec_json: str) -> str:
     """
@@ -19,7 +37,12 @@ def declare_path_from_json(spec_json: str) -> str:
     Parameters
     ----------
     spec_json : str
-        JSON string with keys "bits", "name", and optional "cache_id".
+        JSON string with keys "bits", "name", and optional "cache_id",
+        "emission" (``"compact"``, the default, or ``"expanded"``; see
+        ``lpm_paths.emitters.tex.EMISSION_MODES``), "corner_plot"
+        (default true: also store the corner-only plot list), and the
+        level-of-detail options "lod_tolerance" and "lod_max_vertices"
+        (integers; see ``TeXEmitter``).
 
     Returns
     -------
@@ -29,8 +52,10 @@ def declare_path_from_json(spec_json: str) -> str:
     Raises
     ------
     InputSpecError
-        If the JSON is invalid or required fields are missing.
+        If the JSON is invalid or required fields are missing, or the
+        emission mode or a level-of-detail option is invalid.
     """
+    started = time.perf_counter()
     try:
         spec = json.loads(spec_json)
     except Exception as exc:
@@ -38,12 +63,97 @@ def declare_path_from_json(spec_json: str) -> str:
     bits = spec.get("bits")
     name = spec.get("name")
     cache_id = spec.get("cache_id")
+    emission = spec.get("emission", "compact")
+    corner_plot = spec.get("corner_plot", True)
     if not isinstance(bits, str) or not isinstance(name, str):
         raise InputSpecError("'bits' and 'name' must be strings.")
-    emitter = TeXEmitter(Cache.make())
+    if not isinstance(emission, str):
+        raise InputSpecError("'emission' must be a string.")
+    if not isinstance(corner_plot, bool):
+        raise InputSpecError("'corner_plot' must be a boolean.")
+    emitter = TeXEmitter(Cache.make(), emission=emission, corner_plot=corner_plot, **_lod_options(spec))
+    emitter.trace.carry("json", time.perf_counter() - started)
     g1, g2, g3 = emitter.write_path(bits=bits, name=name, cache_id=cache_id)
     return "\n".join([g1, g2, g3])
 
+def declare_paths_from_json(
+    specs_json: str,
+    bundle: bool = False,
+    shard_size: Optional[int] = None,
+    emission: str = "compact",
+    corner_plot: bool = True,
+    lod_tolerance: Optional[int] = None,
+    lod_max_vertices: Optional[int] = None,
+) -> str:
+    """
+    Declare many lattice paths from a JSON list of specifications.
+
+    Parameters
+    ----------
+    specs_json : str
+        JSON array of objects with keys "bits", "name", and optional
+        "cache_id" (the same shape accepted by ``declare_path_from_json``).
+    bundle : bool, optional
+        Write the paths into shared ``bundle-<hash>`` shards instead of one
+        file pair per path.
+    shard_size : int or None, optional
+        Maximum number of paths per shard when ``bundle`` is set; ``None``
+        writes a single shard.
+    emission : str, optional
+        Path file layout (``"compact"`` or ``"expanded"``) for every path.
+    corner_plot : bool, optional
+        Store the corner-only plot list for every path.
+    lod_tolerance, lod_max_vertices : int or None, optional
+        Level-of-detail options applied to every path (see ``TeXEmitter``).
+
+    Returns
+    -------
+    str
+        TeX macro definitions for every declared path, followed by
+        ``\\lp@lastdeclaredpathfiles`` listing the generated files in order.
+
+    Raises
+    ------
+    InputSpecError
+        If the JSON is invalid, is not a list, any entry is malformed, or
+        ``emission`` or a level-of-detail option is invalid.
+
+    Notes
+    -----
+    All paths share one cache and emitter. Exact duplicate specifications
+    are emitted once; the first occurrence fixes the declaration order.
+    """
+    started = time.perf_counter()
+    try:
+        specs = json.loads(specs_json)
+    except Exception as exc:
+        raise InputSpecError(f"Invalid JSON: {exc}") from exc
+    if not isinstance(specs, list):
+        raise InputSpecError("Path specifications must be a JSON list.")
+    unique: Dict[Tuple[str, str, Optional[str]], None] = {}
+    for index, spec in enumerate(specs):
+        if not isinstance(spec, dict):
+            raise InputSpecError(f"Path specification {index} must be an object.")
+        bits = spec.get("bits")
+        name = spec.get("name")
+        cache_id = spec.get("cache_id")
+        if not isinstance(bits, str) or not isinstance(name, str):
+            raise InputSpecError(f"Path specification {index}: 'bits' and 'name' must be strings.")
+        if cache_id is not None and not isinstance(cache_id, str):
+            raise InputSpecError(f"Path specification {index}: 'cache_id' must be a string.")
+        unique.setdefault((bits, name, cache_id), None)
+    emitter = TeXEmitter(
+        Cache.make(),
+        emission=emission,
+        corner_plot=corner_plot,
+        lod_tolerance=lod_tolerance,
+        lod_max_vertices=lod_max_vertices,
+    )
+    emitter.trace.carry("json", time.perf_counter() - started)
+    if bundle:
+        return emitter.write_bundle(list(unique), shard_size=shard_size)
+    return emitter.write_paths(list(unique))
+
 def path_data(spec_json: str) -> Dict[str, Any]:
     """
     Return decoded path data from a JSON specification.
@@ -70,8 +180,8 @@ def path_data(spec_json: str) -> Dict[str, Any]:
     bits = spec.get("bits")
     if not isinstance(bits, str):
         raise InputSpecError("'bits' must be a string.")
-    lp = LatticePath.from_bits(bits)
-    return {"coords": lp.coords, "upmarks": lp.upmarks}
+    lp = parse_path(bits)
+    return {"coords": list(lp.coords), "upmarks": list(lp.upmarks)}
 
 def between_from_json(spec_json: str) -> str:
     """
@@ -80,7 +190,9 @@ def between_from_json(spec_json: str) -> str:
     Parameters
     ----------
     spec_json : str
-        JSON string with keys "L", "U", and optional "lname", "uname".
+        JSON string with keys "L", "U", and optional "lname", "uname",
+        "count" (true to also emit the number of paths in the region), and
+        "lod_tolerance" / "lod_max_vertices" (see ``TeXEmitter``).
 
     Returns
     -------
@@ -90,8 +202,10 @@ def between_from_json(spec_json: str) -> str:
     Raises
     ------
     InputSpecError
-        If the JSON is invalid or required fields are missing.
+        If the JSON is invalid, required fields are missing, or a
+        level-of-detail option is invalid.
     """
+    started = time.perf_counter()
     try:
         spec = json.loads(spec_json)
     except Exception as exc:
@@ -102,5 +216,42 @@ def between_from_json(spec_json: str) -> str:
     uname = spec.get("uname") or "U"
     if not isinstance(L, str) or not isinstance(U, str):
         raise InputSpecError("'L' and 'U' must be bit-strings.")
+    count = spec.get("count", False)
+    if not isinstance(count, bool):
+        raise InputSpecError("'count' must be a boolean.")
+    emitter = TeXEmitter(Cache.make(), **_lod_options(spec))
+    emitter.trace.carry("json", time.perf_counter() - started)
+    return emitter.write_between(L_bits=L, U_bits=U, lname=lname, uname=uname, count=count)
+
+def hasse_from_json(spec_json: str) -> str:
+    """
+    Declare the Hasse diagram of a box from a JSON specification.
+
+    Parameters
+    ----------
+    spec_json : str
+        JSON string with integer keys "north" and "east", and an optional
+        "name" (default ``"hasse"``).
+
+    Returns
+    -------
+    str
+        TeX macro definitions pointing at the generated diagram.
+
+    Raises
+    ------
+    InputSpecError
+        If the JSON is invalid, the sizes are not non-negative integers, or
+        the box is too large.
+    """
+    started = time.perf_counter()
+    try:
+        spec = json.loads(spec_json)
+    except Exception as exc:
+        raise InputSpecError(f"Invalid JSON: {exc}") from exc
+    name = spec.get("name") or "hasse"
+    if not isinstance(name, str):
+        raise InputSpecError("'name' must be a string.")
     emitter = TeXEmitter(Cache.make())
-    return emitter.write_between(L_bits=L, U_bits=U, lname=lname, uname=uname)
+    emitter.trace.carry("json", time.perf_counter() - started)
+    return emitter.write_hasse(north=spec.get("north"), east=spec.get("east"), name=name)
@@ -0,0 +1,280 @@
+from __future__ import annotations
+
+"""
+Columnar storage for many lattice paths.
+
+``PathBatch`` keeps every path of a batch in one contiguous flag buffer (one
+byte per step, 0 for East and 1 for North) plus an offsets array. Derived
+annotations are computed for the whole batch at once: with NumPy installed
+(``pip install lpmresonance[numpy]``) coordinates come from a single
+cumulative sum, corners and inside corners from vectorized neighbour
+comparisons, and ell-maps from per-path ranks of the North steps. Without
+NumPy the batch falls back to the bitmask engine path by path; both backends
+return identical results.
+"""
+
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from . import bitops
+from .bitops import _INDEX_TYPECODE
+from .errors import InputSpecError
+from .types import LatticePath
+
+# NumPy is imported on first use (see ``_numpy``) so that importing this
+# module stays cheap; ``np`` is ``False`` until then.
+np: Any = False
+
+_OFFSET_TYPECODE = "q"
+_BIT_CHARS = bytes.maketrans(b"\x00\x01", b"01")
+
+BACKENDS = ("auto", "numpy", "python")
+
+
+def has_numpy() -> bool:
+    """
+    Report whether the NumPy backend is available.
+
+    Returns
+    -------
+    bool
+        True if ``numpy`` could be imported.
+    """
+    return _numpy() is not None
+
+
+def _numpy() -> Any:
+    """Import NumPy once; returns the module or ``None`` when it is missing."""
+    global np
+    if np is False:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover - exercised only without NumPy
+            np = None
+        else:
+            np = numpy
+    return np
+
+
+class PathBatch:
+    """
+    Immutable, columnar collection of lattice paths.
+
+    Parameters
+    ----------
+    flags : bytes
+        Concatenated step flags (``0`` East, ``1`` North) of every path.
+    offsets : array
+        ``offsets[i]:offsets[i+1]`` is the slice of ``flags`` for path ``i``.
+    backend : str, optional
+        ``"numpy"``, ``"python"``, or ``"auto"`` (NumPy when installed).
+
+    Notes
+    -----
+    Use ``PathBatch.from_bits`` to build a batch from bitstrings. Indexing a
+    batch returns a ``LatticePath`` whose derived fields are already filled
+    in from the batch-wide arrays, so it can be handed to ``TeXEmitter`` or
+    ``manifest.to_json_obj`` like any other path.
+    """
+
+    __slots__ = ("_flags", "_offsets", "backend", "_columns")
+
+    def __init__(self, flags: bytes, offsets: array, backend: str = "auto") -> None:
+        """
+        Wrap prepared flag and offset buffers.
+
+        Parameters
+        ----------
+        flags : bytes
+            Concatenated step flags of every path.
+        offsets : array
+            Path boundaries into ``flags`` (``len(batch) + 1`` entries).
+        backend : str, optional
+            ``"numpy"``, ``"python"``, or ``"auto"``.
+
+        Raises
+        ------
+        InputSpecError
+            If the backend name is unknown.
+        ImportError
+            If the NumPy backend is requested but NumPy is not installed.
+        """
+        if backend not in BACKENDS:
+            raise InputSpecError(f"Unknown batch backend: {backend!r}.")
+        if backend == "auto":
+            backend = "numpy" if has_numpy() else "python"
+        if backend == "numpy" and not has_numpy():
+            raise ImportError("The NumPy batch backend requires numpy (pip install lpmresonance[numpy]).")
+        self._flags = flags
+        self._offsets = offsets
+        self.backend = backend
+        self._columns: Optional[Dict[str, Any]] = None
+
+    @classmethod
+    def from_bits(cls, bitstrings: Iterable[str], backend: str = "auto") -> "PathBatch":
+        """
+        Pack bitstrings into a batch.
+
+        Parameters
+        ----------
+        bitstrings : iterable of str
+            Paths as strings of ``0`` (East) and ``1`` (North).
+        backend : str, optional
+            ``"numpy"``, ``"python"``, or ``"auto"``.
+
+        Returns
+        -------
+        PathBatch
+            Batch holding the paths in input order.
+
+        Raises
+        ------
+        InputSpecError
+            If any entry is not a binary string.
+        """
+        chunks: List[str] = []
+        offsets = array(_OFFSET_TYPECODE, [0])
+        total = 0
+        for index, bits in enumerate(bitstrings):
+            if not isinstance(bits, str) or not bitops.is_bitstring(bits):
+                raise InputSpecError(f"Batch entry {index}: bits must be a binary string of '0' and '1'.")
+            chunks.append(bits)
+            total += len(bits)
+            offsets.append(total)
+        flags = bitops.step_flags("".join(chunks))
+        return cls(flags, offsets, backend)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __iter__(self) -> Iterator[LatticePath]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def _span(self, index: int) -> Tuple[int, int]:
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("PathBatch index out of range")
+        return self._offsets[index], self._offsets[index + 1]
+
+    def bits(self, index: int) -> str:
+        """
+        Return the bitstring of one path.
+
+        Parameters
+        ----------
+        index : int
+            Path position in the batch.
+
+        Returns
+        -------
+        str
+            Bitstring of ``0`` and ``1``.
+        """
+        a, b = self._span(index)
+        return self._flags[a:b].translate(_BIT_CHARS).decode("ascii")
+
+    def __getitem__(self, index: int) -> LatticePath:
+        a, b = self._span(index)
+        bits = self._flags[a:b].translate(_BIT_CHARS).decode("ascii")
+        if self.backend == "python":
+            return LatticePath(bits, "bitmask")
+        if index < 0:
+            index += len(self)
+        cols = self._numpy_columns()
+        fields = {}
+        for slot, column in (("_ys", "ys"), ("_upmarks", "upmarks"), ("_corners", "corners"), ("_inside", "inside")):
+            groups = cols[column + "_groups"]
+            fields[slot] = cols[column][groups[index]:groups[index + 1]]
+        return LatticePath._prefilled(bits, **fields)
+
+    def _numpy_columns(self) -> Dict[str, Any]:
+        """
+        Compute batch-wide annotation columns with NumPy (cached).
+
+        Every column holds path-local values for all paths back to back in a
+        compact ``array``; ``<column>_groups[i]:<column>_groups[i+1]`` is the
+        slice belonging to path ``i``, so indexing the batch is a handful of
+        C-level slices.
+        """
+        if self._columns is not None:
+            return self._columns
+        assert np is not None
+        flags = np.frombuffer(self._flags, dtype=np.uint8)
+        offsets = np.frombuffer(self._offsets, dtype=np.int64)
+        starts = offsets[:-1]
+        total = flags.size
+        count = len(self)
+        paths = np.arange(count)
+        heights = np.zeros(total + 1, dtype=np.int64)
+        np.cumsum(flags, out=heights[1:])
+        # Prefix heights: path i owns rows offsets[i]+i .. offsets[i+1]+i.
+        owner = np.repeat(paths, np.diff(offsets) + 1)
+        position = np.arange(total + count) - owner
+        ys = heights[position] - heights[starts][owner]
+        # North steps, grouped by path through the prefix heights.
+        upmark_groups = heights[offsets]
+        upmarks = np.flatnonzero(flags) + 1 - np.repeat(starts, np.diff(upmark_groups))
+        if total >= 2:
+            same_path = np.ones(total - 1, dtype=bool)
+            inner = offsets[1:-1]
+            inner = inner[(inner > 0) & (inner < total)]
+            same_path[inner - 1] = False
+            corners = np.flatnonzero((flags[1:] != flags[:-1]) & same_path) + 1
+            inside = np.flatnonzero((flags[:-1] == 0) & (flags[1:] == 1) & same_path) + 1
+        else:
+            corners = inside = np.zeros(0, dtype=np.int64)
+        # A corner at global index g belongs to the path with offsets[i] < g < offsets[i+1].
+        corner_groups = np.searchsorted(corners, offsets, side="right")
+        inside_groups = np.searchsorted(inside, offsets, side="right")
+        self._columns = {
+            "ys": _to_array(ys),
+            "ys_groups": (offsets + np.arange(count + 1)).tolist(),
+            "upmarks": _to_array(upmarks),
+            "upmarks_groups": upmark_groups.tolist(),
+            "corners": _to_array(corners - np.repeat(starts, np.diff(corner_groups))),
+            "corners_groups": corner_groups.tolist(),
+            "inside": _to_array(inside - np.repeat(starts, np.diff(inside_groups))),
+            "inside_groups": inside_groups.tolist(),
+            "np_upmarks": upmarks,
+            "np_upmark_groups": upmark_groups,
+        }
+        return self._columns
+
+    def ellmap_table(self) -> Tuple[Sequence[int], Sequence[int], Sequence[int]]:
+        """
+        Return every path's ell-map as three flat columns.
+
+        Returns
+        -------
+        tuple of sequences
+            ``(path, level, x)`` with one row per North step: path index,
+            height ``y`` reached by that step, and ``ellmap[y]`` of that path.
+        """
+        if self.backend == "python":
+            paths = array(_INDEX_TYPECODE)
+            levels = array(_INDEX_TYPECODE)
+            xs = array(_INDEX_TYPECODE)
+            for i in range(len(self)):
+                ups = bitops.upmark_indices(self.bits(i))
+                paths.extend([i] * len(ups))
+                levels.extend(range(1, len(ups) + 1))
+                xs.extend(u - y for y, u in enumerate(ups, 1))
+            return paths, levels, xs
+        assert np is not None
+        cols = self._numpy_columns()
+        ups = cols["np_upmarks"]
+        groups = cols["np_upmark_groups"]
+        counts = np.diff(groups)
+        paths = np.repeat(np.arange(len(self)), counts)
+        levels = np.arange(ups.size) - np.repeat(groups[:-1], counts) + 1
+        return paths, levels, ups - levels
+
+
+def _to_array(values: Any) -> array:
+    """Copy a NumPy integer vector into a compact ``array``."""
+    out = array(_INDEX_TYPECODE)
+    out.frombytes(values.astype(np.uint32).tobytes())
+    return out
@@ -4,10 +4,53 @@ from __future__ import annotations
 Geometry helpers for between-region polygons.
 """
 
-from typing import List
+from array import array
+from itertools import chain, islice
+from typing import Iterator, List, Tuple
 
+from . import bitops
+from .bitops import _INDEX_TYPECODE
 from .errors import InputSpecError
-from .types import Coord, LatticePath
+from .memo import parse_path
+from .types import Coord, IndexSeq, iter_coords
+
+
+def iter_between_polygon(L_bits: str, U_bits: str) -> Iterator[Coord]:
+    """
+    Stream the polygon for the region between two lattice paths.
+
+    Parameters
+    ----------
+    L_bits : str
+        Lower path bitstring.
+    U_bits : str
+        Upper path bitstring.
+
+    Returns
+    -------
+    iterator of Coord
+        The vertices of ``between_polygon`` in the same order, produced by
+        walking both bitstrings so that memory use does not grow with path
+        length.
+
+    Raises
+    ------
+    InputSpecError
+        If paths do not share the same start or end points. Inputs are
+        validated before the iterator is returned.
+    """
+    L = parse_path(L_bits)
+    U = parse_path(U_bits)
+    if len(L.bits) != len(U.bits) or L.bits.count("1") != U.bits.count("1"):
+        raise InputSpecError("Paths must share the same endpoint.")
+    if not L.bits:
+        return iter([(0, 0)])
+    # Upper path, then the lower path backwards without its shared endpoints,
+    # then the start again. Consecutive points along a path differ and the
+    # joins are distinct for non-empty paths, so no de-duplication is needed.
+    lower = islice(iter_coords(L.bits, reverse=True), 1, len(L.bits))
+    return chain(iter_coords(U.bits), lower, [(0, 0)])
+
 
 def between_polygon(L_bits: str, U_bits: str) -> List[Coord]:
     """
@@ -30,17 +73,210 @@ def between_polygon(L_bits: str, U_bits: str) -> List[Coord]:
     InputSpecError
         If paths do not share the same start or end points.
     """
-    L = LatticePath.from_bits(L_bits)
-    U = LatticePath.from_bits(U_bits)
-    if L.coords[-1] != U.coords[-1]:
+    return list(iter_between_polygon(L_bits, U_bits))
+
+
+class BetweenRegion:
+    """
+    Region between a lower and an upper lattice path, built in one pass.
+
+    Attributes
+    ----------
+    lower_bits : str
+        Lower path bitstring.
+    upper_bits : str
+        Upper path bitstring.
+    area : int
+        Number of unit cells in the region.
+    lower_levels : IndexSeq
+        ``ellmap`` of the lower path: entry ``y-1`` is the ``x`` of its
+        ``y``-th North step.
+    upper_levels : IndexSeq
+        ``ellmap`` of the upper path.
+
+    Notes
+    -----
+    Build instances with ``between_region``. Row ``y`` (between heights ``y``
+    and ``y+1``) holds the cells ``upper_levels[y] <= x < lower_levels[y]``.
+    Only the polygon's corner vertices and the two level arrays are stored,
+    in compact arrays.
+    """
+
+    __slots__ = ("lower_bits", "upper_bits", "area", "_lower", "_upper", "_xs", "_ys")
+
+    def __init__(
+        self,
+        lower_bits: str,
+        upper_bits: str,
+        area: int,
+        lower: array,
+        upper: array,
+        xs: array,
+        ys: array,
+    ) -> None:
+        """
+        Wrap the arrays computed by ``between_region``.
+
+        Parameters
+        ----------
+        lower_bits, upper_bits : str
+            Validated boundary bitstrings.
+        area : int
+            Number of unit cells.
+        lower, upper : array
+            Per-level ``x`` of the lower and upper paths.
+        xs, ys : array
+            Polygon corner vertices, closed.
+        """
+        self.lower_bits = lower_bits
+        self.upper_bits = upper_bits
+        self.area = area
+        self._lower = lower
+        self._upper = upper
+        self._xs = xs
+        self._ys = ys
+
+    @property
+    def lower_levels(self) -> IndexSeq:
+        """Lower path ``ellmap`` values, one per level (row upper bounds)."""
+        return IndexSeq(self._lower)
+
+    @property
+    def upper_levels(self) -> IndexSeq:
+        """Upper path ``ellmap`` values, one per level (row lower bounds)."""
+        return IndexSeq(self._upper)
+
+    def iter_polygon(self) -> Iterator[Coord]:
+        """
+        Yield the polygon's corner vertices.
+
+        Yields
+        ------
+        Coord
+            Start, corners and end of the upper path, then the corners of
+            the lower path backwards, then ``(0, 0)`` again. Straight runs
+            contribute no intermediate vertices.
+        """
+        return zip(self._xs, self._ys)
+
+    def polygon(self) -> List[Coord]:
+        """
+        Return the corner-only polygon as a list.
+
+        Returns
+        -------
+        list[Coord]
+            Same vertices as ``iter_polygon``.
+        """
+        return list(self.iter_polygon())
+
+    def iter_row_runs(self) -> Iterator[Tuple[int, int, int]]:
+        """
+        Yield the non-empty rows of the region as runs of cells.
+
+        Yields
+        ------
+        tuple of (int, int, int)
+            ``(x0, x1, y)``: cells ``(x0, y)`` through ``(x1, y)`` inclusive.
+        """
+        for y, (a, b) in enumerate(zip(self._upper, self._lower)):
+            if b > a:
+                yield a, b - 1, y
+
+    def iter_cells(self) -> Iterator[Coord]:
+        """
+        Yield every unit cell of the region.
+
+        Yields
+        ------
+        Coord
+            Lower-left corner ``(x, y)`` of each cell, row by row from the
+            bottom and left to right within a row.
+        """
+        for x0, x1, y in self.iter_row_runs():
+            for x in range(x0, x1 + 1):
+                yield x, y
+
+    def count(self) -> int:
+        """
+        Count the lattice paths inside the region.
+
+        Returns
+        -------
+        int
+            ``lpm_paths.enumerate.count_levels(upper_levels, lower_levels)``.
+        """
+        from .enumerate import count_levels
+
+        return count_levels(self._upper, self._lower)
+
+
+def between_region(L_bits: str, U_bits: str) -> BetweenRegion:
+    """
+    Validate two paths and build their region in a single walk.
+
+    Parameters
+    ----------
+    L_bits : str
+        Lower path bitstring.
+    U_bits : str
+        Upper path bitstring.
+
+    Returns
+    -------
+    BetweenRegion
+        Corner-only polygon, area, and per-level bounds of the region.
+
+    Raises
+    ------
+    InputSpecError
+        If the inputs are not bitstrings, do not share the same start and
+        end points, or if ``L`` rises above ``U`` at some step.
+
+    Notes
+    -----
+    Both bitstrings are walked together, step by step. After every step the
+    lower path's height must not exceed the upper path's, so crossing paths
+    are rejected instead of producing a self-intersecting polygon.
+    """
+    if not isinstance(L_bits, str) or not isinstance(U_bits, str):
+        raise InputSpecError("bits must be a string.")
+    if not bitops.is_bitstring(L_bits) or not bitops.is_bitstring(U_bits):
+        raise InputSpecError("bits must be a binary string of '0' and '1'.")
+    if len(L_bits) != len(U_bits) or L_bits.count("1") != U_bits.count("1"):
         raise InputSpecError("Paths must share the same endpoint.")
-    if L.coords[0] != (0, 0) or U.coords[0] != (0, 0):
-        raise InputSpecError("Paths must start at (0,0).")
-    upper = U.coords[:]
-    lower = list(reversed(L.coords))[1:-1]
-    polygon = upper + lower + [upper[0]]
-    dedup: List[Coord] = []
-    for c in polygon:
-        if not dedup or dedup[-1] != c:
-            dedup.append(c)
-    return dedup
+    lower = array(_INDEX_TYPECODE)
+    upper = array(_INDEX_TYPECODE)
+    u_xs, u_ys = array(_INDEX_TYPECODE, [0]), array(_INDEX_TYPECODE, [0])
+    l_xs, l_ys = array(_INDEX_TYPECODE, [0]), array(_INDEX_TYPECODE, [0])
+    xl = yl = xu = yu = 0
+    prev_l = prev_u = ""
+    for i, (bl, bu) in enumerate(zip(L_bits, U_bits)):
+        if bu != prev_u and prev_u:
+            u_xs.append(xu)
+            u_ys.append(yu)
+        if bl != prev_l and prev_l:
+            l_xs.append(xl)
+            l_ys.append(yl)
+        prev_l, prev_u = bl, bu
+        if bu == "1":
+            upper.append(xu)
+            yu += 1
+        else:
+            xu += 1
+        if bl == "1":
+            lower.append(xl)
+            yl += 1
+        else:
+            xl += 1
+        if yl > yu:
+            raise InputSpecError(f"Lower path rises above the upper path after step {i + 1}.")
+    if L_bits:
+        u_xs.append(xu)
+        u_ys.append(yu)
+        # Lower corners backwards; its endpoint is shared with the upper path
+        # and its start closes the polygon.
+        u_xs.extend(reversed(l_xs))
+        u_ys.extend(reversed(l_ys))
+    area = sum(lower) - sum(upper)
+    return BetweenRegion(L_bits, U_bits, area, lower, upper, u_xs, u_ys)
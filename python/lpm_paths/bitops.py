@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+"""
+Bit-parallel helpers for deriving lattice path annotations.
+
+The bitstring is read as an integer ``b`` whose bit ``k`` is step ``k``
+(0-based), so that neighbouring steps line up under a single shift:
+
+- ``b ^ (b >> 1)`` has bit ``k`` set where steps ``k`` and ``k+1`` differ
+  (a corner at 1-based index ``k+1``);
+- ``~b & (b >> 1)`` has bit ``k`` set where an East step ``k`` is followed by
+  a North step (an inside corner at index ``k+1``).
+
+Set-bit positions and prefix popcounts are extracted with ``bytes.translate``
+plus ``itertools.compress`` / ``itertools.accumulate``, so no per-step work
+runs in the interpreter.
+"""
+
+from array import array
+from itertools import accumulate, compress
+
+# Array typecode of every index/height array in the package (unsigned C int:
+# 4 bytes per entry on every supported platform); other modules import it.
+_INDEX_TYPECODE = "I"
+_NON_BITS = str.maketrans("", "", "01")
+_BIT_VALUES = bytes.maketrans(b"01", b"\x00\x01")
+
+
+def is_bitstring(bits: str) -> bool:
+    """
+    Check that a string contains only ``0`` and ``1``.
+
+    Parameters
+    ----------
+    bits : str
+        Candidate bitstring.
+
+    Returns
+    -------
+    bool
+        True if every character is ``0`` or ``1``.
+    """
+    return not bits.translate(_NON_BITS)
+
+
+def step_flags(bits: str) -> bytes:
+    """
+    Encode a validated bitstring as one byte per step.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+
+    Returns
+    -------
+    bytes
+        ``0`` for each East step and ``1`` for each North step.
+    """
+    return bits.encode("ascii").translate(_BIT_VALUES)
+
+
+def _positions(mask: int, width: int, offset: int) -> array:
+    """Return ``offset + k`` for every set bit ``k < width`` of ``mask``."""
+    if width <= 0 or not mask:
+        return array(_INDEX_TYPECODE)
+    flags = format(mask, f"0{width}b")[::-1].encode("ascii").translate(_BIT_VALUES)
+    return array(_INDEX_TYPECODE, compress(range(offset, offset + width), flags))
+
+
+def _as_int(bits: str) -> int:
+    """Read the bitstring as an integer with step ``k`` at bit ``k``."""
+    return int(bits[::-1], 2) if bits else 0
+
+
+def prefix_heights(bits: str) -> array:
+    """
+    Compute ``ys[i]``, the number of North steps among the first ``i`` steps.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+
+    Returns
+    -------
+    array
+        Prefix popcounts of length ``len(bits) + 1``.
+    """
+    return array(_INDEX_TYPECODE, accumulate(step_flags(bits), initial=0))
+
+
+def upmark_indices(bits: str) -> array:
+    """
+    Return the 1-based indices of North steps.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+
+    Returns
+    -------
+    array
+        Increasing step indices.
+    """
+    return array(_INDEX_TYPECODE, compress(range(1, len(bits) + 1), step_flags(bits)))
+
+
+def corner_indices(bits: str) -> array:
+    """
+    Return the indices where the path changes direction.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+
+    Returns
+    -------
+    array
+        Increasing corner indices, as in ``LatticePath.corners``.
+    """
+    n = len(bits)
+    if n < 2:
+        return array(_INDEX_TYPECODE)
+    b = _as_int(bits)
+    return _positions((b ^ (b >> 1)) & ((1 << (n - 1)) - 1), n - 1, 1)
+
+
+def inside_corner_indices(bits: str) -> array:
+    """
+    Return the indices of East steps followed by a North step.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+
+    Returns
+    -------
+    array
+        Increasing inside-corner indices, as in ``LatticePath.insideCorners``.
+    """
+    n = len(bits)
+    if n < 2:
+        return array(_INDEX_TYPECODE)
+    b = _as_int(bits)
+    return _positions(~b & (b >> 1) & ((1 << (n - 1)) - 1), n - 1, 1)
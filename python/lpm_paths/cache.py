@@ -1,13 +1,41 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
-from typing import Optional
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import BinaryIO, Iterable, Optional, Set, Tuple
 
 from .errors import CacheFenceError
 
 DEFAULT_CACHE_DIR = "lp-cache"
 
+# Single path component made of characters that can never form a separator,
+# a drive, or a traversal (``.`` and ``..`` are rejected separately).
+_PLAIN_NAME_RE = re.compile(r"[A-Za-z0-9_@+=.-]+")
+
+# Where supported, opening a symbolic link with this flag fails instead of
+# reading its target.
+_NOFOLLOW = getattr(os, "O_NOFOLLOW", 0)
+
+
+def is_plain_name(filename: str) -> bool:
+    """
+    Check that a filename is a single, traversal-free path component.
+
+    Parameters
+    ----------
+    filename : str
+        Candidate cache-relative filename.
+
+    Returns
+    -------
+    bool
+        True for names such as ``path-demo-<hash>.tex`` that can be joined to
+        the cache root without resolving anything.
+    """
+    return filename not in (".", "..") and _PLAIN_NAME_RE.fullmatch(filename) is not None
+
 
 def ensure_dir(path: str) -> None:
     """
@@ -34,10 +62,29 @@ class Cache:
     Notes
     -----
     All file paths are validated to stay within the cache root to avoid
-    unintended reads or writes outside the cache fence.
+    unintended reads or writes outside the cache fence. The root is resolved
+    once per instance (``root_real``) and each directory is created at most
+    once. Plain file names (``is_plain_name``), which is what the emitters
+    generate from sanitized names and hashes, are fenced by a string check
+    instead of resolving the target: such a name is a direct child of the
+    resolved root. A symbolic link planted under such a name is rejected with
+    ``CacheFenceError`` when it is read (``open_artifact``) or written
+    (``atomic_write_chunks``). Anything else goes through ``guard_path``.
     """
 
     root: str
+    # ``(cwd, display prefix)`` of the last ``_display_prefix`` call.
+    _display_memo: Tuple[str, str] = field(default=("", ""), init=False, repr=False, compare=False)
+
+    @cached_property
+    def root_real(self) -> str:
+        """Resolved absolute cache root, computed on first use."""
+        return os.path.realpath(self.root)
+
+    @cached_property
+    def _known_dirs(self) -> Set[str]:
+        """Directories already created or verified by ``file``."""
+        return set()
 
     @staticmethod
     def make(root: Optional[str] = None) -> "Cache":
@@ -77,7 +124,7 @@ class Cache:
         CacheFenceError
             If the path escapes the cache root.
         """
-        root_real = os.path.realpath(self.root)
+        root_real = self.root_real
         path_real = os.path.realpath(path)
         try:
             common = os.path.commonpath([root_real, path_real])
@@ -101,8 +148,16 @@ class Cache:
         str
             Absolute, fenced path to the cache file.
         """
+        if is_plain_name(filename):
+            if self.root_real not in self._known_dirs:
+                ensure_dir(self.root_real)
+                self._known_dirs.add(self.root_real)
+            return os.path.join(self.root_real, filename)
         p = os.path.join(self.root, filename)
-        ensure_dir(os.path.dirname(p))
+        parent = os.path.dirname(p)
+        if parent not in self._known_dirs:
+            ensure_dir(parent)
+            self._known_dirs.add(parent)
         return self.guard_path(p)
 
     def tex_path(self, path: str) -> str:
@@ -119,9 +174,58 @@ class Cache:
         str
             TeX-friendly path with normalized separators.
         """
-        path_real = self.guard_path(path)
+        name = self.child_name(path)
+        if name is not None:
+            return self._display_prefix() + name
+        return self._display(self.guard_path(path))
+
+    def child_name(self, path: str) -> Optional[str]:
+        """
+        Recognize a path produced by ``file`` for a plain name.
+
+        Parameters
+        ----------
+        path : str
+            Candidate path.
+
+        Returns
+        -------
+        str or None
+            ``name`` if ``path`` is exactly ``root_real/<plain name>``,
+            otherwise None (the caller should fall back to ``guard_path``).
+        """
+        head, sep, name = path.rpartition(os.sep)
+        if sep and head == self.root_real and is_plain_name(name):
+            return name
+        return None
+
+    def tex_prefix(self) -> str:
+        """
+        Return what ``tex_path`` puts before a plain file name.
+
+        Returns
+        -------
+        str
+            Display form of the root with a trailing ``/`` (empty when the
+            root is the working directory), cached per working directory.
+        """
+        return self._display_prefix()
+
+    def _display_prefix(self) -> str:
+        """Display form of the root plus a trailing ``/``, cached per cwd."""
+        cwd = os.getcwd()
+        memo_cwd, prefix = self._display_memo
+        if memo_cwd != cwd:
+            prefix = self._display(self.root_real, cwd)
+            prefix = "" if prefix == "." else prefix + "/"
+            # The dataclass is frozen; the memo is not part of its value.
+            object.__setattr__(self, "_display_memo", (cwd, prefix))
+        return prefix
+
+    def _display(self, path_real: str, cwd: Optional[str] = None) -> str:
+        """Relative display path if it stays below ``cwd``, else absolute."""
         try:
-            rel = os.path.relpath(path_real, os.getcwd())
+            rel = os.path.relpath(path_real, cwd or os.getcwd())
         except ValueError:
             rel = None
         upward = os.pardir
@@ -132,6 +236,40 @@ class Cache:
         return display.replace(os.sep, "/")
 
 
+def open_artifact(path: str) -> BinaryIO:
+    """
+    Open a cache artifact for binary reading without following symlinks.
+
+    Parameters
+    ----------
+    path : str
+        Artifact path, typically from ``Cache.file``.
+
+    Returns
+    -------
+    BinaryIO
+        Open file object.
+
+    Raises
+    ------
+    CacheFenceError
+        If ``path`` is a symbolic link.
+    OSError
+        If the file cannot be opened (e.g. ``FileNotFoundError``).
+    """
+    if not _NOFOLLOW and os.path.islink(path):
+        raise CacheFenceError(f"Refusing symbolic link in cache: {path}")
+    try:
+        fd = os.open(path, os.O_RDONLY | _NOFOLLOW | getattr(os, "O_BINARY", 0))
+    except FileNotFoundError:
+        raise
+    except OSError as exc:
+        if os.path.islink(path):
+            raise CacheFenceError(f"Refusing symbolic link in cache: {path}") from exc
+        raise
+    return os.fdopen(fd, "rb")
+
+
 def atomic_write(path: str, data: str) -> None:
     """
     Write data to a file atomically.
@@ -143,7 +281,50 @@ def atomic_write(path: str, data: str) -> None:
     data : str
         File contents to write.
     """
-    tmp = f"{path}.tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        f.write(data)
-    os.replace(tmp, path)
\ No newline at end of file
+    atomic_write_chunks(path, (data,))
+
+
+def atomic_write_chunks(path: str, chunks: Iterable[str]) -> None:
+    """
+    Write text fragments to a file atomically, one chunk at a time.
+
+    Parameters
+    ----------
+    path : str
+        Destination path.
+    chunks : iterable of str
+        File contents, consumed lazily; the concatenation is never held in
+        memory, so generators can stream arbitrarily large artifacts.
+
+    Raises
+    ------
+    CacheFenceError
+        If ``path`` is a symbolic link.
+
+    Notes
+    -----
+    The temporary file is removed if ``chunks`` raises, so a failed write
+    never leaves a partial artifact next to the destination. Its name
+    includes the process id, so parallel builds (``lpm-prebuild``) writing
+    the same file never share a temporary file. If the directory was removed
+    since it was created (e.g. by ``clean-cache`` under a long-lived
+    ``lpm-daemon``), it is created again.
+    """
+    if os.path.islink(path):
+        raise CacheFenceError(f"Refusing symbolic link in cache: {path}")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        try:
+            f = open(tmp, "w", encoding="utf-8")
+        except FileNotFoundError:
+            ensure_dir(os.path.dirname(path) or ".")
+            f = open(tmp, "w", encoding="utf-8")
+        with f:
+            f.writelines(chunks)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    os.replace(tmp, path)
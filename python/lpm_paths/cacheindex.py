@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+"""
+Append-only index of cache artifacts and size/age-bounded eviction.
+
+Every artifact written or reused by the emitters is logged to
+``<cache root>/.index.jsonl`` as one JSON object per line::
+
+    {"event": "write", "file": "path-a-<hash>.tex", "size": 1234, "time": 1700000000.0}
+    {"event": "access", "file": "path-a-<hash>.tex", "time": 1700000100.0}
+
+Replaying the log gives the size, creation time and last access of each
+file. Cache hits append to the log, so ``flush`` compacts it to one or two
+lines per artifact once it grows well past its last compacted size. ``gc`` combines that with the files actually on disk and evicts
+least-recently-used artifacts according to an age and/or size budget.
+Cache hits only log the per-name alias, so a ``geom-*`` file counts as used
+whenever one of the aliases that input it is, and evicting it evicts them.
+"""
+
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, Iterable, List, Optional
+
+from .cache import Cache, atomic_write_chunks
+from .errors import InputSpecError
+
+INDEX_FILENAME = ".index.jsonl"
+
+# ``flush`` compacts a log larger than COMPACT_MIN_BYTES once it reaches
+# COMPACT_FACTOR times the size it had when last compacted.
+COMPACT_MIN_BYTES = 1 << 20
+COMPACT_FACTOR = 4
+
+# Top-level cache files that the index tracks and gc may evict.
+ARTIFACT_PREFIXES = ("path-", "between-", "bundle-", "geom-", "hasse-")
+
+# Aliases input their geometry in their first lines.
+_GEOMETRY_REF = re.compile(r"\\lp@inputgeometry\{[^}]*?(geom-[0-9a-f]+)\.tex\}")
+_ALIAS_HEAD = 4096
+
+
+@dataclass
+class IndexEntry:
+    """
+    Recorded state of one cache artifact.
+
+    Attributes
+    ----------
+    file : str
+        File name relative to the cache root.
+    size : int
+        Size in bytes.
+    created : float
+        Time of the last write (seconds since the epoch).
+    accessed : float
+        Time of the last write or cache hit.
+    """
+
+    file: str
+    size: int
+    created: float
+    accessed: float
+
+
+@dataclass
+class GCResult:
+    """
+    Outcome of a ``gc`` run.
+
+    Attributes
+    ----------
+    removed : list[str]
+        Evicted file names, relative to the cache root.
+    freed : int
+        Bytes released by the evicted files.
+    kept : int
+        Bytes still held by tracked artifacts.
+    """
+
+    removed: List[str] = field(default_factory=list)
+    freed: int = 0
+    kept: int = 0
+
+
+def is_artifact(filename: str) -> bool:
+    """
+    Check whether a cache file name is a tracked artifact.
+
+    Parameters
+    ----------
+    filename : str
+        File name relative to the cache root.
+
+    Returns
+    -------
+    bool
+        True for finished ``path-*``, ``between-*``, ``bundle-*``,
+        ``geom-*`` and ``hasse-*`` files.
+    """
+    return filename.startswith(ARTIFACT_PREFIXES) and not filename.endswith(".tmp")
+
+
+class CacheIndex:
+    """
+    Usage log for the artifacts under a cache root.
+
+    Parameters
+    ----------
+    cache : Cache
+        Cache whose artifacts are recorded.
+
+    Notes
+    -----
+    Events are buffered by ``record_write`` / ``record_access`` and appended
+    to the log in a single write by ``flush``, so a batch of declarations
+    costs one append. Lines that cannot be parsed (for example a write cut
+    short by an interrupted build) are ignored on load. ``compact`` starts
+    the log with a ``{"event": "compact", "size": ...}`` line recording its
+    size, which ``flush`` compares against to bound the growth of the log.
+    """
+
+    def __init__(self, cache: Cache) -> None:
+        """
+        Initialize the index.
+
+        Parameters
+        ----------
+        cache : Cache
+            Cache whose artifacts are recorded.
+        """
+        self.cache = cache
+        self.path = os.path.join(cache.root, INDEX_FILENAME)
+        self._pending: List[str] = []
+
+    def _relname(self, path: str) -> str:
+        name = self.cache.child_name(path)
+        if name is not None:
+            return name
+        return os.path.relpath(self.cache.guard_path(path), self.cache.root_real).replace(os.sep, "/")
+
+    def record_write(self, path: str) -> int:
+        """
+        Record that an artifact was (re)written.
+
+        Parameters
+        ----------
+        path : str
+            Artifact path inside the cache.
+
+        Returns
+        -------
+        int
+            Size of the artifact in bytes.
+        """
+        size = os.path.getsize(path)
+        event = {"event": "write", "file": self._relname(path), "size": size, "time": time.time()}
+        self._pending.append(json.dumps(event, sort_keys=True))
+        return size
+
+    def record_access(self, path: str) -> None:
+        """
+        Record that an existing artifact was reused.
+
+        Parameters
+        ----------
+        path : str
+            Artifact path inside the cache.
+        """
+        event = {"event": "access", "file": self._relname(path), "time": time.time()}
+        self._pending.append(json.dumps(event, sort_keys=True))
+
+    def flush(self) -> None:
+        """
+        Append buffered events to the log, compacting it when it has grown.
+
+        Notes
+        -----
+        Once the log is larger than ``COMPACT_MIN_BYTES`` and
+        ``COMPACT_FACTOR`` times its last compacted size (or was never
+        compacted), it is replayed and rewritten with ``compact``. A
+        concurrent build may lose the access events it appends meanwhile,
+        which only makes its artifacts look older to ``gc``.
+        """
+        if not self._pending:
+            return
+        data = "".join(line + "\n" for line in self._pending)
+        self._pending.clear()
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(data)
+            size = fh.tell()
+        if size > COMPACT_MIN_BYTES and size > COMPACT_FACTOR * self._compacted_size():
+            self.compact(self.load().values())
+
+    def _compacted_size(self) -> int:
+        """Size recorded by the last ``compact``, or 0 if there is none."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                event = json.loads(fh.readline())
+            return int(event["size"]) if event.get("event") == "compact" else 0
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return 0
+
+    def load(self) -> Dict[str, IndexEntry]:
+        """
+        Replay the log and reconcile it with the files on disk.
+
+        Returns
+        -------
+        dict[str, IndexEntry]
+            One entry per artifact currently in the cache root. Files missing
+            from the log (e.g. written before the index existed) use their
+            modification time; logged files that no longer exist are dropped.
+        """
+        entries: Dict[str, IndexEntry] = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        event = json.loads(line)
+                        name, stamp = event["file"], float(event["time"])
+                        if event["event"] == "write":
+                            entries[name] = IndexEntry(name, int(event["size"]), stamp, stamp)
+                        elif name in entries:
+                            entries[name].accessed = max(entries[name].accessed, stamp)
+                        else:
+                            entries[name] = IndexEntry(name, 0, stamp, stamp)
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+        current: Dict[str, IndexEntry] = {}
+        for name in sorted(os.listdir(self.cache.root)):
+            full = os.path.join(self.cache.root, name)
+            if not is_artifact(name) or not os.path.isfile(full):
+                continue
+            st = os.stat(full)
+            entry = entries.get(name)
+            if entry is None or entry.created < st.st_mtime - 1:
+                # Unlogged, or rewritten by a writer that did not log it.
+                entry = IndexEntry(name, st.st_size, st.st_mtime, max(st.st_mtime, entry.accessed if entry else 0))
+            entry.size = st.st_size
+            current[name] = entry
+        return current
+
+    def compact(self, entries: Iterable[IndexEntry]) -> None:
+        """
+        Rewrite the log with one write (and access) event per entry.
+
+        Parameters
+        ----------
+        entries : iterable of IndexEntry
+            Entries to keep.
+        """
+        lines: List[str] = []
+        for e in entries:
+            lines.append(json.dumps({"event": "write", "file": e.file, "size": e.size, "time": e.created}, sort_keys=True) + "\n")
+            if e.accessed > e.created:
+                lines.append(json.dumps({"event": "access", "file": e.file, "time": e.accessed}, sort_keys=True) + "\n")
+        size = sum(len(line.encode("utf-8")) for line in lines)
+        header = json.dumps({"event": "compact", "size": size}, sort_keys=True) + "\n"
+        atomic_write_chunks(self.path, chain((header,), lines))
+
+
+def _group_key(filename: str) -> str:
+    """Artifacts sharing a stem (``.tex`` + ``.json``) are evicted together."""
+    return os.path.splitext(filename)[0]
+
+
+def _geometry_of(cache: Cache, filename: str) -> Optional[str]:
+    """Group key of the geometry an alias ``.tex`` inputs, if any."""
+    if filename.startswith("geom-") or not filename.endswith(".tex"):
+        return None
+    try:
+        with open(os.path.join(cache.root, filename), encoding="utf-8", errors="replace") as fh:
+            found = _GEOMETRY_REF.search(fh.read(_ALIAS_HEAD))
+    except OSError:
+        return None
+    return found.group(1) if found else None
+
+
+def gc(
+    cache: Cache,
+    max_bytes: Optional[int] = None,
+    max_age: Optional[float] = None,
+    now: Optional[float] = None,
+    dry_run: bool = False,
+) -> GCResult:
+    """
+    Evict cache artifacts by age and total size, least recently used first.
+
+    Parameters
+    ----------
+    cache : Cache
+        Cache to clean.
+    max_bytes : int or None, optional
+        Size budget for all tracked artifacts. Least recently used artifacts
+        are removed until the total fits.
+    max_age : float or None, optional
+        Remove artifacts not written or reused for this many seconds.
+    now : float or None, optional
+        Reference time; defaults to ``time.time()``.
+    dry_run : bool, optional
+        Report what would be removed without deleting anything.
+
+    Returns
+    -------
+    GCResult
+        Removed files, bytes freed, and bytes kept.
+
+    Raises
+    ------
+    InputSpecError
+        If a budget is negative.
+
+    Notes
+    -----
+    The ``.tex`` and ``.json`` files of one declaration are treated as a unit.
+    A geometry is as recent as the newest alias that inputs it, and is
+    evicted together with those aliases. Evicted artifacts are regenerated the next time their declaration runs;
+    ``.names`` metadata is never evicted.
+    """
+    if (max_bytes is not None and max_bytes < 0) or (max_age is not None and max_age < 0):
+        raise InputSpecError("gc budgets must be non-negative.")
+    now = time.time() if now is None else now
+    index = CacheIndex(cache)
+    entries = index.load()
+    groups: Dict[str, List[IndexEntry]] = {}
+    for entry in entries.values():
+        groups.setdefault(_group_key(entry.file), []).append(entry)
+    accessed = {stem: max(e.accessed for e in group) for stem, group in groups.items()}
+    users: Dict[str, List[str]] = {}
+    for stem, group in groups.items():
+        for entry in group:
+            geometry = _geometry_of(cache, entry.file)
+            if geometry in groups:
+                users.setdefault(geometry, []).append(stem)
+                accessed[geometry] = max(accessed[geometry], accessed[stem])
+    # Least recently used first; a geometry never precedes its aliases.
+    order = sorted(groups, key=lambda stem: (accessed[stem], stem.startswith("geom-"), stem))
+    total = sum(e.size for e in entries.values())
+    result = GCResult()
+    evict: List[IndexEntry] = []
+    gone = set()
+    for stem in order:
+        if stem in gone:
+            continue
+        too_old = max_age is not None and accessed[stem] < now - max_age
+        too_big = max_bytes is not None and total > max_bytes
+        if not (too_old or too_big):
+            continue
+        for victim in [stem] + [user for user in users.get(stem, ()) if user not in gone]:
+            gone.add(victim)
+            evict.extend(groups[victim])
+            total -= sum(e.size for e in groups[victim])
+    for entry in evict:
+        result.removed.append(entry.file)
+        result.freed += entry.size
+        if not dry_run:
+            try:
+                os.remove(cache.guard_path(os.path.join(cache.root, entry.file)))
+            except FileNotFoundError:
+                pass
+            del entries[entry.file]
+    result.kept = total
+    if not dry_run:
+        index.compact(sorted(entries.values(), key=lambda e: e.file))
+    return result
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Command-line maintenance for the lpmresonance cache (``lpm-cache``).
+
+Usage::
+
+    lpm-cache gc [--root lp-cache] [--max-size 500M] [--max-age 30d] [--dry-run]
+    lpm-cache stats [--root lp-cache] [--top 10] [--reset]
+
+``gc`` evicts least recently used artifacts until the cache fits the given
+size and age budgets; see ``lpm_paths.cacheindex`` for how usage is tracked.
+``stats`` summarizes the trace recorded with ``LPM_TRACE=1`` (see
+``lpm_paths.trace``): hits, misses, bytes written, level-of-detail vertex
+counts, time per phase, and the slowest declarations.
+"""
+
+import argparse
+import os
+import sys
+from typing import Optional
+
+from .cache import DEFAULT_CACHE_DIR, Cache
+from .cacheindex import gc
+from .trace import TRACE_FILENAME, load_trace, summarize
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+_AGE_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_size(text: str) -> int:
+    """
+    Parse a byte count such as ``1048576``, ``512K``, ``200M`` or ``2G``.
+
+    Parameters
+    ----------
+    text : str
+        Size with an optional binary unit suffix.
+
+    Returns
+    -------
+    int
+        Size in bytes.
+
+    Raises
+    ------
+    argparse.ArgumentTypeError
+        If the text is not a non-negative size.
+    """
+    value = text.strip().upper().removesuffix("B")
+    unit = value[-1:] if value[-1:] in _SIZE_UNITS else ""
+    number = value[: len(value) - len(unit)]
+    try:
+        size = int(float(number) * _SIZE_UNITS[unit])
+    except (ValueError, OverflowError):
+        raise argparse.ArgumentTypeError(f"invalid size: {text!r}") from None
+    if size < 0:
+        raise argparse.ArgumentTypeError(f"size must not be negative: {text!r}")
+    return size
+
+
+def parse_age(text: str) -> float:
+    """
+    Parse a duration such as ``3600``, ``90m``, ``12h``, ``30d`` or ``2w``.
+
+    Parameters
+    ----------
+    text : str
+        Duration with an optional unit suffix (seconds by default).
+
+    Returns
+    -------
+    float
+        Duration in seconds.
+
+    Raises
+    ------
+    argparse.ArgumentTypeError
+        If the text is not a non-negative duration.
+    """
+    value = text.strip().lower()
+    unit = value[-1:] if value[-1:] in _AGE_UNITS else "s"
+    number = value[:-1] if value[-1:] in _AGE_UNITS else value
+    try:
+        age = float(number) * _AGE_UNITS[unit]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid age: {text!r}") from None
+    if not age >= 0:
+        raise argparse.ArgumentTypeError(f"age must not be negative: {text!r}")
+    return age
+
+
+def parse_count(text: str) -> int:
+    """
+    Parse a non-negative count such as ``10``.
+
+    Parameters
+    ----------
+    text : str
+        Decimal integer.
+
+    Returns
+    -------
+    int
+        The count.
+
+    Raises
+    ------
+    argparse.ArgumentTypeError
+        If the text is not a non-negative integer.
+    """
+    try:
+        count = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid count: {text!r}") from None
+    if count < 0:
+        raise argparse.ArgumentTypeError(f"count must not be negative: {text!r}")
+    return count
+
+
+def _format_size(size: int) -> str:
+    for unit in ("B", "K", "M"):
+        if size < 1024:
+            return f"{size}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024  # type: ignore[assignment]
+    return f"{size:.1f}G"
+
+
+def _cmd_gc(args: argparse.Namespace) -> int:
+    if args.max_size is None and args.max_age is None:
+        print("lpm-cache gc: nothing to do; pass --max-size and/or --max-age", file=sys.stderr)
+        return 2
+    if not os.path.isdir(args.root):
+        print(f"lpm-cache gc: no cache at {args.root}", file=sys.stderr)
+        return 1
+    result = gc(Cache(root=args.root), max_bytes=args.max_size, max_age=args.max_age, dry_run=args.dry_run)
+    verb = "would remove" if args.dry_run else "removed"
+    for name in result.removed:
+        if args.verbose:
+            print(f"{verb} {name}")
+    print(f"{verb} {len(result.removed)} files ({_format_size(result.freed)}); {_format_size(result.kept)} kept")
+    return 0
+
+
+def _format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.0f} us"
+
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    path = os.path.join(args.root, TRACE_FILENAME)
+    summary = summarize(load_trace(path), top=args.top)
+    if not summary.calls:
+        print(f"lpm-cache stats: no trace at {path}; build with LPM_TRACE=1 first", file=sys.stderr)
+        return 1
+    ops = ", ".join(f"{op} {count}" for op, count in sorted(summary.ops.items()))
+    print(f"{summary.calls} declarations ({ops}) in {_format_seconds(summary.total)}")
+    print(
+        f"cache: {summary.hits} hits, {summary.misses} misses ({summary.hits / summary.calls:.1%} hit rate); "
+        f"{_format_size(summary.bytes_written)} written, {summary.files_touched} files touched"
+    )
+    if summary.lod["paths"]:
+        lod = summary.lod
+        print(f"level of detail: {lod['paths']} simplified, {lod['source_vertices']} -> {lod['vertices']} vertices")
+    print(f"{'phase':<8} {'time':>10} {'share':>7}")
+    for phase, seconds in summary.phases.items():
+        share = seconds / summary.total if summary.total else 0.0
+        print(f"{phase:<8} {_format_seconds(seconds):>10} {share:>7.1%}")
+    if summary.slowest:
+        print("slowest declarations:")
+        for record in summary.slowest:
+            status = "hit" if record.get("hit") else "miss"
+            print(f"  {_format_seconds(record['total']):>10}  {record.get('op')} {record.get('name')!r} {status}  {record.get('file') or ''}".rstrip())
+    if args.reset:
+        os.remove(path)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the ``lpm-cache`` argument parser.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser with one sub-command per maintenance task.
+    """
+    parser = argparse.ArgumentParser(prog="lpm-cache", description="Maintain the lpmresonance cache.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_gc = sub.add_parser("gc", help="evict least recently used artifacts")
+    p_gc.add_argument("--root", default=DEFAULT_CACHE_DIR, help=f"cache directory (default: {DEFAULT_CACHE_DIR})")
+    p_gc.add_argument("--max-size", type=parse_size, help="size budget, e.g. 500M or 2G")
+    p_gc.add_argument("--max-age", type=parse_age, help="evict artifacts unused for this long, e.g. 12h or 30d")
+    p_gc.add_argument("--dry-run", action="store_true", help="report without deleting")
+    p_gc.add_argument("-v", "--verbose", action="store_true", help="list every evicted file")
+    p_gc.set_defaults(func=_cmd_gc)
+    p_stats = sub.add_parser("stats", help="summarize the LPM_TRACE trace")
+    p_stats.add_argument("--root", default=DEFAULT_CACHE_DIR, help=f"cache directory (default: {DEFAULT_CACHE_DIR})")
+    p_stats.add_argument("--top", type=parse_count, default=10, help="number of slowest declarations to list (default: 10)")
+    p_stats.add_argument("--reset", action="store_true", help="delete the trace after summarizing it")
+    p_stats.set_defaults(func=_cmd_stats)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run ``lpm-cache`` and return its exit code."""
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+"""
+Thin client for the warm-worker daemon (``lpm-daemon``).
+
+The PythonTeX snippets emitted by ``lpmres-python.code.tex`` call ``call``
+instead of the API functions directly. When a daemon is listening on the
+socket, the declaration is forwarded to it, so nothing beyond this module is
+imported and the daemon's warm state (imported modules, name registry) is
+reused. Otherwise, or if the daemon cannot answer, the API function runs in
+this process exactly as before.
+
+The socket lives in ``$XDG_RUNTIME_DIR`` or in a private per-user directory,
+and the client only connects to a socket owned by the current user, so
+another local user cannot answer in the daemon's place. A daemon that does
+not reply within ``REPLY_TIMEOUT`` seconds is treated as absent.
+
+Only ``json``, ``os``, ``socket`` and ``stat`` are imported at module level,
+to keep the start-up cost of each PythonTeX session low.
+"""
+
+import json
+import os
+import socket
+import stat
+
+from . import errors
+from .version import EMITTER_VERSION
+
+# API functions the daemon accepts, by name.
+CALLS = ("declare_path_from_json", "declare_paths_from_json", "between_from_json", "hasse_from_json")
+
+# Environment variable overriding the socket location ("off" disables the daemon).
+SOCKET_ENV = "LPM_DAEMON_SOCKET"
+
+# Seconds to wait for the daemon to accept a connection.
+CONNECT_TIMEOUT = 0.05
+
+# Seconds ``call`` waits for a reply before running the call in process.
+REPLY_TIMEOUT = 30.0
+
+# ``lpm_paths.trace.TRACE_ENV``, forwarded so the daemon traces the call
+# (the trace module is not imported here).
+_TRACE_ENV = "LPM_TRACE"
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Dict, Optional
+
+
+def default_socket_path() -> Optional[str]:
+    """
+    Return the socket the client and daemon use.
+
+    Returns
+    -------
+    str or None
+        ``$LPM_DAEMON_SOCKET`` if set, otherwise ``lpm-daemon.sock`` in
+        ``$XDG_RUNTIME_DIR``, or in the private directory ``lpm-daemon-<uid>``
+        of ``$TMPDIR`` (default ``/tmp``) that ``lpm-daemon`` creates with mode
+        ``0700``. ``None`` when the variable is ``off`` or the platform has no
+        Unix sockets.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = os.environ.get(SOCKET_ENV)
+    if path == "off":
+        return None
+    if path:
+        return path
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "lpm-daemon.sock")
+    return os.path.join(os.environ.get("TMPDIR") or "/tmp", f"lpm-daemon-{os.getuid()}", "daemon.sock")
+
+
+def owned_socket(path: str) -> bool:
+    """
+    Tell whether ``path`` is a Unix socket owned by the current user.
+
+    Parameters
+    ----------
+    path : str
+        Socket path.
+
+    Returns
+    -------
+    bool
+        ``False`` if the path is missing, is not a socket (a symbolic link
+        is not followed), or belongs to another user.
+    """
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(st.st_mode) and st.st_uid == os.getuid()
+
+
+def request(message: Dict[str, Any], path: Optional[str] = None, timeout: Optional[float] = None) -> Optional[Dict[str, Any]]:
+    """
+    Send one request to the daemon and return its reply.
+
+    Parameters
+    ----------
+    message : dict
+        JSON-serializable request.
+    path : str or None, optional
+        Socket path (default: ``default_socket_path()``).
+    timeout : float or None, optional
+        Seconds to wait for the reply once connected (default:
+        ``REPLY_TIMEOUT``).
+
+    Returns
+    -------
+    dict or None
+        The decoded reply, or ``None`` if no daemon answered in time or the
+        socket is not ``owned_socket``.
+    """
+    path = path or default_socket_path()
+    if path is None or not owned_socket(path):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(path)
+        sock.settimeout(REPLY_TIMEOUT if timeout is None else timeout)
+        sock.sendall(json.dumps(message, ensure_ascii=False).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as fh:
+            line = fh.readline()
+        return json.loads(line) if line else None
+    except (OSError, ValueError):
+        return None
+    finally:
+        sock.close()
+
+
+def call(name: str, spec_json: str, **kwargs: Any) -> str:
+    """
+    Run an API function through the daemon, or in process as a fallback.
+
+    Parameters
+    ----------
+    name : str
+        One of ``CALLS``.
+    spec_json : str
+        JSON specification passed to the function.
+    **kwargs
+        Extra keyword arguments (e.g. ``bundle=True``), which must be JSON
+        serializable.
+
+    Returns
+    -------
+    str
+        TeX glue returned by the function.
+
+    Raises
+    ------
+    InputSpecError
+        If ``name`` is not in ``CALLS``, or the specification is invalid
+        (raised with the daemon's message when it answered).
+    CacheFenceError, InvariantError
+        Re-raised from the daemon or the in-process call.
+    """
+    if name not in CALLS:
+        raise errors.InputSpecError(f"Unknown call: {name!r}.")
+    reply = request(
+        {
+            "op": "call",
+            "name": name,
+            "spec": spec_json,
+            "kwargs": kwargs,
+            "cwd": os.getcwd(),
+            "version": EMITTER_VERSION,
+            "trace": os.environ.get(_TRACE_ENV, ""),
+        }
+    )
+    if reply is not None:
+        if reply.get("ok"):
+            return reply["result"]
+        if reply.get("error_type") in errors.__all__:
+            raise getattr(errors, reply["error_type"])(reply.get("error", ""))
+        # Version mismatch or an unexpected failure: run it here instead.
+    # No reply (no daemon, a foreign socket, or a daemon busy past
+    # REPLY_TIMEOUT): run it here. Artifacts are written atomically, so a
+    # late daemon finishing the same call is harmless.
+    from . import api
+
+    return getattr(api, name)(spec_json, **kwargs)
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Warm-worker daemon for PythonTeX declarations (``lpm-daemon``).
+
+Usage::
+
+    lpm-daemon serve [--socket PATH]     # run in the foreground
+    lpm-daemon status [--socket PATH]
+    lpm-daemon stop [--socket PATH]
+
+A fresh ``pythontex`` run imports ``lpm_paths`` and reloads the cache state
+from disk before its first declaration. The daemon keeps one interpreter
+alive with the package imported and the per-cache name registries loaded,
+and answers requests from ``lpm_paths.client.call`` on a Unix socket that
+only the current user can open. The default socket directory is created with
+mode ``0700``, and the daemon refuses to use it if another user owns it or
+can write to it.
+
+Protocol: one JSON object per line in each direction. Requests are
+
+- ``{"op": "call", "name": ..., "spec": ..., "kwargs": {...}, "cwd": ..., "version": ..., "trace": ...}``,
+  answered with ``{"ok": true, "result": <glue>}`` or
+  ``{"ok": false, "error": <message>, "error_type": <class name>}``;
+- ``{"op": "ping"}``, answered with the daemon's pid, ``EMITTER_VERSION``
+  and the counters of its path memo (``lpm_paths.memo.PATH_MEMO``);
+- ``{"op": "stop"}``.
+
+Calls run one at a time, in the client's working directory, so relative
+cache roots resolve exactly as they would inside PythonTeX. ``trace`` is the
+client's ``LPM_TRACE``; when empty, the daemon's own setting applies.
+"""
+
+import argparse
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from . import api
+from .cache import Cache
+from .client import CALLS, default_socket_path, request
+from .errors import InputSpecError
+from .memo import PATH_MEMO
+from .names import NameRegistry
+from .trace import TRACE_ENV
+from .version import EMITTER_VERSION
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    """Answer every request line of one connection."""
+
+    server: "DaemonServer"
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            reply = self.server.dispatch(line)
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode("utf-8") + b"\n")
+            self.wfile.flush()
+            if self.server.stopping:
+                return
+
+
+def _private_dir(path: str) -> None:
+    """Create ``path`` with mode 0700, or check an existing one is private."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise OSError(f"{path} must be a directory private to the current user")
+
+
+class DaemonServer(socketserver.UnixStreamServer):
+    """
+    Single-threaded Unix socket server running API calls.
+
+    Parameters
+    ----------
+    path : str
+        Socket path. A stale socket left by a crashed daemon is replaced.
+
+    Raises
+    ------
+    OSError
+        If another daemon is already listening on ``path``, or the private
+        directory of the default socket is not private.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Bind the socket and restrict it to the current user.
+
+        Parameters
+        ----------
+        path : str
+            Socket path.
+        """
+        parent = os.path.dirname(os.path.abspath(path))
+        if os.path.basename(parent) == f"lpm-daemon-{os.getuid()}":
+            _private_dir(parent)
+        if os.path.lexists(path):
+            if request({"op": "ping"}, path=path, timeout=1.0) is not None:
+                raise OSError(f"a daemon is already listening on {path}")
+            os.remove(path)
+        self.stopping = False
+        self.calls = 0
+        self.started = time.time()
+        self.trace_default = os.environ.get(TRACE_ENV, "")
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(old_umask)
+
+    def dispatch(self, line: bytes) -> Dict[str, Any]:
+        """
+        Decode and run one request.
+
+        Parameters
+        ----------
+        line : bytes
+            One JSON request line.
+
+        Returns
+        -------
+        dict
+            The reply to send back.
+        """
+        try:
+            message = json.loads(line)
+            op = message["op"]
+        except (ValueError, KeyError, TypeError):
+            return {"ok": False, "error": "malformed request", "error_type": None}
+        if op == "ping":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "version": EMITTER_VERSION,
+                "calls": self.calls,
+                "uptime": time.time() - self.started,
+                "memo": asdict(PATH_MEMO.stats),
+            }
+        if op == "stop":
+            self.stopping = True
+            return {"ok": True}
+        if op != "call":
+            return {"ok": False, "error": f"unknown op {op!r}", "error_type": None}
+        if message.get("version") != EMITTER_VERSION:
+            # The client falls back to running in its own (newer or older) package.
+            return {"ok": False, "error": f"daemon runs emitter version {EMITTER_VERSION}", "error_type": None}
+        return self._call(message)
+
+    def _call(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        name, kwargs = message.get("name"), message.get("kwargs") or {}
+        try:
+            if name not in CALLS or not isinstance(kwargs, dict):
+                raise InputSpecError(f"Unknown call: {name!r}.")
+            os.chdir(message["cwd"])
+            os.environ[TRACE_ENV] = message.get("trace") or self.trace_default
+            try:
+                result = getattr(api, name)(message["spec"], **kwargs)
+            finally:
+                # Keep the registry file current for in-process runs elsewhere,
+                # also after a failed call.
+                NameRegistry.for_cache(Cache.make()).flush()
+        except Exception as exc:
+            return {"ok": False, "error": str(exc), "error_type": type(exc).__name__}
+        self.calls += 1
+        return {"ok": True, "result": result}
+
+    def serve(self) -> None:
+        """Handle requests until a ``stop`` request arrives."""
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+            try:
+                os.remove(self.server_address)  # type: ignore[arg-type]
+            except OSError:
+                pass
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    try:
+        server = DaemonServer(args.socket)
+    except OSError as exc:
+        print(f"lpm-daemon: {exc}", file=sys.stderr)
+        return 1
+    print(f"lpm-daemon: listening on {args.socket} (pid {os.getpid()})", flush=True)
+    try:
+        server.serve()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cmd_status(args: argparse.Namespace) -> int:
+    reply = request({"op": "ping"}, path=args.socket, timeout=1.0)
+    if reply is None:
+        print(f"lpm-daemon: not running ({args.socket})")
+        return 1
+    print(
+        f"lpm-daemon: pid {reply['pid']}, emitter {reply['version']}, "
+        f"{reply['calls']} calls in {reply['uptime']:.0f}s ({args.socket})"
+    )
+    memo = reply.get("memo")
+    if memo:
+        print(
+            f"lpm-daemon: path memo {memo['entries']} paths ({memo['bytes'] / 2**20:.1f} MiB), "
+            f"{memo['hits']} hits, {memo['misses']} misses, {memo['evictions']} evictions"
+        )
+    return 0
+
+
+def _cmd_stop(args: argparse.Namespace) -> int:
+    if request({"op": "stop"}, path=args.socket, timeout=5.0) is None:
+        print(f"lpm-daemon: not running ({args.socket})")
+        return 1
+    print("lpm-daemon: stopped")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the ``lpm-daemon`` argument parser.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser with ``serve``, ``status`` and ``stop`` sub-commands.
+    """
+    parser = argparse.ArgumentParser(prog="lpm-daemon", description="Keep lpm_paths warm for PythonTeX calls.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name, func, help_text in (
+        ("serve", _cmd_serve, "run the daemon in the foreground"),
+        ("status", _cmd_status, "report whether a daemon is running"),
+        ("stop", _cmd_stop, "stop the running daemon"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--socket", default=default_socket_path(), help="socket path (default: $LPM_DAEMON_SOCKET, or a file in $XDG_RUNTIME_DIR or a private per-user temp directory)")
+        p.set_defaults(func=func)
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run ``lpm-daemon`` and return its exit code."""
+    args = build_parser().parse_args(argv)
+    if args.socket is None or not hasattr(socket, "AF_UNIX"):
+        print("lpm-daemon: Unix sockets are not available here", file=sys.stderr)
+        return 1
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
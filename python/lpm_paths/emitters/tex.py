@@ -2,30 +2,146 @@ from __future__ import annotations
 
 import json
 import os
-from typing import List, Tuple
+import re
+import stat
+from dataclasses import dataclass
+from itertools import chain
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from ..cache import Cache, atomic_write
-from ..hashing import key_of
-from ..manifest import to_json_obj
+from ..cache import Cache, atomic_write, atomic_write_chunks, open_artifact
+from ..cacheindex import CacheIndex
+from ..errors import CacheFenceError, InputSpecError
+from ..hashing import bits_digest, key_of, structured_key
+from ..lod import between_envelope, choose_cell, exact_vertices, staircase_envelope
+from ..memo import parse_path
+from ..names import NameRegistry
+from ..manifest import iter_bundle_json_fragments, iter_hasse_json_fragments, iter_json_fragments
 from ..sanitize import sanitize_name
+from ..trace import NULL_TRACER, Tracer, trace_enabled
 from ..types import LatticePath
 from ..version import EMITTER_VERSION
 
-def _formatCoords(coords: List[Tuple[int, int]]) -> str: 
+if TYPE_CHECKING:
+    from ..batch import PathBatch
+
+_TEX_TRAILER = "\n\\makeatother\n"
+_TEX_TRAILER_BYTES = _TEX_TRAILER.encode("ascii")
+
+# Per-name alias files are a few hundred bytes; anything this large is not one.
+_ALIAS_MAX = 1 << 16
+# Geometry slot in the last argument of \lp@aliaspath / \lp@aliasbetween.
+_ALIAS_SLOT = re.compile(rb"\{@([0-9a-f]{64})\}")
+
+# How path files store step marks and labels: "compact" stores coordinate and
+# index lists that lpmres-lpath.code.tex loops over when a feature is enabled;
+# "expanded" stores one literal TikZ command per vertex, upmark and corner.
+EMISSION_MODES = ("compact", "expanded")
+
+def _iter_coords_text(coords: Iterable[Tuple[int, int]]) -> Iterator[str]:
     """
-    Format coordinates as TeX-friendly pairs.
+    Format coordinates as TeX-friendly pairs, one pair at a time.
 
     Parameters
     ----------
-    coords : list[tuple[int, int]]
+    coords : iterable of tuple[int, int]
         Sequence of (x, y) lattice points.
 
+    Yields
+    ------
+    str
+        Fragments of the string "(x1,y1) (x2,y2) ...".
+    """
+    sep = ""
+    for x, y in coords:
+        yield f"{sep}({x},{y})"
+        sep = " "
+
+def _decimal(value: int) -> str:
+    """
+    Format a non-negative integer in decimal, however many digits it has.
+
+    Parameters
+    ----------
+    value : int
+        Integer to format (e.g., a path count).
+
     Returns
     -------
     str
-        String in the form "(x1,y1) (x2,y2) ...".
+        Decimal digits. Values beyond the interpreter's ``int`` to ``str``
+        digit limit are converted in 1000-digit blocks.
+    """
+    try:
+        return str(value)
+    except ValueError:
+        high, low = divmod(value, 10 ** 1000)
+        return _decimal(high) + str(low).zfill(1000)
+
+def _joined(items: Iterable[str]) -> Iterator[str]:
+    """
+    Stream ``",".join(items)`` one item at a time.
+
+    Parameters
+    ----------
+    items : iterable of str
+        Items to separate with commas.
+
+    Yields
+    ------
+    str
+        Fragments whose concatenation equals the joined string.
+    """
+    sep = ""
+    for item in items:
+        yield sep + item
+        sep = ","
+
+def _iter_corner_points(bits: str, indices: Iterable[int]) -> Iterator[Tuple[int, int, int]]:
+    """
+    Locate path vertices by step index without building the coordinate list.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+    indices : iterable of int
+        Increasing vertex indices.
+
+    Yields
+    ------
+    tuple[int, int, int]
+        ``(index, x, y)`` for each index, with ``y`` counted incrementally.
+    """
+    y = 0
+    prev = 0
+    for idx in indices:
+        y += bits.count("1", prev, idx)
+        prev = idx
+        yield idx, idx - y, y
+
+def _iter_plot_points(bits: str, corners: Iterable[int]) -> Iterator[Tuple[int, int]]:
+    """
+    Yield the vertices of the polyline a path draws.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+    corners : iterable of int
+        Increasing corner indices (``LatticePath.iter_corners``).
+
+    Yields
+    ------
+    tuple[int, int]
+        ``(0, 0)``, every corner, and the endpoint; the points in between
+        are collinear with their neighbours.
     """
-    return " ".join(f"({x},{y})" for (x, y) in coords)
+    yield (0, 0)
+    for _, x, y in _iter_corner_points(bits, corners):
+        yield x, y
+    if bits:
+        ones = bits.count("1")
+        yield len(bits) - ones, ones
 
 def _gdef(name: str, value: str) -> str: 
     """
@@ -45,6 +161,109 @@ def _gdef(name: str, value: str) -> str:
     """
     return f"\\gdef\\{name}{{{value}}}"
 
+def _artifact_ok(path: str, tail: str) -> bool:
+    """
+    Check that a cached artifact exists and ends with the expected trailer.
+
+    Parameters
+    ----------
+    path : str
+        Cache file to inspect.
+    tail : str
+        Text the complete artifact must end with.
+
+    Returns
+    -------
+    bool
+        True if the file can be reused as-is.
+
+    Raises
+    ------
+    CacheFenceError
+        If ``path`` is a symbolic link.
+    """
+    marker = tail.encode("utf-8")
+    try:
+        with open_artifact(path) as fh:
+            fh.seek(0, os.SEEK_END)
+            size = fh.tell()
+            if size < len(marker):
+                return False
+            fh.seek(size - len(marker))
+            return fh.read() == marker
+    except CacheFenceError:
+        raise
+    except OSError:
+        return False
+
+
+def _alias_geometry(path: str) -> Optional[str]:
+    """
+    Read a complete per-name alias file and return its geometry key.
+
+    Parameters
+    ----------
+    path : str
+        Cache path of a ``path-*.tex`` or ``between-*.tex`` alias.
+
+    Returns
+    -------
+    str or None
+        The ``<hash>`` of the ``geom-<hash>.tex`` file the alias inputs, or
+        None if the alias is missing, truncated, or not an alias. This is
+        the only probe of a cache hit.
+
+    Raises
+    ------
+    CacheFenceError
+        If ``path`` is a symbolic link.
+    """
+    try:
+        with open_artifact(path) as fh:
+            data = fh.read(_ALIAS_MAX)
+    except CacheFenceError:
+        raise
+    except OSError:
+        return None
+    if len(data) >= _ALIAS_MAX or not data.endswith(_TEX_TRAILER_BYTES):
+        return None
+    found = _ALIAS_SLOT.findall(data)
+    return found[-1].decode("ascii") if found else None
+
+def _is_regular(path: str) -> bool:
+    """True if ``path`` is a regular file (a symbolic link is not followed)."""
+    try:
+        return stat.S_ISREG(os.lstat(path).st_mode)
+    except OSError:
+        return False
+
+
+@dataclass
+class EmitterStats:
+    """
+    Cache counters for an emitter.
+
+    Attributes
+    ----------
+    hits : int
+        Declarations served from existing cache artifacts.
+    misses : int
+        Declarations that were rendered and written.
+    bytes_written : int
+        Bytes written to artifacts.
+    files_touched : int
+        Artifacts written or reused.
+    geometry_hits : int
+        Misses whose geometry already existed, e.g. a known shape declared
+        under a new name; only the per-name alias file was written.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bytes_written: int = 0
+    files_touched: int = 0
+    geometry_hits: int = 0
+
 class TeXEmitter:
     """
     Emit TeX macros for lattice paths and between regions.
@@ -53,13 +272,48 @@ class TeXEmitter:
     ----------
     cache : Cache
         Cache instance used for emitted files.
+    trace : bool or None, optional
+        Record per-phase timings of every declaration in the cache's trace
+        log (see ``lpm_paths.trace``). ``None`` follows ``LPM_TRACE``.
+    emission : str, optional
+        ``"compact"`` (default) or ``"expanded"``; see ``EMISSION_MODES``.
+    corner_plot : bool, optional
+        Also write ``\\lp@path@plot@<safe>``, the endpoints and corners
+        only, which ``\\drawLatticePath`` plots instead of every vertex.
+    lod_tolerance : int or None, optional
+        Level of detail: replace the TeX coordinates of paths and between
+        polygons by their staircase envelope on a grid of this spacing (see
+        ``lpm_paths.lod``). The JSON manifests keep full resolution.
+    lod_max_vertices : int or None, optional
+        Level of detail by vertex budget: simplify a path or between polygon
+        only when it has more vertices than this, with the smallest spacing
+        ``lpm_paths.lod.choose_cell`` guarantees to fit.
+
+    Raises
+    ------
+    InputSpecError
+        If ``emission`` is not a known mode or a level-of-detail option is
+        not a valid integer.
 
     Notes
     -----
     Emitted TeX/JSON files are stored under the cache root and referenced
     via TeX macro definitions to avoid partial writes and path leakage.
+    Artifacts are content-addressed, so a declaration whose files already
+    exist is answered from the cache without re-rendering; ``stats`` counts
+    hits and misses. Writes and hits are also logged to the cache ``index``
+    (see ``lpm_paths.cacheindex``) so that ``lpm-cache gc`` can evict the
+    least recently used artifacts.
     """
-    def __init__(self, cache: Cache) -> None:
+    def __init__(
+        self,
+        cache: Cache,
+        trace: bool | None = None,
+        emission: str = "compact",
+        corner_plot: bool = True,
+        lod_tolerance: int | None = None,
+        lod_max_vertices: int | None = None,
+    ) -> None:
         """
         Initialize the emitter.
 
@@ -67,8 +321,91 @@ class TeXEmitter:
         ----------
         cache : Cache
             Cache instance used for emitted files.
+        trace : bool or None, optional
+            Enable tracing; ``None`` follows ``LPM_TRACE``.
+        emission : str, optional
+            Path file layout, one of ``EMISSION_MODES``.
+        corner_plot : bool, optional
+            Write the corner-only plot list next to the full coordinates.
+        lod_tolerance : int or None, optional
+            Envelope grid spacing for TeX coordinates.
+        lod_max_vertices : int or None, optional
+            Vertex budget for TeX coordinates.
         """
+        if emission not in EMISSION_MODES:
+            raise InputSpecError(f"Unknown emission mode {emission!r}; expected one of {', '.join(EMISSION_MODES)}.")
+        # Validates both options.
+        choose_cell([], lod_tolerance, lod_max_vertices)
         self.cache = cache 
+        self.emission = emission
+        self.corner_plot = corner_plot
+        self.lod_tolerance = lod_tolerance
+        self.lod_max_vertices = lod_max_vertices
+        self.stats = EmitterStats()
+        self.trace = Tracer(cache, self.stats) if (trace_enabled() if trace is None else trace) else NULL_TRACER
+        self.index = CacheIndex(cache)
+        self.names = NameRegistry.for_cache(cache)
+        self._preparsed: Dict[str, LatticePath] = {}
+
+    def _parse(self, bits: str) -> LatticePath:
+        """
+        Return the parsed path for a bitstring.
+
+        Parameters
+        ----------
+        bits : str
+            Bitstring encoding of the lattice path.
+
+        Returns
+        -------
+        LatticePath
+            Path supplied by ``write_batch`` if available, otherwise the
+            interned path from ``lpm_paths.memo.PATH_MEMO``.
+        """
+        lp = self._preparsed.get(bits)
+        return lp if lp is not None else parse_path(bits)
+
+    def _lod_payload(self, payload: Dict[str, object]) -> Dict[str, object]:
+        """Add the level-of-detail options to a cache key payload."""
+        if self.lod_tolerance is not None or self.lod_max_vertices is not None:
+            payload["lod"] = [self.lod_tolerance, self.lod_max_vertices]
+        return payload
+
+    def _path_envelope(self, bits: str) -> Optional[Tuple[int, List[Tuple[int, int]]]]:
+        """
+        Simplify a path for TeX when the level-of-detail options ask for it.
+
+        Parameters
+        ----------
+        bits : str
+            Validated bitstring.
+
+        Returns
+        -------
+        tuple[int, list[tuple[int, int]]] or None
+            Grid spacing and envelope vertices, or ``None`` when the path is
+            emitted at full resolution (no option set, or the envelope would
+            not have fewer vertices).
+        """
+        cell = choose_cell([bits], self.lod_tolerance, self.lod_max_vertices)
+        if cell == 1:
+            return None
+        points = staircase_envelope(bits, cell)
+        exact = exact_vertices(bits)
+        if len(points) >= exact:
+            return None
+        self.trace.lod(cell, len(points), exact)
+        return cell, points
+
+    def _wrote(self, path: str) -> None:
+        """Count and index an artifact that was just written."""
+        self.stats.files_touched += 1
+        self.stats.bytes_written += self.index.record_write(path)
+
+    def _reused(self, path: str) -> None:
+        """Count and index an artifact answered from the cache."""
+        self.stats.files_touched += 1
+        self.index.record_access(path)
 
     def _tex_path(self, path: str) -> str: 
         """
@@ -117,6 +454,9 @@ class TeXEmitter:
         """
         Record sanitized name usage and return any prior original name.
 
+        Uses the process-wide ``NameRegistry`` of the cache, so no file is
+        touched per declaration; batches flush it once when they finish.
+
         Parameters
         ----------
         kind : str
@@ -131,21 +471,7 @@ class TeXEmitter:
         str or None
             Prior original name if it differs, otherwise None.
         """
-        rel_path = os.path.join(".names", kind, f"{safe}.json")
-        meta_path = self.cache.file(rel_path)
-        prior: str | None = None
-        if os.path.exists(meta_path):
-            try:
-                with open(meta_path, "r", encoding="utf-8") as fh:
-                    data = json.load(fh)
-                prior = data.get("original")
-            except Exception:
-                prior = None
-        if prior == original:
-            return None
-        payload = {"original": original}
-        atomic_write(meta_path, json.dumps(payload, ensure_ascii=False, sort_keys=True))
-        return prior
+        return self.names.record(kind, safe, original)
 
     def write_path(self, bits: str, name: str, cache_id: str | None = None) -> tuple[str, str, str]:
         """
@@ -166,81 +492,605 @@ class TeXEmitter:
             TeX macro definitions for the path TeX file, JSON file, and
             the last-declared path file.
         """
+        self.trace.start("path", name)
+        try:
+            safe, texpath, jsonpath = self._emit_path(bits, name, cache_id)
+        finally:
+            self.index.flush()
+        self.trace.lap("index")
+        glue = self._path_glue(safe, name, self._tex_path(texpath), self._tex_path(jsonpath))
+        self.trace.end(os.path.basename(texpath))
+        self.trace.flush()
+        return glue
+
+    def write_paths(self, specs: Iterable[Tuple[str, str, Optional[str]]]) -> str:
+        """
+        Emit TeX macros and cached artifacts for several lattice paths.
+
+        Parameters
+        ----------
+        specs : iterable of tuple[str, str, str or None]
+            ``(bits, name, cache_id)`` triples in declaration order.
+
+        Returns
+        -------
+        str
+            Concatenated ``write_path`` glue, with ``\\lp@lastdeclaredpathfile``
+            set once for the final path and ``\\lp@lastdeclaredpathfiles``
+            listing every path file as a comma-separated list.
+        """
+        glue: List[str] = []
+        files: List[str] = []
+        last = ""
+        try:
+            for bits, name, cache_id in specs:
+                self.trace.start("path", name)
+                safe, texpath, jsonpath = self._emit_path(bits, name, cache_id)
+                tex_ref = self._tex_path(texpath)
+                g1, g2, last = self._path_glue(safe, name, tex_ref, self._tex_path(jsonpath))
+                glue.extend([g1, g2])
+                files.append(tex_ref)
+                self.trace.end(os.path.basename(texpath))
+        finally:
+            self.index.flush()
+            self.names.flush()
+            self.trace.flush()
+        if last:
+            glue.append(last)
+        glue.append("\\makeatletter\n" + _gdef("lp@lastdeclaredpathfiles", ",".join(files)) + "\n\\makeatother")
+        return "\n".join(glue)
+
+    def write_bundle(self, specs: Iterable[Tuple[str, str, Optional[str]]], shard_size: int | None = None) -> str:
+        """
+        Emit several lattice paths into shared bundle shards.
+
+        Parameters
+        ----------
+        specs : iterable of tuple[str, str, str or None]
+            ``(bits, name, cache_id)`` triples in declaration order.
+        shard_size : int or None, optional
+            Maximum number of paths per shard. ``None`` puts every path in a
+            single shard.
+
+        Returns
+        -------
+        str
+            Per-path glue in the same shape as ``write_paths``, except that
+            ``\\lp@pathfile@<safe>`` points at the shard holding the path,
+            ``\\lp@pathjson@<safe>`` at the shard's geometry manifest, and
+            ``\\lp@lastdeclaredpathfiles`` lists the shard files.
+
+        Raises
+        ------
+        InputSpecError
+            If ``shard_size`` is not a positive integer.
+
+        Notes
+        -----
+        Each shard has two layers. ``geom-<hash>.tex`` / ``geom-<hash>.json``
+        hold the geometry of the distinct paths of the shard, keyed by their
+        geometry keys only, so renaming paths reuses them. ``bundle-<hash>.tex``
+        inputs that file (once per document) and aliases every name to its
+        geometry; it also defines ``\\lp@bundle@index@<hash>``, the
+        comma-separated list of sanitized names it contains. Both are
+        content-addressed and written atomically like any other artifact.
+        """
+        if shard_size is not None and shard_size < 1:
+            raise InputSpecError("shard_size must be a positive integer.")
+        self.trace.start("bundle", "")
+        # Hash each distinct bitstring once, however often it is declared.
+        digests: Dict[str, bytes] = {}
+        entries = []
+        for bits, name, cache_id in specs:
+            digest = digests.get(bits)
+            if digest is None:
+                digest = digests[bits] = bits_digest(bits)
+            entries.append((bits, name, cache_id, sanitize_name(name), self._geometry_key(digest)))
+        self.trace.lap("key")
+        size = shard_size or max(len(entries), 1)
+        glue: List[str] = []
+        files: List[str] = []
+        last = ""
+        try:
+            for start in range(0, len(entries), size):
+                shard = entries[start:start + size]
+                if start:
+                    self.trace.start("bundle", "")
+                # Distinct shapes of the shard, in first-declaration order.
+                shapes = {key: bits for bits, _, _, _, key in shard}
+                gkey = key_of({"op": "bundle_geometry", "keys": list(shapes), "ver": EMITTER_VERSION})
+                geotex = self.cache.file(f"geom-{gkey}.tex")
+                geojson = self.cache.file(f"geom-{gkey}.json")
+                geo_ref = self._tex_path(geotex)
+                aliases = [(name, cache_id or "") for _, name, cache_id, _, _ in shard]
+                key = key_of({"op": "bundle", "geometry": gkey, "names": aliases, "ref": geo_ref, "ver": EMITTER_VERSION})
+                texpath = self.cache.file(f"bundle-{key}.tex")
+                self.trace.lap("key")
+                have_geometry = _artifact_ok(geotex, _TEX_TRAILER) and _artifact_ok(geojson, "}")
+                if have_geometry and _artifact_ok(texpath, _TEX_TRAILER):
+                    self.trace.lap("probe")
+                    self.stats.hits += len(shard)
+                    self._reused(texpath)
+                    self._reused(geotex)
+                    self._reused(geojson)
+                    self.trace.lap("index")
+                else:
+                    self.trace.lap("probe")
+                    self.stats.misses += len(shard)
+                    if have_geometry:
+                        self.stats.geometry_hits += len(shard)
+                        self._reused(geotex)
+                        self._reused(geojson)
+                        self.trace.lap("index")
+                    else:
+                        atomic_write_chunks(geotex, self.trace.timed(self._iter_bundle_geometry(gkey, shapes), "render"))
+                        self.trace.lap("write")
+                        json_chunks = iter_bundle_json_fragments((None, self._parse(bits)) for bits in shapes.values())
+                        atomic_write_chunks(geojson, self.trace.timed(json_chunks, "render"))
+                        self.trace.lap("write")
+                        self._wrote(geotex)
+                        self._wrote(geojson)
+                        self.trace.lap("index")
+                    body = [f"\\makeatletter\n\\lp@inputgeometry{{{geo_ref}}}{{lp@bundle@index@@{gkey}}}"]
+                    body.extend(f"\n\\lp@aliaspath{{{safe}}}{{@{gkey_}}}" for _, _, _, safe, gkey_ in shard)
+                    index = ",".join(safe for _, _, _, safe, _ in shard)
+                    body.append(f"\n\\expandafter\\gdef\\csname lp@bundle@index@{key}\\endcsname{{{index}}}{_TEX_TRAILER}")
+                    atomic_write(texpath, "".join(body))
+                    self.trace.lap("write")
+                    self._wrote(texpath)
+                    self.trace.lap("index")
+                tex_ref = self._tex_path(texpath)
+                json_ref = self._tex_path(geojson)
+                for _, name, _, safe, _ in shard:
+                    g1, g2, last = self._path_glue(safe, name, tex_ref, json_ref)
+                    glue.extend([g1, g2])
+                files.append(tex_ref)
+                self.trace.end(os.path.basename(texpath), name=f"{len(shard)} paths")
+        finally:
+            self.index.flush()
+            self.names.flush()
+            self.trace.flush()
+        if last:
+            glue.append(last)
+        glue.append("\\makeatletter\n" + _gdef("lp@lastdeclaredpathfiles", ",".join(files)) + "\n\\makeatother")
+        return "\n".join(glue)
+
+    def write_batch(
+        self,
+        batch: "PathBatch",
+        names: Sequence[str],
+        cache_id: str | None = None,
+        bundle: bool = False,
+        shard_size: int | None = None,
+    ) -> str:
+        """
+        Emit TeX macros and cached artifacts for a ``PathBatch``.
+
+        Parameters
+        ----------
+        batch : PathBatch
+            Columnar batch of paths; its precomputed annotations are reused.
+        names : sequence of str
+            One name per path in the batch.
+        cache_id : str or None, optional
+            Cache namespace shared by all paths.
+        bundle : bool, optional
+            Write bundle shards (``write_bundle``) instead of per-path files.
+        shard_size : int or None, optional
+            Maximum number of paths per shard when ``bundle`` is set.
+
+        Returns
+        -------
+        str
+            Glue in the same shape as ``write_paths`` / ``write_bundle``.
+
+        Raises
+        ------
+        InputSpecError
+            If ``names`` does not match the batch length.
+        """
+        if len(names) != len(batch):
+            raise InputSpecError("PathBatch and names must have the same length.")
+        specs: List[Tuple[str, str, Optional[str]]] = []
+        for i, name in enumerate(names):
+            lp = batch[i]
+            self._preparsed[lp.bits] = lp
+            specs.append((lp.bits, name, cache_id))
+        try:
+            if bundle:
+                return self.write_bundle(specs, shard_size=shard_size)
+            return self.write_paths(specs)
+        finally:
+            self._preparsed.clear()
+
+    def _emit_path(self, bits: str, name: str, cache_id: str | None) -> tuple[str, str, str]:
+        """
+        Write (or reuse) the cached artifacts for one lattice path.
+
+        Parameters
+        ----------
+        bits : str
+            Bitstring encoding of the lattice path.
+        name : str
+            Human-readable path name.
+        cache_id : str or None
+            Optional cache namespace or external identifier.
+
+        Returns
+        -------
+        tuple[str, str, str]
+            Sanitized name, alias TeX file path, and geometry JSON manifest
+            path.
+
+        Notes
+        -----
+        The geometry (``geom-<hash>.tex`` / ``.json``) is keyed by the bits
+        and the output options only. The per-name ``path-<safe>-<hash>.tex``
+        is a few lines that input the geometry once per document and alias
+        ``\\lp@path@...@<safe>`` to it, so a new name for a known shape
+        writes nothing else. The alias is keyed by the bits, the options,
+        the name and where the cache is seen from, so a cache hit costs one
+        key, one read of the alias, which names its geometry, and a check
+        that the geometry files exist; a missing geometry makes it a miss.
+        """
         safe = sanitize_name(name)
-        payload = {"op": "declare_path", "bits": bits, "name": name, "ver": EMITTER_VERSION, "cache_id": cache_id or ""}
-        key = key_of(payload)
-        texname = f"path-{safe}-{key}.tex"
-        jsonname = f"path-{safe}-{key}.json"
-        texpath = self.cache.file(texname)
-        jsonpath = self.cache.file(jsonname)
-        lp = LatticePath.from_bits(bits)
-        
-        num_ones = bits.count('1')
-        num_zeros = bits.count('0')
-        
-        body = ["\\makeatletter"]
-        body.append(f"\\expandafter\\gdef\\csname lp@path@coords@{safe}\\endcsname{{{_formatCoords(lp.coords)}}}")
-        
-        # Generate step marks at lattice points (vertices) the path visits
-        if len(lp.coords) > 0:
-            step_mark_cmds: list[str] = []
-            for coord in lp.coords:
-                x, y = coord[0], coord[1]
-                step_mark_cmds.append(f"\\fill[lp/step mark] ({x},{y}) circle (1.5pt);%\n")
-            step_marks_str = "".join(step_mark_cmds)
-            body.append(f"\\expandafter\\gdef\\csname lp@path@stepmarks@{safe}\\endcsname{{{step_marks_str}}}")
-        
-        if lp.upmarks:
-            upstr = ",".join(str(i) for i in lp.upmarks)
-            body.append(f"\\expandafter\\gdef\\csname lp@path@upmarks@{safe}\\endcsname{{{upstr}}}")
-            label_cmds: list[str] = []
-            for idx in lp.upmarks:
-                prev_coord = lp.coords[idx - 1]
-                curr_coord = lp.coords[idx]
-                mid_x = (prev_coord[0] + curr_coord[0]) / 2.0
-                mid_y = (prev_coord[1] + curr_coord[1]) / 2.0
-                label_cmds.append(f"\\node[lp/upmark label] at ({mid_x:g},{mid_y:g}) {{{idx}}};%\n")
-            labels_str = "".join(label_cmds)
-            body.append(f"\\expandafter\\gdef\\csname lp@path@upmarklabels@{safe}\\endcsname{{{labels_str}}}")
-        
-        if lp.insideCorners:
-            cornerstr = ",".join(str(i) for i in lp.insideCorners)
-            body.append(f"\\expandafter\\gdef\\csname lp@path@insidecorners@{safe}\\endcsname{{{cornerstr}}}")
-            body.append(f"\\expandafter\\gdef\\csname lp@path@insidecornercount@{safe}\\endcsname{{{len(lp.insideCorners)}}}")
-            
-            corner_cmds: list[str] = []
-            for idx in lp.insideCorners:
-                coord = lp.coords[idx]
-                x, y = coord[0], coord[1]
-                corner_cmds.append(f"\\fill[red] ({x},{y}) circle (2pt);%\n")
-                corner_cmds.append(f"\\node[lp/inside corner label] at ({x},{y}) {{({x},{y})}};%\n")
-            corners_str = "".join(corner_cmds)
-            body.append(f"\\expandafter\\gdef\\csname lp@path@insidecornerlabels@{safe}\\endcsname{{{corners_str}}}")
-            
-            for corner_num, idx in enumerate(lp.insideCorners, start=1):
-                coord = lp.coords[idx]
-                x, y = coord[0], coord[1]
-                body.append(f"\\expandafter\\gdef\\csname lp@path@insidecornercoord@{safe}@{corner_num}\\endcsname{{({x},{y})}}")
-        
-        body.append(f"\\expandafter\\gdef\\csname lp@path@gridsize@{safe}\\endcsname{{({num_zeros},{num_ones})}}")
-        body.append(f"\\expandafter\\gdef\\csname lp@path@ready@{safe}\\endcsname{{1}}")
-        body.append("\\makeatother")
-        atomic_write(texpath, "\n".join(body) + "\n")
+        digest = bits_digest(bits)
+        fields = self._path_options()
+        fields.update(op="path", name=name, cache_id=cache_id or "", root=self.cache.tex_prefix())
+        texpath = self.cache.file(f"path-{safe}-{structured_key(fields, {'bits': digest})}.tex")
+        self.trace.lap("key")
+        key = _alias_geometry(texpath)
+        if key is not None:
+            geojson = self.cache.file(f"geom-{key}.json")
+            if _is_regular(self.cache.file(f"geom-{key}.tex")) and _is_regular(geojson):
+                self.trace.lap("probe")
+                self.stats.hits += 1
+                self._reused(texpath)
+                self.trace.lap("index")
+                return safe, texpath, geojson
+        self.trace.lap("probe")
+        self.stats.misses += 1
+        key = self._geometry_key(digest)
+        geotex = self.cache.file(f"geom-{key}.tex")
+        geojson = self.cache.file(f"geom-{key}.json")
+        geo_ref = self._tex_path(geotex)
+        self.trace.lap("key")
+        have_geometry = _artifact_ok(geotex, _TEX_TRAILER) and _artifact_ok(geojson, "}")
+        self.trace.lap("probe")
+        if have_geometry:
+            self.stats.geometry_hits += 1
+            self._reused(geotex)
+            self._reused(geojson)
+            self.trace.lap("index")
+        else:
+            lp = self._parse(bits)
+            self.trace.lap("parse")
+            envelope = self._path_envelope(bits)
+            self.trace.lap("lod")
+            tex_chunks = chain(["\\makeatletter"], self._iter_path_body(f"@{key}", lp, envelope), [_TEX_TRAILER])
+            atomic_write_chunks(geotex, self.trace.timed(tex_chunks, "render"))
+            self.trace.lap("write")
+            atomic_write_chunks(geojson, self.trace.timed(iter_json_fragments(None, lp), "render"))
+            self.trace.lap("write")
+            self._wrote(geotex)
+            self._wrote(geojson)
+            self.trace.lap("index")
         atomic_write(
-            jsonpath,
-            json.dumps(to_json_obj(name, lp), ensure_ascii=False, sort_keys=True, separators=(",", ":"), allow_nan=False),
+            texpath,
+            f"\\makeatletter\n\\lp@inputgeometry{{{geo_ref}}}{{lp@path@ready@@{key}}}\n\\lp@aliaspath{{{safe}}}{{@{key}}}{_TEX_TRAILER}",
         )
+        self.trace.lap("write")
+        self._wrote(texpath)
+        self.trace.lap("index")
+        return safe, texpath, geojson
+
+    def _geometry_key(self, bits: str | bytes) -> str:
+        """
+        Compute the content key of a path's geometry.
+
+        Parameters
+        ----------
+        bits : str or bytes
+            Bitstring encoding of the lattice path, or its
+            ``hashing.bits_digest``.
+
+        Returns
+        -------
+        str
+            ``hashing.structured_key`` over the bits, the emitter version and
+            the output options; names and cache namespaces are not part of it.
+        """
+        fields = self._path_options()
+        fields["op"] = "path_geometry"
+        return structured_key(fields, {"bits": bits})
+
+    def _path_options(self) -> Dict[str, object]:
+        """Emitter version and output options that every path key covers."""
+        payload = self._lod_payload({"ver": EMITTER_VERSION})
+        if self.emission != "compact":
+            payload["emission"] = self.emission
+        if not self.corner_plot:
+            payload["corner_plot"] = False
+        return payload
+
+    def _iter_bundle_geometry(self, key: str, shapes: Dict[str, str]) -> Iterator[str]:
+        """
+        Stream the geometry file of one bundle shard.
+
+        Parameters
+        ----------
+        key : str
+            Geometry shard hash.
+        shapes : dict[str, str]
+            Geometry key to bitstring for the distinct paths of the shard.
+
+        Yields
+        ------
+        str
+            File fragments, from ``\\makeatletter`` through the trailer. Each
+            path is defined under ``@<geometry key>`` exactly as in its own
+            ``geom-<hash>.tex``; ``\\lp@bundle@index@@<hash>`` lists them and
+            marks the file as read.
+        """
+        yield "\\makeatletter"
+        for path_key, bits in shapes.items():
+            yield from self._iter_path_body(f"@{path_key}", self._parse(bits), self._path_envelope(bits))
+        index = ",".join(f"@{path_key}" for path_key in shapes)
+        yield f"\n\\expandafter\\gdef\\csname lp@bundle@index@@{key}\\endcsname{{{index}}}"
+        yield _TEX_TRAILER
+
+    def _iter_path_body(
+        self,
+        safe: str,
+        lp: LatticePath,
+        envelope: Optional[Tuple[int, List[Tuple[int, int]]]] = None,
+    ) -> Iterator[str]:
+        """
+        Stream the macro definitions for one lattice path.
+
+        Parameters
+        ----------
+        safe : str
+            Sanitized path name used in macro names.
+        lp : LatticePath
+            Parsed lattice path.
+        envelope : tuple[int, list[tuple[int, int]]] or None, optional
+            Grid spacing and vertices from ``_path_envelope``. When given,
+            the coordinates are the envelope, ``\\lp@path@lod@<safe>`` holds
+            the spacing, and the per-step lists (upmarks, inside corners,
+            expanded step marks and labels) are left to the JSON manifest.
+
+        Yields
+        ------
+        str
+            TeX fragments; every definition starts on a new line. The
+            surrounding ``\\makeatletter`` / ``\\makeatother`` pair is not
+            included.
+
+        Notes
+        -----
+        Coordinates, step marks and labels are generated vertex by vertex
+        from ``LatticePath.iter_*``, so the emitter's memory use does not
+        depend on the path length. In compact mode only the coordinate,
+        upmark and inside-corner lists are written (``insidecornerpoints``
+        holds ``x/y`` pairs); ``\\drawLatticePath`` derives step marks and
+        labels from them, and only when they are enabled.
+        """
+        bits = lp.bits
+        num_ones = bits.count('1')
+        num_zeros = bits.count('0')
+
+        if envelope is not None:
+            cell, points = envelope
+            yield f"\n\\expandafter\\gdef\\csname lp@path@coords@{safe}\\endcsname{{"
+            yield from _iter_coords_text(points)
+            yield "}"
+            yield f"\n\\expandafter\\gdef\\csname lp@path@lod@{safe}\\endcsname{{{cell}}}"
+            yield f"\n\\expandafter\\gdef\\csname lp@path@gridsize@{safe}\\endcsname{{({num_zeros},{num_ones})}}"
+            yield f"\n\\expandafter\\gdef\\csname lp@path@ready@{safe}\\endcsname{{1}}"
+            return
+
+        yield f"\n\\expandafter\\gdef\\csname lp@path@coords@{safe}\\endcsname{{"
+        yield from _iter_coords_text(lp.iter_coords())
+        yield "}"
+
+        if self.corner_plot:
+            # Same polyline as the coordinates, with the collinear vertices dropped.
+            yield f"\n\\expandafter\\gdef\\csname lp@path@plot@{safe}\\endcsname{{"
+            yield from _iter_coords_text(_iter_plot_points(bits, lp.iter_corners()))
+            yield "}"
+
+        if self.emission == "compact":
+            if num_ones:
+                yield f"\n\\expandafter\\gdef\\csname lp@path@upmarks@{safe}\\endcsname{{"
+                yield from _joined(map(str, lp.iter_upmarks()))
+                yield "}"
+            if "01" in bits:
+                yield f"\n\\expandafter\\gdef\\csname lp@path@insidecorners@{safe}\\endcsname{{"
+                yield from _joined(map(str, lp.iter_inside_corners()))
+                yield "}"
+                yield f"\n\\expandafter\\gdef\\csname lp@path@insidecornercount@{safe}\\endcsname{{{bits.count('01')}}}"
+                yield f"\n\\expandafter\\gdef\\csname lp@path@insidecornerpoints@{safe}\\endcsname{{"
+                yield from _joined(f"{x}/{y}" for _, x, y in _iter_corner_points(bits, lp.iter_inside_corners()))
+                yield "}"
+            yield f"\n\\expandafter\\gdef\\csname lp@path@gridsize@{safe}\\endcsname{{({num_zeros},{num_ones})}}"
+            yield f"\n\\expandafter\\gdef\\csname lp@path@ready@{safe}\\endcsname{{1}}"
+            return
+
+        # Step marks at every lattice point (vertex) the path visits
+        yield f"\n\\expandafter\\gdef\\csname lp@path@stepmarks@{safe}\\endcsname{{"
+        for x, y in lp.iter_coords():
+            yield f"\\fill[lp/step mark] ({x},{y}) circle (1.5pt);%\n"
+        yield "}"
+
+        if num_ones:
+            yield f"\n\\expandafter\\gdef\\csname lp@path@upmarks@{safe}\\endcsname{{"
+            yield from _joined(map(str, lp.iter_upmarks()))
+            yield "}"
+            yield f"\n\\expandafter\\gdef\\csname lp@path@upmarklabels@{safe}\\endcsname{{"
+            for level, idx in enumerate(lp.iter_upmarks(), start=1):
+                # The level-th North step runs from (idx-level, level-1) to (idx-level, level).
+                mid_x = float(idx - level)
+                mid_y = level - 0.5
+                yield f"\\node[lp/upmark label] at ({mid_x:g},{mid_y:g}) {{{idx}}};%\n"
+            yield "}"
+
+        if "01" in bits:
+            yield f"\n\\expandafter\\gdef\\csname lp@path@insidecorners@{safe}\\endcsname{{"
+            yield from _joined(map(str, lp.iter_inside_corners()))
+            yield "}"
+            yield f"\n\\expandafter\\gdef\\csname lp@path@insidecornercount@{safe}\\endcsname{{{bits.count('01')}}}"
+
+            yield f"\n\\expandafter\\gdef\\csname lp@path@insidecornerlabels@{safe}\\endcsname{{"
+            for _, x, y in _iter_corner_points(bits, lp.iter_inside_corners()):
+                yield f"\\fill[red] ({x},{y}) circle (2pt);%\n"
+                yield f"\\node[lp/inside corner label] at ({x},{y}) {{({x},{y})}};%\n"
+            yield "}"
+
+            for corner_num, (_, x, y) in enumerate(_iter_corner_points(bits, lp.iter_inside_corners()), start=1):
+                yield f"\n\\expandafter\\gdef\\csname lp@path@insidecornercoord@{safe}@{corner_num}\\endcsname{{({x},{y})}}"
+
+        yield f"\n\\expandafter\\gdef\\csname lp@path@gridsize@{safe}\\endcsname{{({num_zeros},{num_ones})}}"
+        yield f"\n\\expandafter\\gdef\\csname lp@path@ready@{safe}\\endcsname{{1}}"
+
+    def _path_glue(self, safe: str, name: str, tex_ref: str, json_ref: str) -> tuple[str, str, str]:
+        """
+        Build the TeX glue returned by ``write_path``.
+
+        Parameters
+        ----------
+        safe : str
+            Sanitized path name.
+        name : str
+            Original path name, used for collision warnings.
+        tex_ref : str
+            TeX-friendly path of the file defining the path macros.
+        json_ref : str
+            TeX-friendly path of the JSON manifest.
+
+        Returns
+        -------
+        tuple[str, str, str]
+            TeX macro definitions for the path TeX file, JSON file, and
+            the last-declared path file.
+        """
         warn = self._safe_name_warning("path", safe, name)
-        g1 = "\\makeatletter\n" + _gdef(f"lp@pathfile@{safe}", self._tex_path(texpath)) + "\n\\makeatother"
+        self.trace.lap("names")
+        g1 = "\\makeatletter\n" + _gdef(f"lp@pathfile@{safe}", tex_ref) + "\n\\makeatother"
         if warn:
             g1 = f"{warn}{g1}"
         return (
             g1,
-            "\\makeatletter\n" + _gdef(f"lp@pathjson@{safe}", self._tex_path(jsonpath)) + "\n\\makeatother",
-            "\\makeatletter\n" + _gdef("lp@lastdeclaredpathfile", self._tex_path(texpath)) + "\n\\makeatother",
+            "\\makeatletter\n" + _gdef(f"lp@pathjson@{safe}", json_ref) + "\n\\makeatother",
+            "\\makeatletter\n" + _gdef("lp@lastdeclaredpathfile", tex_ref) + "\n\\makeatother",
+        )
+
+    def write_hasse(self, north: int, east: int, name: str) -> str:
+        """
+        Emit the Hasse diagram of the containment order on a box.
+
+        Parameters
+        ----------
+        north : int
+            Number of North steps of every path in the box.
+        east : int
+            Number of East steps of every path in the box.
+        name : str
+            Diagram name used for cache filenames and TeX macros.
+
+        Returns
+        -------
+        str
+            TeX macro definitions for the last-declared Hasse file and the
+            diagram's JSON manifest.
+
+        Raises
+        ------
+        InputSpecError
+            If the box sizes are invalid or the box is too large (see
+            ``lpm_paths.poset.MAX_BOX_ELEMENTS``).
+        """
+        from ..poset import box_elements
+
+        self.trace.start("hasse", name)
+        # Validate before touching the cache.
+        box_elements(north, east)
+        self.trace.lap("parse")
+        safe = sanitize_name(name)
+        key = key_of({"op": "hasse", "north": north, "east": east, "name": name, "ver": EMITTER_VERSION})
+        texpath = self.cache.file(f"hasse-{safe}-{key}.tex")
+        jsonpath = self.cache.file(f"hasse-{safe}-{key}.json")
+        self.trace.lap("key")
+        glue = (
+            "\\makeatletter\n"
+            + _gdef("lp@lastdeclaredhassefile", self._tex_path(texpath))
+            + "\n"
+            + _gdef(f"lp@hassejson@{safe}", self._tex_path(jsonpath))
+            + "\n\\makeatother"
         )
+        try:
+            if _artifact_ok(texpath, _TEX_TRAILER) and _artifact_ok(jsonpath, "}"):
+                self.trace.lap("probe")
+                self.stats.hits += 1
+                self._reused(texpath)
+                self._reused(jsonpath)
+                return glue
+            self.trace.lap("probe")
+            self.stats.misses += 1
+            atomic_write_chunks(texpath, self.trace.timed(self._iter_hasse_tex(safe, north, east), "render"))
+            self.trace.lap("write")
+            atomic_write_chunks(jsonpath, self.trace.timed(iter_hasse_json_fragments(name, north, east), "render"))
+            self.trace.lap("write")
+            self._wrote(texpath)
+            self._wrote(jsonpath)
+        finally:
+            self.index.flush()
+            self.trace.lap("index")
+            self.trace.end(os.path.basename(texpath))
+            self.trace.flush()
+        return glue
+
+    def _iter_hasse_tex(self, safe: str, north: int, east: int) -> Iterator[str]:
+        """
+        Stream the TeX text of a Hasse diagram.
+
+        Parameters
+        ----------
+        safe : str
+            Sanitized diagram name.
+        north : int
+            Number of North steps of every path in the box.
+        east : int
+            Number of East steps of every path in the box.
+
+        Yields
+        ------
+        str
+            Fragments defining ``\\lp@hasse@nodes@<safe>`` (``index/x/y``
+            triples, one row per grade, centred on ``x = 0``),
+            ``\\lp@hasse@edges@<safe>`` (``lower/upper`` pairs),
+            ``\\lp@hasse@size@<safe>`` and the readiness flag.
+        """
+        from ..poset import box_covers, box_grades, box_size, grade_sizes
+
+        sizes = grade_sizes(north, east)
+        seen = [0] * len(sizes)
 
-    def write_between(self, L_bits: str, U_bits: str, lname: str, uname: str) -> str:
+        def nodes() -> Iterator[str]:
+            for index, g in enumerate(box_grades(north, east)):
+                x = seen[g] - (sizes[g] - 1) / 2
+                seen[g] += 1
+                yield f"{index}/{x:g}/{g}"
+
+        yield f"\\makeatletter\n\\expandafter\\gdef\\csname lp@hasse@nodes@{safe}\\endcsname{{"
+        yield from _joined(nodes())
+        yield f"}}\n\\expandafter\\gdef\\csname lp@hasse@edges@{safe}\\endcsname{{"
+        yield from _joined(f"{a}/{b}" for a, b in box_covers(north, east))
+        yield f"}}\n\\expandafter\\gdef\\csname lp@hasse@size@{safe}\\endcsname{{{box_size(north, east)}}}"
+        yield f"\n\\expandafter\\gdef\\csname lp@hasse@ready@{safe}\\endcsname{{1}}"
+        yield _TEX_TRAILER
+
+    def write_between(self, L_bits: str, U_bits: str, lname: str, uname: str, count: bool = False) -> str:
         """
         Emit TeX macros for the region between two lattice paths.
 
@@ -254,26 +1104,124 @@ class TeXEmitter:
             Lower path name.
         uname : str
             Upper path name.
+        count : bool, optional
+            Also define ``\\lp@between@count@<Ls>@<Us>`` with the number of
+            lattice paths inside the region (see
+            ``lpm_paths.enumerate.count_levels``).
 
         Returns
         -------
         str
             TeX macro definition for the last-declared between file.
+
+        Notes
+        -----
+        The polygon, area, cells and count are written once per pair of
+        bitstrings to ``geom-<hash>.tex``, under ``\\lp@between@...@@<hash>``.
+        ``between-<Ls>-<Us>-<hash>.tex`` inputs it once per document and
+        aliases the ``\\lp@between@...@<Ls>@<Us>`` macros and
+        ``\\lp@between@coords`` to it, so the same region under other names
+        is not recomputed. As for paths, a cache hit only computes the alias
+        key, reads the alias and checks that its geometry exists.
         """
-        from ..between import between_polygon
+        self.trace.start("between", f"{lname}/{uname}")
         Ls, Us = sanitize_name(lname), sanitize_name(uname)
-        payload = {"op": "between", "L": L_bits, "U": U_bits, "ver": EMITTER_VERSION}
-        key = key_of(payload)
-        texname = f"between-{Ls}-{Us}-{key}.tex"
+        digests = {"L": bits_digest(L_bits), "U": bits_digest(U_bits)}
+        options = self._lod_payload({"ver": EMITTER_VERSION})
+        if count:
+            options["count"] = True
+        fields = dict(options, op="between_alias", L=lname, U=uname, root=self.cache.tex_prefix())
+        texname = f"between-{Ls}-{Us}-{structured_key(fields, digests)}.tex"
         texpath = self.cache.file(texname)
-        poly = between_polygon(L_bits, U_bits)
-        coords_str = _formatCoords(poly)
-        body = [
-            "\\makeatletter",
-            f"\\expandafter\\gdef\\csname lp@between@coords@{Ls}@{Us}\\endcsname{{{coords_str}}}",
-            f"\\gdef\\lp@between@coords{{{coords_str}}}",
-            f"\\expandafter\\gdef\\csname lp@between@ready@{Ls}@{Us}\\endcsname{{1}}",
-            "\\makeatother",
-        ]
-        atomic_write(texpath, "\n".join(body) + "\n")
-        return "\\makeatletter\n" + _gdef("lp@lastdeclaredbetweenfile", self._tex_path(texpath)) + "\n\\makeatother"
+        glue = "\\makeatletter\n" + _gdef("lp@lastdeclaredbetweenfile", self._tex_path(texpath)) + "\n\\makeatother"
+        self.trace.lap("key")
+        try:
+            key = _alias_geometry(texpath)
+            if key is not None and _is_regular(self.cache.file(f"geom-{key}.tex")):
+                self.trace.lap("probe")
+                self.stats.hits += 1
+                self._reused(texpath)
+                return glue
+            self.trace.lap("probe")
+            self.stats.misses += 1
+            key = structured_key(dict(options, op="between"), digests)
+            geotex = self.cache.file(f"geom-{key}.tex")
+            geo_ref = self._tex_path(geotex)
+            self.trace.lap("key")
+            have_geometry = _artifact_ok(geotex, _TEX_TRAILER)
+            self.trace.lap("probe")
+            if have_geometry:
+                self.stats.geometry_hits += 1
+                self._reused(geotex)
+            else:
+                self._write_between_geometry(geotex, f"@{key}", L_bits, U_bits, count)
+            atomic_write(
+                texpath,
+                f"\\makeatletter\n\\lp@inputgeometry{{{geo_ref}}}{{lp@between@ready@@{key}}}\n\\lp@aliasbetween{{{Ls}}}{{{Us}}}{{@{key}}}{_TEX_TRAILER}",
+            )
+            self.trace.lap("write")
+            self._wrote(texpath)
+        finally:
+            self.index.flush()
+            self.trace.lap("index")
+            self.trace.end(texname)
+            self.trace.flush()
+        return glue
+
+    def _write_between_geometry(self, texpath: str, slot: str, L_bits: str, U_bits: str, count: bool) -> None:
+        """
+        Render and write the geometry file of a between region.
+
+        Parameters
+        ----------
+        texpath : str
+            Cache path of the ``geom-<hash>.tex`` file.
+        slot : str
+            Macro-name slot (``@<hash>``) that takes the place of
+            ``<lname>@<uname>`` in the ``\\lp@between@...`` macros.
+        L_bits : str
+            Lower path bitstring.
+        U_bits : str
+            Upper path bitstring.
+        count : bool
+            Also define the number of paths in the region.
+        """
+        from ..between import between_region
+
+        # One validating walk over both bitstrings; every macro below reads
+        # the region's compact arrays.
+        region = between_region(L_bits, U_bits)
+        self.trace.lap("parse")
+        count_def = []
+        if count:
+            count_def.append(f"\n\\expandafter\\gdef\\csname lp@between@count@{slot}\\endcsname{{{_decimal(region.count())}}}")
+            self.trace.lap("count")
+        # Level of detail: the envelope polygon replaces the exact one, and
+        # the per-row cell runs are dropped (\shadeBetweenCells then fills
+        # the polygon). The area and count stay exact.
+        cell = choose_cell([L_bits, U_bits], self.lod_tolerance, self.lod_max_vertices)
+        envelope = between_envelope(L_bits, U_bits, cell) if cell > 1 else []
+        exact = exact_vertices(L_bits) + exact_vertices(U_bits) - 1
+        if envelope and len(envelope) < exact:
+            self.trace.lod(cell, len(envelope), exact)
+            polygon: Iterable[Tuple[int, int]] = envelope
+            details = [f"\n\\expandafter\\gdef\\csname lp@between@lod@{slot}\\endcsname{{{cell}}}"]
+        else:
+            polygon = region.iter_polygon()
+            details = chain(
+                [f"\n\\expandafter\\gdef\\csname lp@between@cells@{slot}\\endcsname{{"],
+                _joined(f"{x0}/{x1}/{y}" for x0, x1, y in region.iter_row_runs()),
+                ["}"],
+            )
+        self.trace.lap("lod")
+        body = chain(
+            [f"\\makeatletter\n\\expandafter\\gdef\\csname lp@between@coords@{slot}\\endcsname{{"],
+            _iter_coords_text(polygon),
+            ["}", f"\n\\expandafter\\gdef\\csname lp@between@area@{slot}\\endcsname{{{region.area}}}"],
+            details,
+            count_def,
+            [f"\n\\expandafter\\gdef\\csname lp@between@ready@{slot}\\endcsname{{1}}", _TEX_TRAILER],
+        )
+        atomic_write_chunks(texpath, self.trace.timed(body, "render"))
+        self.trace.lap("write")
+        self._wrote(texpath)
@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+"""
+Lazy enumeration of the lattice paths between a lower and an upper path.
+
+A path with ``n`` North steps is determined by its ell-map: the level
+sequence ``a_1 <= a_2 <= ... <= a_n`` where ``a_y`` is the ``x`` of the
+``y``-th North step. A path lies weakly between ``L`` (lower) and ``U``
+(upper) exactly when ``U.ellmap[y] <= a_y <= L.ellmap[y]`` for every level,
+so the region's paths are the monotone sequences inside those per-level
+bounds.
+
+The generators below walk those sequences with an odometer over the levels
+and yield ``PathDelta`` records (the levels whose ``x`` changed) rather than
+whole ``LatticePath`` objects. State is one ``x`` per level, so memory does
+not depend on how many paths the region holds.
+
+Two orders are available:
+
+- ``"lex"``: increasing bitstring order, from ``L`` up to ``U``.
+- ``"gray"``: a reflected (minimal-change) order from ``U`` down to ``L``.
+  Consecutive paths differ by moving a single East step, i.e. the cells
+  between them form one vertical strip in a single column. Each level sweeps
+  its range up or down, restarting from whichever end is nearer to its
+  current ``x``.
+
+``count_between`` returns the number of paths in a region without listing
+them, by a row-by-row dynamic program over the same bounds.
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from itertools import accumulate
+from typing import Iterator, List, NamedTuple, Sequence, Tuple
+
+from .errors import InputSpecError
+from .types import LatticePath
+
+ORDERS = ("lex", "gray")
+
+# Count tables are checkpointed every this many levels (and at the last one).
+COUNT_CHECKPOINT = 64
+# Maximum number of checkpointed count tables kept in memory.
+COUNT_MEMO_SIZE = 256
+
+_COUNT_MEMO: "OrderedDict[bytes, List[int]]" = OrderedDict()
+
+Bounds = Tuple[List[int], List[int]]
+
+
+class PathDelta(NamedTuple):
+    """
+    Change from the previous path of an enumeration.
+
+    Attributes
+    ----------
+    rank : int
+        0-based position of the new path in the enumeration.
+    changes : tuple of (int, int)
+        ``(level, x)`` pairs giving the new ``ellmap[level]`` for every level
+        that moved, in increasing level order. The first delta (rank 0) lists
+        every level.
+    """
+
+    rank: int
+    changes: Tuple[Tuple[int, int], ...]
+
+
+def level_bounds(L_bits: str, U_bits: str) -> Bounds:
+    """
+    Compute the per-level ``x`` bounds of the region between two paths.
+
+    Parameters
+    ----------
+    L_bits : str
+        Lower path bitstring.
+    U_bits : str
+        Upper path bitstring.
+
+    Returns
+    -------
+    tuple of list[int]
+        ``(lo, hi)`` with ``lo[y-1] = U.ellmap[y]`` and
+        ``hi[y-1] = L.ellmap[y]``. Both lists are nondecreasing.
+
+    Raises
+    ------
+    InputSpecError
+        If the paths do not share the same start and end points, or if ``U``
+        dips below ``L`` somewhere.
+    """
+    L = LatticePath.from_bits(L_bits)
+    U = LatticePath.from_bits(U_bits)
+    if len(L.bits) != len(U.bits) or L.bits.count("1") != U.bits.count("1"):
+        raise InputSpecError("Paths must share the same endpoint.")
+    lo = list(U.ellmap.values())
+    hi = list(L.ellmap.values())
+    for level, (a, b) in enumerate(zip(lo, hi), 1):
+        if a > b:
+            raise InputSpecError(f"Upper path lies below the lower path at level {level}.")
+    return lo, hi
+
+
+def iter_between_deltas(L_bits: str, U_bits: str, order: str = "lex") -> Iterator[PathDelta]:
+    """
+    Enumerate the paths between ``L`` and ``U`` as incremental deltas.
+
+    Parameters
+    ----------
+    L_bits : str
+        Lower path bitstring.
+    U_bits : str
+        Upper path bitstring (weakly above ``L_bits``).
+    order : str, optional
+        ``"lex"`` (increasing bitstrings) or ``"gray"`` (one column changes
+        between consecutive paths).
+
+    Returns
+    -------
+    iterator of PathDelta
+        One delta per path in the region; the first one sets every level.
+
+    Raises
+    ------
+    InputSpecError
+        If the order is unknown or the paths do not bound a region. Inputs
+        are validated before the iterator is returned.
+    """
+    if order not in ORDERS:
+        raise InputSpecError(f"Unknown enumeration order: {order!r}.")
+    lo, hi = level_bounds(L_bits, U_bits)
+    if order == "lex":
+        return _iter_lex(lo, hi)
+    return _iter_gray(lo, hi)
+
+
+def _iter_lex(lo: List[int], hi: List[int]) -> Iterator[PathDelta]:
+    """Increasing bitstrings: decrease the deepest movable level, reset the rest to ``hi``."""
+    n = len(lo)
+    a = list(hi)
+    yield PathDelta(0, tuple(enumerate(a, 1)))
+    rank = 0
+    while True:
+        y = n - 1
+        while y >= 0 and a[y] == (max(lo[y], a[y - 1]) if y else lo[0]):
+            y -= 1
+        if y < 0:
+            return
+        a[y] -= 1
+        changes = [(y + 1, a[y])]
+        for z in range(y + 1, n):
+            if a[z] != hi[z]:
+                a[z] = hi[z]
+                changes.append((z + 1, a[z]))
+        rank += 1
+        yield PathDelta(rank, tuple(changes))
+
+
+def _iter_gray(lo: List[int], hi: List[int]) -> Iterator[PathDelta]:
+    """Reflected order: each level sweeps toward ``end`` one step at a time."""
+    n = len(lo)
+    a: List[int] = []
+    prev = 0
+    for y in range(n):
+        prev = max(lo[y], prev)
+        a.append(prev)
+    step = [1] * n
+    end = list(hi)
+    yield PathDelta(0, tuple(enumerate(a, 1)))
+    rank = 0
+    while True:
+        y = n - 1
+        while y >= 0 and a[y] == end[y]:
+            y -= 1
+        if y < 0:
+            return
+        a[y] += step[y]
+        changes = [(y + 1, a[y])]
+        for z in range(y + 1, n):
+            floor, top, x = max(lo[z], a[z - 1]), hi[z], a[z]
+            # Restart the sweep from the nearer end; ties go upward.
+            if abs(top - x) < abs(x - floor):
+                start, end[z], step[z] = top, floor, -1
+            else:
+                start, end[z], step[z] = floor, top, 1
+            if start != x:
+                a[z] = start
+                changes.append((z + 1, start))
+        rank += 1
+        yield PathDelta(rank, tuple(changes))
+
+
+def iter_between_paths(L_bits: str, U_bits: str, order: str = "lex") -> Iterator[str]:
+    """
+    Enumerate the bitstrings of the paths between ``L`` and ``U``.
+
+    Parameters
+    ----------
+    L_bits : str
+        Lower path bitstring.
+    U_bits : str
+        Upper path bitstring (weakly above ``L_bits``).
+    order : str, optional
+        ``"lex"`` or ``"gray"``, as for ``iter_between_deltas``.
+
+    Returns
+    -------
+    iterator of str
+        Bitstrings in enumeration order, built by applying each delta to one
+        reusable buffer.
+
+    Raises
+    ------
+    InputSpecError
+        If the order is unknown or the paths do not bound a region. Inputs
+        are validated before the iterator is returned.
+    """
+    deltas = iter_between_deltas(L_bits, U_bits, order)
+    return _apply_deltas(len(L_bits), deltas)
+
+
+def _apply_deltas(length: int, deltas: Iterator[PathDelta]) -> Iterator[str]:
+    flags = bytearray(b"0" * length)
+    ell: List[int] = []
+    for delta in deltas:
+        if not ell:
+            ell = [0] * len(delta.changes)
+        else:
+            # Clear every moved North step before setting the new ones, as
+            # neighbouring levels may trade positions.
+            for level, _ in delta.changes:
+                flags[ell[level - 1] + level - 1] = 0x30
+        for level, x in delta.changes:
+            ell[level - 1] = x
+            flags[x + level - 1] = 0x31
+        yield flags.decode("ascii")
+
+
+def envelope_bounds(L_bits: str, U_bits: str) -> Bounds:
+    """
+    Compute per-level bounds for the region enclosed by two paths.
+
+    Unlike ``level_bounds`` the paths may cross; the region is then bounded
+    by their pointwise lower and upper envelopes, which is the area filled by
+    ``between_polygon``.
+
+    Parameters
+    ----------
+    L_bits : str
+        First path bitstring.
+    U_bits : str
+        Second path bitstring.
+
+    Returns
+    -------
+    tuple of list[int]
+        ``(lo, hi)`` with ``lo[y-1] = min(L.ellmap[y], U.ellmap[y])`` and
+        ``hi[y-1]`` the maximum.
+
+    Raises
+    ------
+    InputSpecError
+        If the paths do not share the same start and end points.
+    """
+    L = LatticePath.from_bits(L_bits)
+    U = LatticePath.from_bits(U_bits)
+    if len(L.bits) != len(U.bits) or L.bits.count("1") != U.bits.count("1"):
+        raise InputSpecError("Paths must share the same endpoint.")
+    pairs = list(zip(L.ellmap.values(), U.ellmap.values()))
+    return [min(p) for p in pairs], [max(p) for p in pairs]
+
+
+def count_between(L_bits: str, U_bits: str) -> int:
+    """
+    Count the paths between ``L`` and ``U`` without enumerating them.
+
+    Parameters
+    ----------
+    L_bits : str
+        Lower path bitstring.
+    U_bits : str
+        Upper path bitstring (weakly above ``L_bits``).
+
+    Returns
+    -------
+    int
+        Number of paths yielded by ``iter_between_paths(L_bits, U_bits)``.
+
+    Raises
+    ------
+    InputSpecError
+        If the paths do not bound a region.
+    """
+    return count_levels(*level_bounds(L_bits, U_bits))
+
+
+def count_levels(lo: Sequence[int], hi: Sequence[int]) -> int:
+    """
+    Count nondecreasing level sequences with ``lo[i] <= a[i] <= hi[i]``.
+
+    Parameters
+    ----------
+    lo : Sequence[int]
+        Nondecreasing lower bounds, one per level.
+    hi : Sequence[int]
+        Nondecreasing upper bounds, one per level.
+
+    Returns
+    -------
+    int
+        Exact number of sequences (a Python big integer).
+
+    Raises
+    ------
+    InputSpecError
+        If the bounds differ in length, decrease, or cross.
+
+    Notes
+    -----
+    Row ``y`` of the table holds, for every ``x`` in ``[lo[y], hi[y]]``, the
+    number of valid prefixes ending at or left of ``x``. Each row is a slice
+    of the previous one padded with its total and summed with
+    ``itertools.accumulate``, so the cost is one big-integer addition per
+    cell of the region. Rows at every ``COUNT_CHECKPOINT``-th level are
+    memoized under a digest of the bounds so far; regions that share their
+    first levels (for example nested regions with the same upper path)
+    resume from the deepest shared checkpoint.
+    """
+    n = len(lo)
+    if len(hi) != n:
+        raise InputSpecError("Level bounds must have the same length.")
+    for y in range(n):
+        if lo[y] > hi[y] or (y and (lo[y] < lo[y - 1] or hi[y] < hi[y - 1])):
+            raise InputSpecError(f"Invalid level bounds at level {y + 1}.")
+    if n == 0:
+        return 1
+    digests = []
+    digest = b""
+    for y in range(n):
+        digest = blake2b(digest + b"%d,%d;" % (lo[y], hi[y]), digest_size=16).digest()
+        digests.append(digest)
+    start, row = 0, [0]
+    for y in range(n - 1, -1, -1):
+        if (y + 1) % COUNT_CHECKPOINT == 0 or y == n - 1:
+            cached = _COUNT_MEMO.get(digests[y])
+            if cached is not None:
+                _COUNT_MEMO.move_to_end(digests[y])
+                start, row = y + 1, cached
+                break
+    if start == 0:
+        row = list(range(1, hi[0] - lo[0] + 2))
+        start = 1
+        if n == 1:
+            _remember(digests[0], row)
+    for y in range(start, n):
+        prev_lo, prev_hi = lo[y - 1], hi[y - 1]
+        total = row[-1]
+        # Cells left of prev_hi extend the previous prefix sums; the rest see all of them.
+        head = row[lo[y] - prev_lo:] if lo[y] <= prev_hi else []
+        pad = hi[y] - max(lo[y], prev_hi + 1) + 1
+        row = list(accumulate(head + [total] * pad)) if pad > 0 else list(accumulate(head))
+        if (y + 1) % COUNT_CHECKPOINT == 0 or y == n - 1:
+            _remember(digests[y], row)
+    return row[-1]
+
+
+def _remember(digest: bytes, row: List[int]) -> None:
+    _COUNT_MEMO[digest] = row
+    _COUNT_MEMO.move_to_end(digest)
+    while len(_COUNT_MEMO) > COUNT_MEMO_SIZE:
+        _COUNT_MEMO.popitem(last=False)
@@ -2,11 +2,34 @@ from __future__ import annotations
 
 """
 Canonical JSON hashing utilities.
+
+``key_of`` hashes a whole payload as canonical JSON. Cache keys over long
+bitstrings use ``structured_key`` instead: the small fields are hashed as
+canonical JSON and each bitstring is reduced to its ``bits_digest``, which
+is fed to BLAKE2b in fixed-size chunks without building a JSON string, and
+can be computed once and passed in when several keys cover the same bits.
+
+The two schemes never produce the same key: ``structured_key`` personalizes
+BLAKE2b with ``KEY_SCHEME``. Artifacts named by ``key_of`` keys keep their
+names; changing ``KEY_SCHEME`` renames every artifact named by a structured
+key, which the next build rebuilds once while ``lpm-cache gc`` evicts the
+old files.
 """
 
 import json
 from hashlib import blake2b
-from typing import Any
+from typing import Any, Mapping, Union
+
+from .errors import InputSpecError
+
+# Version of the ``structured_key`` layout, part of every structured key.
+KEY_SCHEME = 2
+
+# Characters of a bitstring encoded and hashed at a time.
+_CHUNK = 1 << 20
+
+_BITS_PERSON = b"lpm-bits/%d" % KEY_SCHEME
+_KEY_PERSON = b"lpm-key/%d" % KEY_SCHEME
 
 def canon_json(obj: Any) -> bytes:
     """
@@ -38,4 +61,78 @@ def key_of(obj: Any) -> str:
     str
         Hexadecimal digest string.
     """
-    return blake2b(canon_json(obj), digest_size=32).hexdigest()
\ No newline at end of file
+    return blake2b(canon_json(obj), digest_size=32).hexdigest()
+
+
+def bits_digest(bits: str) -> bytes:
+    """
+    Hash a bitstring for use in ``structured_key``.
+
+    Parameters
+    ----------
+    bits : str
+        Bitstring (validation is left to the parser).
+
+    Returns
+    -------
+    bytes
+        32-byte BLAKE2b digest of the UTF-8 encoded string, fed in chunks of
+        ``2**20`` characters so that no full-length copy is made.
+
+    Raises
+    ------
+    InputSpecError
+        If ``bits`` is not a string.
+    """
+    if not isinstance(bits, str):
+        raise InputSpecError("bits must be a string.")
+    h = blake2b(digest_size=32, person=_BITS_PERSON)
+    if len(bits) <= _CHUNK:
+        h.update(bits.encode("utf-8"))
+    else:
+        for start in range(0, len(bits), _CHUNK):
+            h.update(bits[start:start + _CHUNK].encode("utf-8"))
+    return h.digest()
+
+
+def structured_key(fields: Mapping[str, Any], bits: Mapping[str, Union[str, bytes]]) -> str:
+    """
+    Compute a cache key over small fields and one or more bitstrings.
+
+    Parameters
+    ----------
+    fields : mapping
+        JSON-serializable fields such as the op, the version and output
+        options; hashed as canonical JSON.
+    bits : mapping of str to str or bytes
+        Bitstrings by role (e.g. ``{"L": ..., "U": ...}``), each given as the
+        string or as its precomputed ``bits_digest``.
+
+    Returns
+    -------
+    str
+        Hexadecimal 32-byte digest. Distinct from every ``key_of`` key, and
+        changed by ``KEY_SCHEME``.
+
+    Raises
+    ------
+    InputSpecError
+        If a bitstring is neither a string nor a 32-byte digest.
+
+    Notes
+    -----
+    The hash input is the canonical JSON of ``fields`` followed, for each
+    role in sorted order, by ``NUL role NUL digest``. Canonical JSON never
+    contains a raw NUL, so different inputs cannot produce the same stream.
+    """
+    h = blake2b(canon_json(fields), digest_size=32, person=_KEY_PERSON)
+    for role in sorted(bits):
+        value = bits[role]
+        if isinstance(value, bytes):
+            if len(value) != 32:
+                raise InputSpecError("A bits digest must have 32 bytes.")
+            digest = value
+        else:
+            digest = bits_digest(value)
+        h.update(b"\0" + role.encode("utf-8") + b"\0" + digest)
+    return h.hexdigest()
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+"""
+Level-of-detail envelopes for very long paths.
+
+A path with ``10**5`` steps has far more vertices than a figure can show.
+``staircase_envelope`` snaps every vertex ``(x, y)`` of a path down to the
+coarse grid of spacing ``cell``, i.e. to ``(x - x % cell, y - y % cell)``,
+and returns the corner-only vertices of the resulting polyline, which then
+reaches the exact endpoint with at most two more segments. Snapping is
+monotone, so the envelope is again a North/East staircase (with steps of
+``cell`` units, except for the segments reaching the endpoint), and the
+snapped parts of two paths ``L <= U`` keep their order.
+
+Every vertex moves by less than ``cell`` in each coordinate, so the
+envelope and the path are within Chebyshev (max-norm) Hausdorff distance
+``cell`` of each other: every point of one lies within ``cell`` grid units,
+horizontally and vertically, of some point of the other. ``choose_cell``
+picks the spacing from a requested tolerance and/or a vertex budget.
+"""
+
+import re
+from typing import Iterator, List, Optional, Sequence
+
+from .errors import InputSpecError
+from .types import Coord
+
+# Smallest vertex budget accepted: an envelope of k paths may need up to
+# 3 * k points besides its coarse steps, and a between polygon has two paths.
+MIN_VERTICES = 8
+
+_RUNS = re.compile(r"0+|1+")
+
+
+def _check_positive(value: Optional[int], what: str, minimum: int) -> None:
+    if value is None:
+        return
+    if isinstance(value, bool) or not isinstance(value, int) or value < minimum:
+        raise InputSpecError(f"{what} must be an integer >= {minimum}.")
+
+
+def exact_vertices(bits: str) -> int:
+    """
+    Count the corner-only vertices of a path drawn at full resolution.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+
+    Returns
+    -------
+    int
+        Start, corners and endpoint (``1`` for the empty path).
+    """
+    if not bits:
+        return 1
+    return bits.count("01") + bits.count("10") + 2
+
+
+def choose_cell(
+    paths: Sequence[str],
+    tolerance: Optional[int] = None,
+    max_vertices: Optional[int] = None,
+) -> int:
+    """
+    Pick the grid spacing of an envelope.
+
+    Parameters
+    ----------
+    paths : sequence of str
+        Validated bitstrings drawn together (one path, or the two boundary
+        paths of a between region).
+    tolerance : int or None, optional
+        Spacing to use, in grid units; the envelope is within this distance
+        of the path.
+    max_vertices : int or None, optional
+        Upper bound on the number of vertices emitted for all ``paths``
+        together. The spacing is raised until the bound holds.
+
+    Returns
+    -------
+    int
+        Spacing ``>= 1``. ``1`` means the paths are drawn exactly: either
+        no option is set, or they already fit in ``max_vertices``.
+
+    Raises
+    ------
+    InputSpecError
+        If ``tolerance`` is not a positive integer or ``max_vertices`` is
+        below ``MIN_VERTICES``.
+
+    Notes
+    -----
+    An envelope of ``s`` steps has at most ``s // cell + 3`` vertices (one per
+    coarse step, the start, and two to reach the endpoint), so the spacing
+    for a budget follows without building any envelope.
+    """
+    _check_positive(tolerance, "LOD tolerance", 1)
+    _check_positive(max_vertices, "LOD max_vertices", MIN_VERTICES)
+    cell = tolerance or 1
+    if max_vertices is not None and sum(exact_vertices(bits) for bits in paths) > max_vertices:
+        steps = sum(len(bits) for bits in paths)
+        spare = max_vertices - 3 * len(paths)
+        if spare < 1:
+            raise InputSpecError(f"LOD max_vertices must be greater than {3 * len(paths)} here.")
+        cell = max(cell, -(-steps // spare))
+    return cell
+
+
+def iter_envelope(bits: str, cell: int) -> Iterator[Coord]:
+    """
+    Stream the staircase envelope of a path.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+    cell : int
+        Grid spacing (``1`` reproduces the corner-only path).
+
+    Yields
+    ------
+    Coord
+        ``(0, 0)``, the corners of the snapped path, and the endpoint;
+        collinear points are dropped.
+
+    Notes
+    -----
+    The walk visits one run of equal steps at a time, so it costs
+    O(corners) Python work and O(1) memory beyond the output.
+    """
+    sx = sy = x = y = 0
+    # Last emitted point and the direction of the segment leaving it.
+    last: Coord = (0, 0)
+    heading = ""
+    yield last
+    for run in _RUNS.finditer(bits):
+        steps = run.end() - run.start()
+        if bits[run.start()] == "0":
+            x += steps
+            nx, ny, step = x - x % cell, sy, "E"
+        else:
+            y += steps
+            nx, ny, step = sx, y - y % cell, "N"
+        if (nx, ny) == (sx, sy):
+            continue
+        if heading and step != heading:
+            # Turning at the current snapped point: it is a corner.
+            last = (sx, sy)
+            yield last
+        heading = step
+        sx, sy = nx, ny
+    # Reach the endpoint the way the path does, ending with its last step.
+    if bits.endswith("0"):
+        tail = ((sx, y, "N"), (x, y, "E"))
+    else:
+        tail = ((x, sy, "E"), (x, y, "N"))
+    for tx, ty, step in tail:
+        if (tx, ty) == (sx, sy):
+            continue
+        if heading and step != heading:
+            last = (sx, sy)
+            yield last
+        heading = step
+        sx, sy = tx, ty
+    if (sx, sy) != last:
+        yield sx, sy
+
+
+def staircase_envelope(bits: str, cell: int) -> List[Coord]:
+    """
+    Return the staircase envelope of a path as a list.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+    cell : int
+        Grid spacing.
+
+    Returns
+    -------
+    list[Coord]
+        Same points as ``iter_envelope``.
+    """
+    return list(iter_envelope(bits, cell))
+
+
+def between_envelope(L_bits: str, U_bits: str, cell: int) -> List[Coord]:
+    """
+    Return the envelope polygon of the region between two paths.
+
+    Parameters
+    ----------
+    L_bits : str
+        Lower path bitstring, validated against ``U_bits``.
+    U_bits : str
+        Upper path bitstring.
+    cell : int
+        Grid spacing.
+
+    Returns
+    -------
+    list[Coord]
+        The upper envelope, then the lower envelope backwards without the
+        shared endpoint, ending at ``(0, 0)`` again; the same layout as
+        ``BetweenRegion.iter_polygon``.
+    """
+    upper = staircase_envelope(U_bits, cell)
+    if len(upper) == 1:
+        return upper
+    lower = staircase_envelope(L_bits, cell)
+    return upper + lower[-2::-1]
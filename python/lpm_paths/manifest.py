@@ -1,16 +1,120 @@
 from __future__ import annotations
-from typing import Any, Dict
+import json
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Optional, Sequence
 from .types import LatticePath
 
-def to_json_obj(name: str, lp: LatticePath) -> Dict[str, Any]:
+if TYPE_CHECKING:
+    from .batch import PathBatch
+
+def to_json_obj(name: Optional[str], lp: LatticePath) -> Dict[str, Any]:
     """
     Convert a LatticePath object and its name into a JSON-serializable dictionary.
 
     Parameters:
-        name (str): The name associated with the lattice path.
+        name (Optional[str]): The name associated with the lattice path, or None
+            for a geometry manifest shared by every name of the path.
         lp (LatticePath): The LatticePath object to serialize.
 
     Returns:
-        Dict[str, Any]: A dictionary containing the name, bits, coords, and upmarks of the lattice path.
+        Dict[str, Any]: A dictionary containing the name (unless None), bits, coords,
+        and upmarks of the lattice path.
+    """
+    obj: Dict[str, Any] = {"bits": lp.bits, "coords": list(lp.coords), "upmarks": list(lp.upmarks)}
+    if name is not None:
+        obj["name"] = name
+    return obj
+
+
+def batch_to_json_obj(names: Optional[Sequence[str]], batch: "PathBatch") -> Dict[str, Any]:
+    """
+    Convert a PathBatch and its names into a bundle-style manifest.
+
+    Parameters:
+        names (Optional[Sequence[str]]): One name per path in the batch, or None
+            to leave the names out.
+        batch (PathBatch): Columnar batch of lattice paths.
+
+    Returns:
+        Dict[str, Any]: ``{"paths": [...]}`` with one ``to_json_obj`` entry per path.
+        Without names this is the shape of the ``geom-<hash>.json`` manifest that
+        ``TeXEmitter.write_bundle`` writes for distinct paths.
+    """
+    if names is None:
+        return {"paths": [to_json_obj(None, lp) for lp in batch]}
+    return {"paths": [to_json_obj(name, lp) for name, lp in zip(names, batch)]}
+
+
+def iter_json_fragments(name: Optional[str], lp: LatticePath) -> Iterator[str]:
+    """
+    Stream the canonical JSON text of ``to_json_obj(name, lp)``.
+
+    Parameters:
+        name (Optional[str]): The name associated with the lattice path, or None.
+        lp (LatticePath): The LatticePath object to serialize.
+
+    Yields:
+        str: Fragments whose concatenation equals the compact, key-sorted JSON
+        dump of ``to_json_obj(name, lp)``. Coordinates and upmarks are produced
+        one at a time, so memory use does not grow with path length.
     """
-    return {"name": name, "bits": lp.bits, "coords": lp.coords, "upmarks": lp.upmarks}
\ No newline at end of file
+    yield '{"bits":' + json.dumps(lp.bits) + ',"coords":['
+    yield from _joined(f"[{x},{y}]" for x, y in lp.iter_coords())
+    if name is not None:
+        yield '],"name":' + json.dumps(name, ensure_ascii=False) + ',"upmarks":['
+    else:
+        yield '],"upmarks":['
+    yield from _joined(map(str, lp.iter_upmarks()))
+    yield "]}"
+
+
+def iter_bundle_json_fragments(entries: Iterable[tuple[Optional[str], LatticePath]]) -> Iterator[str]:
+    """
+    Stream the canonical JSON text of a bundle manifest.
+
+    Parameters:
+        entries (Iterable[tuple[Optional[str], LatticePath]]): ``(name, path)`` pairs in
+            bundle order; a None name is left out of its entry.
+
+    Yields:
+        str: Fragments of ``{"paths": [...]}`` with one ``iter_json_fragments`` entry per path.
+    """
+    yield '{"paths":['
+    for i, (name, lp) in enumerate(entries):
+        if i:
+            yield ","
+        yield from iter_json_fragments(name, lp)
+    yield "]}"
+
+
+def iter_hasse_json_fragments(name: str, north: int, east: int) -> Iterator[str]:
+    """
+    Stream the canonical JSON text of the Hasse diagram of a box.
+
+    Parameters:
+        name (str): The name associated with the diagram.
+        north (int): Number of North steps of every path in the box.
+        east (int): Number of East steps of every path in the box.
+
+    Yields:
+        str: Fragments of ``{"covers": [[lower, upper], ...], "east": ...,
+        "elements": [bits, ...], "grades": [...], "name": ..., "north": ...}``
+        with keys sorted. Element ``i`` is ``elements[i]`` (see
+        ``lpm_paths.poset.box_elements``); nothing is materialized.
+    """
+    from .poset import box_covers, box_elements, box_grades
+
+    yield '{"covers":['
+    yield from _joined(f"[{a},{b}]" for a, b in box_covers(north, east))
+    yield f'],"east":{east},"elements":['
+    yield from _joined(f'"{bits}"' for bits in box_elements(north, east))
+    yield '],"grades":['
+    yield from _joined(map(str, box_grades(north, east)))
+    yield '],"name":' + json.dumps(name, ensure_ascii=False) + f',"north":{north}}}'
+
+
+def _joined(items: Iterable[str]) -> Iterator[str]:
+    """Yield ``items`` separated by commas."""
+    sep = ""
+    for item in items:
+        yield sep + item
+        sep = ","
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+"""
+Process-wide memo of parsed lattice paths.
+
+The same bitstrings are parsed many times in one process: a figure draws a
+path and shades the region under it, ``between_from_json`` revisits paths
+that were just declared, and ``lpm-daemon`` serves every run of a document.
+``PATH_MEMO`` interns ``LatticePath`` objects by their bits, so each string
+is validated once and the annotations a path derives lazily (coordinates,
+upmarks, corners) are computed once and shared by every later user.
+
+The memo is a least-recently-used map bounded both by the number of entries
+and by an estimate of their memory, so a few huge paths cannot pin hundreds
+of megabytes. ``parse_path`` is the entry point used by ``lpm_paths.api``,
+``lpm_paths.between`` and ``lpm_paths.emitters.tex``.
+"""
+
+import sys
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from .bitops import _INDEX_TYPECODE
+from .errors import InputSpecError
+from .types import LatticePath
+
+# Defaults of ``PATH_MEMO``; change them with ``PATH_MEMO.resize``.
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+_ITEMSIZE = array(_INDEX_TYPECODE).itemsize
+# Instance with its slots, plus the array headers of its derived fields.
+_ENTRY_OVERHEAD = 96 + 4 * 64
+
+
+def estimate_bytes(bits: str) -> int:
+    """
+    Estimate the memory held by a parsed path once fully derived.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+
+    Returns
+    -------
+    int
+        Size of ``bits`` plus the heights, upmarks, corners and inside
+        corners arrays that ``LatticePath`` caches on first access.
+    """
+    inside = bits.count("01")
+    entries = len(bits) + 1 + bits.count("1") + inside + bits.count("10") + inside
+    return sys.getsizeof(bits) + _ENTRY_OVERHEAD + _ITEMSIZE * entries
+
+
+@dataclass
+class MemoStats:
+    """
+    Counters of a ``PathMemo``.
+
+    Attributes
+    ----------
+    hits : int
+        Lookups answered with an interned path.
+    misses : int
+        Lookups that parsed the bitstring.
+    evictions : int
+        Paths dropped to respect the bounds.
+    entries : int
+        Paths currently held.
+    bytes : int
+        Estimated memory of the paths currently held.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+
+class PathMemo:
+    """
+    Bounded least-recently-used memo of ``LatticePath`` objects by bits.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximum number of paths held.
+    max_bytes : int, optional
+        Maximum estimated memory of the paths held (see ``estimate_bytes``).
+        A path larger than this on its own is parsed but not kept.
+
+    Raises
+    ------
+    InputSpecError
+        If a bound is negative.
+
+    Notes
+    -----
+    ``LatticePath`` is immutable and hashes by ``bits``, so handing the same
+    instance to every caller is safe. Only ``engine="auto"`` lookups go
+    through the memo; an explicit engine always parses anew. The memo is not
+    locked: the package runs declarations one at a time, in PythonTeX, in
+    ``lpm-daemon`` and in each ``lpm-prebuild`` worker process.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Create an empty memo.
+
+        Parameters
+        ----------
+        max_entries : int, optional
+            Maximum number of paths held.
+        max_bytes : int, optional
+            Maximum estimated memory of the paths held.
+        """
+        self._paths: "OrderedDict[str, LatticePath]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self.stats = MemoStats()
+        self.max_entries = self.max_bytes = 0
+        self.resize(max_entries, max_bytes)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def __contains__(self, bits: object) -> bool:
+        return bits in self._paths
+
+    def get(self, bits: str, engine: str = "auto") -> LatticePath:
+        """
+        Return the interned path for a bitstring, parsing it on a miss.
+
+        Parameters
+        ----------
+        bits : str
+            Binary string encoding east (0) and north (1) steps.
+        engine : str, optional
+            Engine passed to ``LatticePath.from_bits``; anything but
+            ``"auto"`` bypasses the memo.
+
+        Returns
+        -------
+        LatticePath
+            The same instance for every hit on ``bits``.
+
+        Raises
+        ------
+        InputSpecError
+            If ``LatticePath.from_bits`` rejects the input. Invalid inputs
+            are never stored.
+        """
+        if engine != "auto" or type(bits) is not str:
+            return LatticePath.from_bits(bits, engine)
+        paths = self._paths
+        lp = paths.get(bits)
+        if lp is not None:
+            paths.move_to_end(bits)
+            self.stats.hits += 1
+            return lp
+        lp = LatticePath.from_bits(bits)
+        self.stats.misses += 1
+        size = estimate_bytes(bits)
+        if size <= self.max_bytes and self.max_entries:
+            paths[bits] = lp
+            self._sizes[bits] = size
+            self.stats.bytes += size
+            self._evict()
+        return lp
+
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """
+        Change the bounds, evicting paths that no longer fit.
+
+        Parameters
+        ----------
+        max_entries : int or None, optional
+            New entry bound; ``None`` keeps the current one. ``0`` disables
+            the memo.
+        max_bytes : int or None, optional
+            New memory bound in bytes; ``None`` keeps the current one.
+
+        Raises
+        ------
+        InputSpecError
+            If a bound is negative or not an integer.
+        """
+        for value, what in ((max_entries, "max_entries"), (max_bytes, "max_bytes")):
+            if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+                raise InputSpecError(f"Path memo {what} must be a non-negative integer.")
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._evict()
+
+    def clear(self) -> None:
+        """Drop every path and reset the counters."""
+        self._paths.clear()
+        self._sizes.clear()
+        self.stats = MemoStats()
+
+    def _evict(self) -> None:
+        paths, sizes, stats = self._paths, self._sizes, self.stats
+        while paths and (len(paths) > self.max_entries or stats.bytes > self.max_bytes):
+            bits, _ = paths.popitem(last=False)
+            stats.bytes -= sizes.pop(bits)
+            stats.evictions += 1
+        stats.entries = len(paths)
+
+
+PATH_MEMO = PathMemo()
+
+
+def parse_path(bits: str) -> LatticePath:
+    """
+    Parse a bitstring through the process-wide memo.
+
+    Parameters
+    ----------
+    bits : str
+        Binary string encoding east (0) and north (1) steps.
+
+    Returns
+    -------
+    LatticePath
+        Interned path; equal to ``LatticePath.from_bits(bits)``.
+
+    Raises
+    ------
+    InputSpecError
+        If the string contains characters other than 0 or 1.
+    """
+    return PATH_MEMO.get(bits)
@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+"""
+Registry of sanitized declaration names, used to detect collisions.
+
+Two different user-facing names can sanitize to the same TeX identifier
+(``"demo path"`` and ``"demo-path"`` both become ``demo_path``), in which case
+the later declaration silently overwrites the earlier one. The registry maps
+``(kind, safe)`` to the original name that last used it so the emitter can
+warn.
+
+The whole registry lives in one compact file, ``<cache root>/.names.json``. It
+is loaded once per process and cache root, updated in memory, and written
+back by ``flush`` (called at the end of each batch and at interpreter exit).
+"""
+
+import atexit
+import contextlib
+import json
+import os
+from typing import Dict, Iterator, Optional
+
+from .cache import Cache, atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows: flushes are not serialized across processes.
+    fcntl = None  # type: ignore[assignment]
+
+NAMES_FILENAME = ".names.json"
+# Held (flock) around the read-merge-write in ``flush``.
+LOCK_SUFFIX = ".lock"
+
+# Layout used before the single-file registry: .names/<kind>/<safe>.json.
+_LEGACY_DIRNAME = ".names"
+
+_REGISTRIES: Dict[str, "NameRegistry"] = {}
+
+
+class NameRegistry:
+    """
+    In-memory ``kind -> safe name -> original name`` table for one cache.
+
+    Parameters
+    ----------
+    cache : Cache
+        Cache whose root holds the registry file.
+
+    Notes
+    -----
+    Use ``NameRegistry.for_cache`` to share one instance per cache root
+    within a process. ``flush`` merges the in-memory changes into whatever is
+    on disk while holding an exclusive lock on ``.names.json.lock``, so
+    concurrent builds sharing a cache (e.g. ``lpm-prebuild`` workers) keep
+    each other's entries; for a name both of them declared, the last flush
+    wins.
+    """
+
+    def __init__(self, cache: Cache) -> None:
+        """
+        Load the registry for a cache.
+
+        Parameters
+        ----------
+        cache : Cache
+            Cache whose root holds the registry file. The resolved root is
+            used, so the registry keeps writing to the same file after the
+            process changes directory (as ``lpm-daemon`` does per client).
+        """
+        self.path = os.path.join(cache.root_real, NAMES_FILENAME)
+        self._legacy_root = os.path.join(cache.root_real, _LEGACY_DIRNAME)
+        self._names = self._read()
+        self._dirty: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def for_cache(cls, cache: Cache) -> "NameRegistry":
+        """
+        Return the process-wide registry for a cache root.
+
+        Parameters
+        ----------
+        cache : Cache
+            Cache whose registry is requested.
+
+        Returns
+        -------
+        NameRegistry
+            Shared instance; the first call loads the file and registers an
+            ``atexit`` flush.
+        """
+        key = cache.root_real
+        registry = _REGISTRIES.get(key)
+        if registry is None:
+            registry = _REGISTRIES[key] = cls(cache)
+            atexit.register(registry._flush_at_exit)
+        return registry
+
+    def _read(self) -> Dict[str, Dict[str, str]]:
+        """Read the registry file, falling back to the legacy per-name files."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            if isinstance(data, dict):
+                return {kind: dict(names) for kind, names in data.items() if isinstance(names, dict)}
+        except (OSError, ValueError):
+            pass
+        return self._read_legacy()
+
+    def _read_legacy(self) -> Dict[str, Dict[str, str]]:
+        """Import ``.names/<kind>/<safe>.json`` files written by older versions."""
+        names: Dict[str, Dict[str, str]] = {}
+        if not os.path.isdir(self._legacy_root):
+            return names
+        for kind in os.listdir(self._legacy_root):
+            kind_dir = os.path.join(self._legacy_root, kind)
+            if not os.path.isdir(kind_dir):
+                continue
+            for filename in os.listdir(kind_dir):
+                if not filename.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(kind_dir, filename), "r", encoding="utf-8") as fh:
+                        original = json.load(fh).get("original")
+                except Exception:
+                    continue
+                if isinstance(original, str):
+                    names.setdefault(kind, {})[filename[: -len(".json")]] = original
+        return names
+
+    def record(self, kind: str, safe: str, original: str) -> Optional[str]:
+        """
+        Record that ``original`` was declared under the sanitized name ``safe``.
+
+        Parameters
+        ----------
+        kind : str
+            Entity type (e.g., "path").
+        safe : str
+            Sanitized name.
+        original : str
+            Original unsanitized name.
+
+        Returns
+        -------
+        str or None
+            The original name previously recorded for ``safe`` if it differs,
+            otherwise None.
+        """
+        table = self._names.setdefault(kind, {})
+        prior = table.get(safe)
+        if prior == original:
+            return None
+        table[safe] = original
+        self._dirty.setdefault(kind, {})[safe] = original
+        return prior
+
+    def flush(self) -> None:
+        """Write pending changes to the registry file (no-op if unchanged)."""
+        if not self._dirty:
+            return
+        with _locked(self.path + LOCK_SUFFIX):
+            merged = self._read()
+            for kind, names in self._dirty.items():
+                merged.setdefault(kind, {}).update(names)
+            atomic_write(self.path, json.dumps(merged, ensure_ascii=False, sort_keys=True, separators=(",", ":")))
+        self._names = merged
+        self._dirty = {}
+
+    def _flush_at_exit(self) -> None:
+        """Flush from ``atexit``; a cache removed meanwhile is not an error."""
+        try:
+            self.flush()
+        except OSError:
+            pass
+
+
+@contextlib.contextmanager
+def _locked(path: str) -> Iterator[None]:
+    """Hold an exclusive ``flock`` on ``path`` (created if missing) where available."""
+    if fcntl is None:
+        yield
+        return
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        os.close(fd)
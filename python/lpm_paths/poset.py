@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+"""
+Containment (Bruhat) order on the lattice paths in a box.
+
+Paths with ``north`` North steps and ``east`` East steps correspond to the
+Schubert cells of a Grassmannian. Path ``L`` lies below path ``U``
+(``L <= U``) when ``U`` is weakly above ``L`` after every step, i.e. its
+prefix height is at least that of ``L`` everywhere.
+
+``U`` covers ``L`` exactly when ``U`` is obtained from ``L`` by flipping one
+inside corner (an East step followed by a North step) into an outside
+corner, which adds one cell. Covers are therefore generated straight from
+``LatticePath.insideCorners`` instead of by comparing pairs.
+
+Elements of a box are numbered by their position in increasing bitstring
+order (the order of ``enumerate.iter_between_paths`` over the whole box), so
+the number of a cover follows from the number of the lower path by adding a
+single binomial coefficient.
+"""
+
+from math import comb
+from typing import Iterator, List, Sequence, Tuple
+
+from . import bitops
+from .enumerate import iter_between_paths
+from .errors import InputSpecError
+from .types import LatticePath
+
+# Boxes with more elements than this are rejected by the box helpers.
+MAX_BOX_ELEMENTS = 250_000
+
+
+def _pair(L_bits: str, U_bits: str) -> Tuple[LatticePath, LatticePath]:
+    L = LatticePath.from_bits(L_bits)
+    U = LatticePath.from_bits(U_bits)
+    if len(L.bits) != len(U.bits) or L.bits.count("1") != U.bits.count("1"):
+        raise InputSpecError("Paths must share the same endpoint.")
+    return L, U
+
+
+def leq(L_bits: str, U_bits: str) -> bool:
+    """
+    Decide whether ``L <= U`` in the containment order.
+
+    Parameters
+    ----------
+    L_bits : str
+        Candidate lower path bitstring.
+    U_bits : str
+        Candidate upper path bitstring.
+
+    Returns
+    -------
+    bool
+        True if the prefix height of ``U`` is at least that of ``L`` after
+        every step. Runs in O(n) over the two coordinate views.
+
+    Raises
+    ------
+    InputSpecError
+        If the paths do not share the same start and end points.
+    """
+    L, U = _pair(L_bits, U_bits)
+    return all(yl <= yu for (_, yl), (_, yu) in zip(L.coords, U.coords))
+
+
+def grade(bits: str) -> int:
+    """
+    Return the rank of a path in the containment order.
+
+    Parameters
+    ----------
+    bits : str
+        Path bitstring.
+
+    Returns
+    -------
+    int
+        Number of cells between the path and the lowest path with the same
+        endpoint (all East steps first), i.e. ``east - ellmap[y]`` summed
+        over the levels.
+    """
+    lp = LatticePath.from_bits(bits)
+    return _grade(lp.bits, lp.upmarks)
+
+
+def _grade(bits: str, upmarks: Sequence[int]) -> int:
+    # Cells above the ellmap, row by row: (east - ellmap[y]) for every level.
+    north = len(upmarks)
+    east = len(bits) - north
+    return north * east - (sum(upmarks) - north * (north + 1) // 2)
+
+
+def up_covers(bits: str) -> Iterator[str]:
+    """
+    Generate the paths covering a path.
+
+    Parameters
+    ----------
+    bits : str
+        Path bitstring.
+
+    Yields
+    ------
+    str
+        One bitstring per inside corner, with its ``01`` flipped to ``10``,
+        in increasing corner order.
+    """
+    lp = LatticePath.from_bits(bits)
+    for idx in lp.insideCorners:
+        yield bits[: idx - 1] + "10" + bits[idx + 1 :]
+
+
+def down_covers(bits: str) -> Iterator[str]:
+    """
+    Generate the paths covered by a path.
+
+    Parameters
+    ----------
+    bits : str
+        Path bitstring.
+
+    Yields
+    ------
+    str
+        One bitstring per outside corner (a North step followed by an East
+        step), with its ``10`` flipped to ``01``, in increasing corner order.
+    """
+    lp = LatticePath.from_bits(bits)
+    inside = set(lp.insideCorners)
+    for idx in lp.corners:
+        if idx not in inside:
+            yield bits[: idx - 1] + "01" + bits[idx + 1 :]
+
+
+def _check_box(north: int, east: int) -> None:
+    for label, value in (("north", north), ("east", east)):
+        if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise InputSpecError(f"'{label}' must be a non-negative integer.")
+    if comb(north + east, north) > MAX_BOX_ELEMENTS:
+        raise InputSpecError(
+            f"A {north}x{east} box has {comb(north + east, north)} paths; the limit is {MAX_BOX_ELEMENTS}."
+        )
+
+
+def box_size(north: int, east: int) -> int:
+    """
+    Return the number of paths in a box.
+
+    Parameters
+    ----------
+    north : int
+        Number of North steps.
+    east : int
+        Number of East steps.
+
+    Returns
+    -------
+    int
+        ``comb(north + east, north)``.
+    """
+    return comb(north + east, north)
+
+
+def box_elements(north: int, east: int) -> Iterator[str]:
+    """
+    Generate every path of a box in element order.
+
+    Parameters
+    ----------
+    north : int
+        Number of North steps.
+    east : int
+        Number of East steps.
+
+    Returns
+    -------
+    iterator of str
+        Bitstrings in increasing order; the ``i``-th one is element ``i``.
+
+    Raises
+    ------
+    InputSpecError
+        If the sizes are invalid or the box exceeds ``MAX_BOX_ELEMENTS``.
+    """
+    _check_box(north, east)
+    return iter_between_paths("0" * east + "1" * north, "1" * north + "0" * east)
+
+
+def element_index(bits: str) -> int:
+    """
+    Return the element number of a path within its box.
+
+    Parameters
+    ----------
+    bits : str
+        Path bitstring.
+
+    Returns
+    -------
+    int
+        Position of ``bits`` among all bitstrings with the same length and
+        number of North steps, in increasing order.
+    """
+    LatticePath.from_bits(bits)
+    n, ups = len(bits), bits.count("1")
+    index = 0
+    for i, step in enumerate(bits):
+        if step == "1":
+            # Strings sharing the prefix with an East step here come first.
+            index += comb(n - 1 - i, ups)
+            ups -= 1
+    return index
+
+
+def box_covers(north: int, east: int) -> Iterator[Tuple[int, int]]:
+    """
+    Generate the cover relations of a box.
+
+    Parameters
+    ----------
+    north : int
+        Number of North steps.
+    east : int
+        Number of East steps.
+
+    Returns
+    -------
+    iterator of tuple of (int, int)
+        ``(lower, upper)`` element numbers, ordered by ``lower`` and then by
+        the position of the flipped corner.
+
+    Raises
+    ------
+    InputSpecError
+        If the sizes are invalid or the box exceeds ``MAX_BOX_ELEMENTS``.
+        Raised before the iterator is returned.
+
+    Notes
+    -----
+    Flipping the inside corner whose East step is at 0-based position ``j``
+    raises the element number by ``comb(n - 2 - j, t - 1)``, where ``t`` is
+    the number of North steps from ``j + 1`` on, so no lookup table is needed.
+    """
+    elements = box_elements(north, east)
+    return _iter_box_covers(north, east, elements)
+
+
+def _iter_box_covers(north: int, east: int, elements: Iterator[str]) -> Iterator[Tuple[int, int]]:
+    n = north + east
+    for index, bits in enumerate(elements):
+        # Enumerated bits are valid: take the inside corners straight from
+        # the bitmask engine instead of building a LatticePath per element.
+        for idx in bitops.inside_corner_indices(bits):
+            # East step at 0-based idx - 1; North steps from idx on.
+            t = north - bits.count("1", 0, idx)
+            yield index, index + comb(n - 1 - idx, t - 1)
+
+
+def box_grades(north: int, east: int) -> Iterator[int]:
+    """
+    Generate the grade of every element of a box, in element order.
+
+    Parameters
+    ----------
+    north : int
+        Number of North steps.
+    east : int
+        Number of East steps.
+
+    Returns
+    -------
+    iterator of int
+        ``grade(bits)`` for each bitstring of ``box_elements``.
+
+    Raises
+    ------
+    InputSpecError
+        If the sizes are invalid or the box exceeds ``MAX_BOX_ELEMENTS``.
+        Raised before the iterator is returned.
+    """
+    elements = box_elements(north, east)
+    return (_grade(bits, bitops.upmark_indices(bits)) for bits in elements)
+
+
+def grade_sizes(north: int, east: int) -> List[int]:
+    """
+    Count the elements of each grade in a box.
+
+    Parameters
+    ----------
+    north : int
+        Number of North steps.
+    east : int
+        Number of East steps.
+
+    Returns
+    -------
+    list[int]
+        Entry ``g`` is the number of paths with ``grade == g``: the
+        coefficients of the Gaussian binomial ``[north + east, north]_q``.
+    """
+    # sizes[j][g]: prefixes with j North steps and g cells so far.
+    sizes: List[List[int]] = [[1]] + [[] for _ in range(north)]
+    for _ in range(north + east):
+        for j in range(north, 0, -1):
+            # An East step after j North steps adds j cells; a North step adds none.
+            east_step = [0] * j + sizes[j] if sizes[j] else []
+            north_step = sizes[j - 1]
+            merged = [0] * max(len(east_step), len(north_step))
+            for g, c in enumerate(east_step):
+                merged[g] += c
+            for g, c in enumerate(north_step):
+                merged[g] += c
+            sizes[j] = merged
+    return sizes[north]
@@ -0,0 +1,385 @@
+#!/usr/bin/env python3
+"""
+Parallel pre-build of a document's declarations (``lpm-prebuild``).
+
+Usage::
+
+    lpm-prebuild [--jobs N] [--dry-run] <job>[.pytxcode]
+
+LaTeX writes every ``\\pyc`` snippet of a document to ``<job>.pytxcode``,
+and PythonTeX then runs them one after another in a single process. This
+tool reads that file first, collects the JSON specifications passed to
+``declare_path_from_json``, ``declare_paths_from_json``,
+``between_from_json`` and ``hasse_from_json``, drops duplicates, and
+generates the artifacts on all cores with a process pool. The following
+``pythontex`` run finds every artifact in the cache and only prints the
+glue.
+
+Snippets are parsed, never executed: a specification is picked up when the
+snippet assigns a literal dict to ``spec`` (or a literal list to ``specs``)
+and passes it to one of the functions above, directly or through
+``lpm_paths.client.call``, which is what the ``lpmres-python`` macros emit.
+The list comprehension that ``\\lpDeclarePaths`` assigns to ``specs`` is
+recognized too, and literal keyword arguments such as ``bundle=True`` are
+kept. Snippets that call a builder in any other way are counted as skipped
+and left for PythonTeX, like every other snippet.
+"""
+
+import argparse
+import ast
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import api
+from .cache import Cache
+from .hashing import key_of
+from .names import NameRegistry
+
+PYTXCODE_SUFFIX = ".pytxcode"
+
+# API functions whose calls are collected, by name.
+BUILDERS = ("declare_path_from_json", "declare_paths_from_json", "between_from_json", "hasse_from_json")
+
+# Work is split into this many chunks per worker to even out their load.
+CHUNKS_PER_JOB = 4
+
+_HEADER = "=>PYTHONTEX"
+
+# The ``specs`` comprehension emitted by ``\lpDeclarePaths``, around its argument.
+_PATHS_LIST = '[dict(zip(("name", "bits"), (part.strip() for part in item.rsplit("=", 1)))) for item in {!r}.split(",") if item.strip()]'
+
+
+@dataclass(frozen=True)
+class Declaration:
+    """
+    One collected API call.
+
+    Attributes
+    ----------
+    builder : str
+        Name of the API function (one of ``BUILDERS``).
+    spec_json : str
+        JSON document to pass to it.
+    options : tuple of (str, object) pairs
+        Literal keyword arguments of the call, e.g. ``(("bundle", True),)``.
+    """
+
+    builder: str
+    spec_json: str
+    options: Tuple[Tuple[str, Any], ...] = ()
+
+    @property
+    def key(self) -> str:
+        """Content key used to drop duplicate declarations."""
+        return key_of({"op": "prebuild", "builder": self.builder, "spec": json.loads(self.spec_json), "options": dict(self.options)})
+
+
+@dataclass
+class PrebuildReport:
+    """
+    Outcome of a pre-build.
+
+    Attributes
+    ----------
+    found : int
+        Declarations collected from the ``.pytxcode`` file.
+    built : int
+        Unique declarations run.
+    jobs : int
+        Worker processes used.
+    wall : float
+        Elapsed seconds for the whole build.
+    serial : float
+        Sum of the CPU time each declaration took in its worker: an estimate
+        of a serial run, not a measurement. It leaves out time spent waiting
+        on I/O, so ``speedup`` overstates the gain of a build that is not CPU
+        bound. CPU time is used so that workers sharing a core do not
+        inflate it.
+    errors : list[str]
+        One message per declaration that raised.
+    """
+
+    found: int = 0
+    built: int = 0
+    jobs: int = 1
+    wall: float = 0.0
+    serial: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def speedup(self) -> float:
+        """Estimated serial time divided by wall time (``1.0`` when nothing ran)."""
+        return self.serial / self.wall if self.wall > 0 else 1.0
+
+
+def iter_snippets(text: str) -> Iterator[str]:
+    """
+    Split the contents of a ``.pytxcode`` file into code snippets.
+
+    Parameters
+    ----------
+    text : str
+        File contents.
+
+    Yields
+    ------
+    str
+        Code of each ``=>PYTHONTEX#...`` entry, in document order. The
+        trailing settings block is skipped.
+    """
+    lines: Optional[List[str]] = None
+    for line in text.splitlines():
+        if line.startswith(_HEADER):
+            if lines:
+                yield "\n".join(lines)
+            lines = [] if line.startswith(_HEADER + "#") else None
+        elif lines is not None:
+            lines.append(line)
+    if lines:
+        yield "\n".join(lines)
+
+
+def _literal(node: ast.AST) -> Any:
+    # ``int(r"""3""")`` wraps numeric macro arguments; everything else must
+    # be a plain literal.
+    if isinstance(node, ast.Dict):
+        return {_literal(k): _literal(v) for k, v in zip(node.keys, node.values) if k is not None}
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, ast.Name)
+        and node.func.id == "int"
+        and len(node.args) == 1
+        and not node.keywords
+    ):
+        return int(_literal(node.args[0]))
+    return ast.literal_eval(node)
+
+
+def _paths_list(node: ast.ListComp) -> List[Dict[str, str]]:
+    # Only the exact comprehension of ``\lpDeclarePaths`` is evaluated.
+    source = node.generators[0].iter.func.value.value if len(node.generators) == 1 else None  # type: ignore[attr-defined]
+    if not isinstance(source, str) or ast.dump(node) != ast.dump(ast.parse(_PATHS_LIST.format(source), mode="eval").body):
+        raise ValueError("not an \\lpDeclarePaths list")
+    return [dict(zip(("name", "bits"), (part.strip() for part in item.rsplit("=", 1)))) for item in source.split(",") if item.strip()]
+
+
+def _called_builder(node: ast.AST) -> Optional[Tuple[str, ast.Call]]:
+    for call in ast.walk(node):
+        if isinstance(call, ast.Call):
+            func = call.func
+            name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+            if name == "call" and call.args and isinstance(call.args[0], ast.Constant):
+                # lpm_paths.client.call("<builder>", spec_json), as emitted by the macros.
+                name = call.args[0].value
+            if name in BUILDERS:
+                return name, call
+    return None
+
+
+def calls_builder(code: str) -> bool:
+    """
+    Tell whether a snippet calls one of ``BUILDERS``.
+
+    Parameters
+    ----------
+    code : str
+        Python code of a ``\\pyc`` snippet.
+
+    Returns
+    -------
+    bool
+        True if the snippet parses and calls a builder, whether or not
+        ``parse_snippet`` can extract its specification.
+    """
+    try:
+        return _called_builder(ast.parse(code)) is not None
+    except SyntaxError:
+        return False
+
+
+def parse_snippet(code: str) -> Optional[Declaration]:
+    """
+    Extract the declaration made by one snippet.
+
+    Parameters
+    ----------
+    code : str
+        Python code of a ``\\pyc`` snippet.
+
+    Returns
+    -------
+    Declaration or None
+        The builder, its JSON specification and literal keyword arguments,
+        or ``None`` if the snippet does not call a builder with a literal
+        ``spec`` dict or ``specs`` list (or the ``\\lpDeclarePaths`` list).
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    found = _called_builder(tree)
+    if found is None:
+        return None
+    builder, call = found
+    target = "specs" if builder == "declare_paths_from_json" else "spec"
+    for stmt in tree.body:
+        if (
+            isinstance(stmt, ast.Assign)
+            and len(stmt.targets) == 1
+            and isinstance(stmt.targets[0], ast.Name)
+            and stmt.targets[0].id == target
+            and isinstance(stmt.value, (ast.Dict, ast.List, ast.ListComp))
+        ):
+            try:
+                spec = _paths_list(stmt.value) if isinstance(stmt.value, ast.ListComp) else _literal(stmt.value)
+                options = tuple((kw.arg, ast.literal_eval(kw.value)) for kw in call.keywords if kw.arg is not None)
+            except (ValueError, TypeError, SyntaxError, AttributeError):
+                return None
+            if len(options) != len(call.keywords):
+                return None
+            return Declaration(builder, json.dumps(spec, ensure_ascii=False), options)
+    return None
+
+
+def collect_declarations(pytxcode: str) -> Tuple[List[Declaration], int, int]:
+    """
+    Read a ``.pytxcode`` file and collect its unique declarations.
+
+    Parameters
+    ----------
+    pytxcode : str
+        Path to the file.
+
+    Returns
+    -------
+    tuple of (list[Declaration], int, int)
+        Unique declarations in document order, the number found before
+        duplicates were dropped, and the number of snippets that call a
+        builder but could not be parsed (``calls_builder``), which are left
+        for PythonTeX.
+    """
+    with open(pytxcode, "r", encoding="utf-8") as fh:
+        text = fh.read()
+    unique: Dict[str, Declaration] = {}
+    found = skipped = 0
+    for code in iter_snippets(text):
+        decl = parse_snippet(code)
+        if decl is not None:
+            found += 1
+            unique.setdefault(decl.key, decl)
+        elif calls_builder(code):
+            skipped += 1
+    return list(unique.values()), found, skipped
+
+
+def _run_chunk(chunk: List[Declaration]) -> List[Tuple[float, Optional[str]]]:
+    """Run declarations in a worker; returns ``(cpu seconds, error)`` per item."""
+    results: List[Tuple[float, Optional[str]]] = []
+    for decl in chunk:
+        start = time.process_time()
+        error = None
+        try:
+            getattr(api, decl.builder)(decl.spec_json, **dict(decl.options))
+        except Exception as exc:  # reported, and left for PythonTeX to raise
+            error = f"{decl.builder}({decl.spec_json}): {exc}"
+        results.append((time.process_time() - start, error))
+    # Pool workers skip atexit handlers, so flush the name registry here.
+    NameRegistry.for_cache(Cache.make()).flush()
+    return results
+
+
+def prebuild(declarations: List[Declaration], jobs: Optional[int] = None) -> PrebuildReport:
+    """
+    Generate the artifacts of many declarations in parallel.
+
+    Parameters
+    ----------
+    declarations : list[Declaration]
+        Declarations to run; artifacts go to the default cache relative to
+        the current directory, as in PythonTeX.
+    jobs : int or None, optional
+        Number of worker processes (default: ``os.cpu_count()``). ``1`` runs
+        everything in this process.
+
+    Returns
+    -------
+    PrebuildReport
+        Counts, timings and errors. ``found`` is set to the number of
+        declarations passed in.
+    """
+    jobs = max(1, jobs or os.cpu_count() or 1)
+    report = PrebuildReport(found=len(declarations), built=len(declarations), jobs=jobs)
+    start = time.perf_counter()
+    if jobs == 1 or len(declarations) <= 1:
+        report.jobs = 1
+        results = _run_chunk(declarations)
+    else:
+        size = max(1, -(-len(declarations) // (jobs * CHUNKS_PER_JOB)))
+        chunks = [declarations[i : i + size] for i in range(0, len(declarations), size)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results = [item for part in pool.map(_run_chunk, chunks) for item in part]
+    report.wall = time.perf_counter() - start
+    report.serial = sum(seconds for seconds, _ in results)
+    report.errors = [error for _, error in results if error is not None]
+    return report
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Build the ``lpm-prebuild`` argument parser.
+
+    Returns
+    -------
+    argparse.ArgumentParser
+        Parser taking the job name and worker options.
+    """
+    parser = argparse.ArgumentParser(
+        prog="lpm-prebuild",
+        description="Generate lpmresonance artifacts for a document in parallel before running pythontex.",
+    )
+    parser.add_argument("job", help=f"LaTeX job name or path to its {PYTXCODE_SUFFIX} file")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--dry-run", action="store_true", help="list the unique declarations without building")
+    return parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Run ``lpm-prebuild`` and return its exit code."""
+    args = build_parser().parse_args(argv)
+    path = args.job if args.job.endswith(PYTXCODE_SUFFIX) else args.job + PYTXCODE_SUFFIX
+    if not os.path.isfile(path):
+        print(f"lpm-prebuild: {path} not found; run latex on the document first", file=sys.stderr)
+        return 1
+    declarations, found, skipped = collect_declarations(path)
+    # PythonTeX runs the snippets next to the document, so build there too.
+    os.chdir(os.path.dirname(os.path.abspath(path)))
+    if args.dry_run:
+        for decl in declarations:
+            options = "".join(f" {name}={value!r}" for name, value in decl.options)
+            print(f"{decl.builder} {decl.spec_json}{options}")
+        print(f"{len(declarations)} unique of {found} declarations{_skipped_note(skipped)}")
+        return 0
+    report = prebuild(declarations, jobs=args.jobs)
+    report.found = found
+    for error in report.errors:
+        print(f"lpm-prebuild: {error}", file=sys.stderr)
+    print(
+        f"built {report.built} unique of {report.found} declarations on {report.jobs} "
+        f"{'worker' if report.jobs == 1 else 'workers'} in {report.wall:.2f}s; "
+        f"builder CPU time {report.serial:.2f}s (about {report.speedup:.1f}x, I/O not included)"
+        f"{_skipped_note(skipped)}"
+    )
+    return 1 if report.errors else 0
+
+
+def _skipped_note(skipped: int) -> str:
+    return f"; {skipped} unparsed {'snippet' if skipped == 1 else 'snippets'} left for pythontex" if skipped else ""
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,405 @@
+from __future__ import annotations
+
+"""
+Opt-in per-phase tracing of emitter calls.
+
+Set ``LPM_TRACE=1`` (or pass ``trace=True`` to ``TeXEmitter``) to append one
+JSON object per declaration to ``<cache root>/.trace.jsonl``::
+
+    {"op": "path", "name": "demo", "file": "path-demo-<hash>.tex", "hit": false,
+     "total": 0.0031, "phases": {"json": 1.2e-05, "key": 2.1e-05, ...},
+     "bytes": 5120, "files": 2, "pid": 4242, "time": 1700000000.0}
+
+Times are in seconds. The phases are
+
+- ``json``: decoding the JSON specification (``lpm_paths.api``);
+- ``key``: sanitizing names and hashing the cache key (``key_of``);
+- ``probe``: checking for reusable artifacts;
+- ``parse``: ``LatticePath.from_bits``, ``between_region`` or box validation;
+- ``count``: counting the paths of a between region (``count=True``);
+- ``lod``: building level-of-detail envelopes (``lpm_paths.lod``);
+- ``render``: generating TeX and JSON text, including the annotations that
+  ``LatticePath`` derives lazily on first use;
+- ``write``: ``atomic_write_chunks`` minus the rendering it drives;
+- ``index``: logging writes and hits to the cache index;
+- ``names``: sanitized-name registry bookkeeping;
+- ``other``: whatever is left of ``total``.
+
+``bytes`` and ``files`` count the bytes written and the artifacts written or
+reused by the declaration. Declarations simplified for level of detail also
+carry ``"lod": {"paths": 1, "cell": 8, "vertices": 412, "source_vertices":
+50001}``: the number of simplified paths or polygons, the largest grid
+spacing, and the vertex counts emitted and at full resolution. ``summarize`` aggregates a trace for
+``lpm-cache stats``. Tracing is off by default and then costs one no-op
+method call per phase.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional
+
+from .cache import Cache
+
+if TYPE_CHECKING:
+    from .emitters.tex import EmitterStats
+
+TRACE_ENV = "LPM_TRACE"
+TRACE_FILENAME = ".trace.jsonl"
+
+# Phases in the order ``lpm-cache stats`` lists them.
+PHASES = ("json", "key", "probe", "parse", "count", "lod", "render", "write", "index", "names", "other")
+
+_OFF_VALUES = ("", "0", "off", "false", "no")
+
+
+def trace_enabled() -> bool:
+    """
+    Check whether ``LPM_TRACE`` asks for tracing.
+
+    Returns
+    -------
+    bool
+        True unless the variable is unset, empty, ``0``, ``off``, ``false``
+        or ``no``.
+    """
+    return os.environ.get(TRACE_ENV, "").strip().lower() not in _OFF_VALUES
+
+
+class NullTracer:
+    """Tracer used when tracing is off; every method is a no-op."""
+
+    enabled = False
+
+    def carry(self, phase: str, seconds: float) -> None:
+        pass
+
+    def start(self, op: str, name: str) -> None:
+        pass
+
+    def lap(self, phase: str) -> None:
+        pass
+
+    def timed(self, chunks: Iterable[str], phase: str) -> Iterable[str]:
+        return chunks
+
+    def lod(self, cell: int, vertices: int, source_vertices: int) -> None:
+        pass
+
+    def end(self, file: Optional[str], name: Optional[str] = None) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """
+    Per-declaration phase timer writing to the trace log of a cache.
+
+    Parameters
+    ----------
+    cache : Cache
+        Cache whose root holds ``.trace.jsonl``.
+    stats : EmitterStats
+        Counters of the emitter being traced; each record stores how much
+        they changed during the declaration.
+
+    Notes
+    -----
+    The emitter calls ``start`` when a declaration begins, ``lap(phase)``
+    after each phase (charging the time since the previous lap to it),
+    and ``end`` once the declaration is done. Records are buffered and
+    appended to the log by ``flush``, like ``CacheIndex`` events.
+    """
+
+    enabled = True
+
+    def __init__(self, cache: Cache, stats: "EmitterStats") -> None:
+        """
+        Initialize the tracer.
+
+        Parameters
+        ----------
+        cache : Cache
+            Cache whose root holds the trace log.
+        stats : EmitterStats
+            Counters of the emitter being traced.
+        """
+        self.path = os.path.join(cache.root, TRACE_FILENAME)
+        self.stats = stats
+        self._pending: List[str] = []
+        self._carried: Dict[str, float] = {}
+        self._record: Optional[Dict[str, Any]] = None
+        self._started = self._last = self._inner = self._carried_total = 0.0
+        self._base = (0, 0, 0)
+
+    def carry(self, phase: str, seconds: float) -> None:
+        """
+        Charge time spent before the next declaration starts to it.
+
+        Parameters
+        ----------
+        phase : str
+            Phase name (e.g. ``"json"`` for decoding the specification).
+        seconds : float
+            Elapsed time.
+        """
+        self._carried[phase] = self._carried.get(phase, 0.0) + seconds
+
+    def start(self, op: str, name: str) -> None:
+        """
+        Begin a declaration record, discarding any unfinished one.
+
+        Parameters
+        ----------
+        op : str
+            Declaration kind (``"path"``, ``"bundle"``, ``"between"``, ``"hasse"``).
+        name : str
+            User-facing name of the declaration.
+        """
+        self._record = {"op": op, "name": name, "phases": self._carried}
+        self._carried_total = sum(self._carried.values())
+        self._carried = {}
+        self._base = (self.stats.misses, self.stats.bytes_written, self.stats.files_touched)
+        self._inner = 0.0
+        self._started = self._last = time.perf_counter()
+
+    def lap(self, phase: str) -> None:
+        """
+        Charge the time since the previous lap to ``phase``.
+
+        Parameters
+        ----------
+        phase : str
+            Phase that just finished. Time already charged by ``timed``
+            during the interval is not counted twice.
+        """
+        if self._record is None:
+            return
+        now = time.perf_counter()
+        phases = self._record["phases"]
+        phases[phase] = phases.get(phase, 0.0) + (now - self._last - self._inner)
+        self._last = now
+        self._inner = 0.0
+
+    def timed(self, chunks: Iterable[str], phase: str) -> Iterable[str]:
+        """
+        Charge the time spent producing each chunk to ``phase``.
+
+        Parameters
+        ----------
+        chunks : iterable of str
+            Fragments consumed by ``atomic_write_chunks``.
+        phase : str
+            Phase charged for generating them (usually ``"render"``).
+
+        Returns
+        -------
+        iterable of str
+            The same fragments.
+        """
+        if self._record is None:
+            return chunks
+        return self._timed(iter(chunks), self._record["phases"], phase)
+
+    def lod(self, cell: int, vertices: int, source_vertices: int) -> None:
+        """
+        Record a level-of-detail simplification in the current declaration.
+
+        Parameters
+        ----------
+        cell : int
+            Grid spacing of the envelope.
+        vertices : int
+            Vertices emitted.
+        source_vertices : int
+            Corner-only vertices at full resolution.
+        """
+        if self._record is None:
+            return
+        lod = self._record.setdefault("lod", {"paths": 0, "cell": 0, "vertices": 0, "source_vertices": 0})
+        lod["paths"] += 1
+        lod["cell"] = max(lod["cell"], cell)
+        lod["vertices"] += vertices
+        lod["source_vertices"] += source_vertices
+
+    def _timed(self, chunks: Iterator[str], phases: Dict[str, float], phase: str) -> Iterator[str]:
+        clock = time.perf_counter
+        spent = 0.0
+        try:
+            while True:
+                t0 = clock()
+                try:
+                    chunk = next(chunks)
+                finally:
+                    spent += clock() - t0
+                yield chunk
+        except StopIteration:
+            return
+        finally:
+            phases[phase] = phases.get(phase, 0.0) + spent
+            self._inner += spent
+
+    def end(self, file: Optional[str], name: Optional[str] = None) -> None:
+        """
+        Finish the current declaration and buffer its record.
+
+        Parameters
+        ----------
+        file : str or None
+            Main artifact of the declaration, relative to the cache root.
+        name : str or None, optional
+            Replaces the name given to ``start`` (a bundle shard only knows
+            its members once its keys are computed).
+        """
+        record = self._record
+        if record is None:
+            return
+        self._record = None
+        if name is not None:
+            record["name"] = name
+        now = time.perf_counter()
+        phases = record["phases"]
+        total = now - self._started + self._carried_total
+        other = total - sum(phases.values())
+        if other > 0:
+            phases["other"] = phases.get("other", 0.0) + other
+        misses, written, touched = self._base
+        record.update(
+            file=file,
+            hit=self.stats.misses == misses,
+            total=total,
+            bytes=self.stats.bytes_written - written,
+            files=self.stats.files_touched - touched,
+            pid=os.getpid(),
+            time=time.time(),
+        )
+        self._pending.append(json.dumps(record, ensure_ascii=False, sort_keys=True))
+
+    def flush(self) -> None:
+        """Append buffered records to the trace log."""
+        if not self._pending:
+            return
+        data = "".join(line + "\n" for line in self._pending)
+        self._pending.clear()
+        with open(self.path, "a", encoding="utf-8") as fh:
+            fh.write(data)
+
+
+def load_trace(path: str) -> List[Dict[str, Any]]:
+    """
+    Read a trace log.
+
+    Parameters
+    ----------
+    path : str
+        Path of a ``.trace.jsonl`` file.
+
+    Returns
+    -------
+    list[dict]
+        Records in file order. Missing files give an empty list; lines that
+        cannot be parsed are skipped.
+    """
+    records: List[Dict[str, Any]] = []
+    try:
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and isinstance(record.get("total"), (int, float)):
+                    records.append(record)
+    except FileNotFoundError:
+        pass
+    return records
+
+
+@dataclass
+class TraceSummary:
+    """
+    Aggregated trace of many declarations.
+
+    Attributes
+    ----------
+    calls : int
+        Number of traced declarations.
+    hits, misses : int
+        Declarations answered from the cache, and rendered and written.
+    bytes_written : int
+        Bytes written by all declarations.
+    files_touched : int
+        Artifacts written or reused.
+    total : float
+        Summed declaration time in seconds.
+    ops : dict[str, int]
+        Declarations per kind.
+    phases : dict[str, float]
+        Summed time per phase, in ``PHASES`` order.
+    slowest : list[dict]
+        Records of the slowest declarations, slowest first.
+    lod : dict[str, int]
+        Level-of-detail totals: simplified ``paths``, and the ``vertices``
+        emitted for them and their ``source_vertices``.
+    """
+
+    calls: int = 0
+    hits: int = 0
+    misses: int = 0
+    bytes_written: int = 0
+    files_touched: int = 0
+    total: float = 0.0
+    ops: Dict[str, int] = field(default_factory=dict)
+    phases: Dict[str, float] = field(default_factory=dict)
+    slowest: List[Dict[str, Any]] = field(default_factory=list)
+    lod: Dict[str, int] = field(default_factory=lambda: {"paths": 0, "vertices": 0, "source_vertices": 0})
+
+
+def summarize(records: Iterable[Dict[str, Any]], top: int = 10) -> TraceSummary:
+    """
+    Aggregate trace records.
+
+    Parameters
+    ----------
+    records : iterable of dict
+        Records as returned by ``load_trace``.
+    top : int, optional
+        Number of slowest declarations to keep.
+
+    Returns
+    -------
+    TraceSummary
+        Counters, per-phase totals and the slowest declarations.
+    """
+    summary = TraceSummary()
+    phases: Dict[str, float] = {}
+    kept: List[Dict[str, Any]] = []
+    for record in records:
+        summary.calls += 1
+        if record.get("hit"):
+            summary.hits += 1
+        else:
+            summary.misses += 1
+        summary.bytes_written += int(record.get("bytes") or 0)
+        summary.files_touched += int(record.get("files") or 0)
+        summary.total += record["total"]
+        op = str(record.get("op"))
+        summary.ops[op] = summary.ops.get(op, 0) + 1
+        for phase, seconds in (record.get("phases") or {}).items():
+            phases[phase] = phases.get(phase, 0.0) + seconds
+        for counter, value in (record.get("lod") or {}).items():
+            if counter in summary.lod:
+                summary.lod[counter] += int(value)
+        kept.append(record)
+        if len(kept) > 4 * top + 64:
+            kept = sorted(kept, key=lambda r: -r["total"])[:top]
+    order = {phase: i for i, phase in enumerate(PHASES)}
+    summary.phases = dict(sorted(phases.items(), key=lambda item: (order.get(item[0], len(PHASES)), item[0])))
+    summary.slowest = sorted(kept, key=lambda r: -r["total"])[:top]
+    return summary
@@ -4,42 +4,500 @@ from __future__ import annotations
 Core types for lattice path combinatorics.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from array import array
+from heapq import merge
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Sequence, Tuple, Union, overload
+
+from . import bitops
+from .bitops import _INDEX_TYPECODE
 
 Coord = Tuple[int, int]
 Upmark = int
 
-@dataclass(frozen=True)
+# Inputs at least this long use the bitmask engine under engine="auto".
+BITMASK_THRESHOLD = 64
+
+
+class Engine(NamedTuple):
+    """
+    Set of functions that validate a bitstring and derive its annotations.
+
+    Attributes
+    ----------
+    name : str
+        Registry key in ``ENGINES``.
+    validate : callable
+        Returns True if the string holds only ``0`` and ``1``.
+    heights : callable
+        Prefix counts of North steps (``len(bits) + 1`` entries).
+    upmarks : callable
+        1-based indices of North steps.
+    corners : callable
+        Indices where the direction changes.
+    inside_corners : callable
+        Indices of East-to-North transitions.
+    """
+
+    name: str
+    validate: Callable[[str], bool]
+    heights: Callable[[str], array]
+    upmarks: Callable[[str], array]
+    corners: Callable[[str], array]
+    inside_corners: Callable[[str], array]
+
+
+def _ref_validate(bits: str) -> bool:
+    return all(b in "01" for b in bits)
+
+
+def _ref_heights(bits: str) -> array:
+    return array(_INDEX_TYPECODE, accumulate((b == "1" for b in bits), initial=0))
+
+
+def _ref_upmarks(bits: str) -> array:
+    return array(_INDEX_TYPECODE, (i for i, b in enumerate(bits, 1) if b == "1"))
+
+
+def _ref_corners(bits: str) -> array:
+    return array(_INDEX_TYPECODE, (i for i in range(1, len(bits)) if bits[i - 1] != bits[i]))
+
+
+def _ref_inside_corners(bits: str) -> array:
+    return array(_INDEX_TYPECODE, (i for i in range(1, len(bits)) if bits[i - 1] == "0" and bits[i] == "1"))
+
+
+def iter_coords(bits: str, reverse: bool = False) -> Iterator[Coord]:
+    """
+    Walk a bitstring and yield its lattice points one at a time.
+
+    Parameters
+    ----------
+    bits : str
+        Validated bitstring.
+    reverse : bool, optional
+        Walk from the endpoint back to ``(0, 0)``.
+
+    Yields
+    ------
+    Coord
+        ``len(bits) + 1`` lattice points; only the current point is kept.
+    """
+    if reverse:
+        y = bits.count("1")
+        x = len(bits) - y
+        yield (x, y)
+        for b in reversed(bits):
+            if b == "1":
+                y -= 1
+            else:
+                x -= 1
+            yield (x, y)
+        return
+    x = y = 0
+    yield (0, 0)
+    for b in bits:
+        if b == "1":
+            y += 1
+        else:
+            x += 1
+        yield (x, y)
+
+
+def _iter_matches(bits: str, pattern: str) -> Iterator[int]:
+    """Yield ``i + 1`` for every occurrence of ``pattern`` at ``bits[i]``."""
+    i = bits.find(pattern)
+    while i >= 0:
+        yield i + 1
+        i = bits.find(pattern, i + 1)
+
+
+ENGINES: Dict[str, Engine] = {
+    "reference": Engine("reference", _ref_validate, _ref_heights, _ref_upmarks, _ref_corners, _ref_inside_corners),
+    "bitmask": Engine(
+        "bitmask",
+        bitops.is_bitstring,
+        bitops.prefix_heights,
+        bitops.upmark_indices,
+        bitops.corner_indices,
+        bitops.inside_corner_indices,
+    ),
+}
+
+
+class IndexSeq(Sequence[int]):
+    """
+    Read-only integer sequence backed by a compact ``array``.
+
+    Compares equal to any sequence holding the same integers, so callers can
+    keep treating it like the list it replaces.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: array) -> None:
+        """
+        Wrap an integer array.
+
+        Parameters
+        ----------
+        data : array
+            Backing storage; it is not copied.
+        """
+        self._data = data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @overload
+    def __getitem__(self, index: int) -> int: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[int]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[int, List[int]]:
+        if isinstance(index, slice):
+            return self._data[index].tolist()
+        return self._data[index]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IndexSeq):
+            return self._data == other._data
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self._data, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(self._data.tolist())
+
+
+class CoordSeq(Sequence[Coord]):
+    """
+    Read-only coordinate sequence derived from prefix counts of North steps.
+
+    ``coords[i]`` is ``(i - ys[i], ys[i])`` where ``ys[i]`` is the number of
+    North steps among the first ``i`` steps. Tuples are created on access, so
+    the sequence costs one array entry per lattice point.
+    """
+
+    __slots__ = ("_ys",)
+
+    def __init__(self, ys: array) -> None:
+        """
+        Wrap a prefix-count array.
+
+        Parameters
+        ----------
+        ys : array
+            ``ys[i]`` is the height reached after ``i`` steps.
+        """
+        self._ys = ys
+
+    def __len__(self) -> int:
+        return len(self._ys)
+
+    @overload
+    def __getitem__(self, index: int) -> Coord: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Coord]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Coord, List[Coord]]:
+        ys = self._ys
+        if isinstance(index, slice):
+            return [(i - ys[i], ys[i]) for i in range(*index.indices(len(ys)))]
+        if index < 0:
+            index += len(ys)
+            if index < 0:
+                raise IndexError("CoordSeq index out of range")
+        y = ys[index]
+        return (index - y, y)
+
+    def __iter__(self) -> Iterator[Coord]:
+        for i, y in enumerate(self._ys):
+            yield (i - y, y)
+
+    def __reversed__(self) -> Iterator[Coord]:
+        ys = self._ys
+        for i in range(len(ys) - 1, -1, -1):
+            y = ys[i]
+            yield (i - y, y)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CoordSeq):
+            return self._ys == other._ys
+        if isinstance(other, Sequence) and not isinstance(other, str):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class EllMap(Mapping[int, int]):
+    """
+    Read-only ``y-level -> x`` mapping derived from the upmarks.
+
+    The ``y``-th North step is step ``upmarks[y-1]`` and starts at
+    ``x = upmarks[y-1] - y``, which is the first ``x`` seen at height ``y``.
+    """
+
+    __slots__ = ("_upmarks",)
+
+    def __init__(self, upmarks: Sequence[int]) -> None:
+        """
+        Wrap an upmark sequence.
+
+        Parameters
+        ----------
+        upmarks : Sequence[int]
+            1-based indices of North steps, in increasing order.
+        """
+        self._upmarks = upmarks
+
+    def __getitem__(self, level: int) -> int:
+        if not isinstance(level, int) or not 1 <= level <= len(self._upmarks):
+            raise KeyError(level)
+        return self._upmarks[level - 1] - level
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(1, len(self._upmarks) + 1))
+
+    def __len__(self) -> int:
+        return len(self._upmarks)
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+
 class LatticePath:
     """
-    Immutable lattice path with derived geometric annotations.
+    Immutable lattice path with lazily derived geometric annotations.
+
+    Only ``bits`` is stored eagerly. Each derived field is computed on first
+    access into array-backed storage and cached; instances use ``__slots__``
+    so a path costs a few machine words plus its arrays.
 
     Attributes
     ----------
     bits : str
         Binary string encoding east (0) and north (1) steps.
-    coords : list[Coord]
+    coords : CoordSeq
         Lattice coordinates along the path.
-    upmarks : list[Upmark]
+    upmarks : IndexSeq
         Indices of north steps (1-based).
-    corners : list[int]
+    corners : IndexSeq
         Indices where direction changes.
-    insideCorners : list[int]
+    insideCorners : IndexSeq
         Indices of east-to-north transitions.
-    ellmap : dict[int, int]
+    ellmap : EllMap
         Mapping from y-level to max x at that level.
+
+    Notes
+    -----
+    Paths compare and hash by ``bits``. Build instances with ``from_bits``,
+    which validates the input and picks a derivation engine; the
+    constructor trusts its argument.
     """
 
+    __slots__ = ("bits", "_engine", "_ys", "_upmarks", "_corners", "_inside")
+
     bits: str
-    coords: List[Coord]
-    upmarks: List[Upmark]
-    corners: List[int]
-    insideCorners: List[int]
-    ellmap: Dict[int, int]
+
+    def __init__(self, bits: str, engine: str = "reference") -> None:
+        """
+        Wrap an already validated bitstring.
+
+        Parameters
+        ----------
+        bits : str
+            Binary string encoding east (0) and north (1) steps.
+        engine : str, optional
+            Name of a registered engine in ``ENGINES``.
+        """
+        object.__setattr__(self, "bits", bits)
+        object.__setattr__(self, "_engine", ENGINES[engine])
+        for slot in ("_ys", "_upmarks", "_corners", "_inside"):
+            object.__setattr__(self, slot, None)
+
+    @staticmethod
+    def _prefilled(bits: str, engine: str = "bitmask", **fields: array) -> "LatticePath":
+        """
+        Build a path whose derived arrays were computed elsewhere.
+
+        Parameters
+        ----------
+        bits : str
+            Already validated bitstring.
+        engine : str, optional
+            Engine used for any field not supplied.
+        **fields : array
+            Any of ``_ys``, ``_upmarks``, ``_corners``, ``_inside``.
+
+        Returns
+        -------
+        LatticePath
+            Path with the given fields cached.
+        """
+        lp = LatticePath(bits, engine)
+        for slot, value in fields.items():
+            lp._cache(slot, value)
+        return lp
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"LatticePath is immutable; cannot set {name!r}.")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"LatticePath is immutable; cannot delete {name!r}.")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, LatticePath):
+            return self.bits == other.bits
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __repr__(self) -> str:
+        return f"LatticePath(bits={self.bits!r})"
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str, str]]:
+        return (LatticePath, (self.bits, self._engine.name))
+
+    def _cache(self, slot: str, value: Any) -> Any:
+        object.__setattr__(self, slot, value)
+        return value
+
+    @property
+    def engine(self) -> str:
+        """Name of the engine that derives this path's annotations."""
+        return self._engine.name
+
+    @property
+    def coords(self) -> CoordSeq:
+        """Lattice coordinates along the path, starting at ``(0, 0)``."""
+        ys = self._ys
+        if ys is None:
+            ys = self._cache("_ys", self._engine.heights(self.bits))
+        return CoordSeq(ys)
+
+    @property
+    def upmarks(self) -> IndexSeq:
+        """1-based indices of North steps."""
+        data = self._upmarks
+        if data is None:
+            data = self._cache("_upmarks", self._engine.upmarks(self.bits))
+        return IndexSeq(data)
+
+    @property
+    def corners(self) -> IndexSeq:
+        """Indices of steps after which the direction changes."""
+        data = self._corners
+        if data is None:
+            data = self._cache("_corners", self._engine.corners(self.bits))
+        return IndexSeq(data)
+
+    @property
+    def insideCorners(self) -> IndexSeq:
+        """Indices of East steps immediately followed by a North step."""
+        data = self._inside
+        if data is None:
+            data = self._cache("_inside", self._engine.inside_corners(self.bits))
+        return IndexSeq(data)
+
+    def iter_coords(self, reverse: bool = False) -> Iterator[Coord]:
+        """
+        Iterate over the coordinates without materializing them.
+
+        Parameters
+        ----------
+        reverse : bool, optional
+            Yield from the endpoint back to ``(0, 0)``.
+
+        Returns
+        -------
+        iterator of Coord
+            Reads already cached heights if present; otherwise walks
+            ``bits`` directly and caches nothing.
+        """
+        if self._ys is None:
+            return iter_coords(self.bits, reverse)
+        coords = CoordSeq(self._ys)
+        return reversed(coords) if reverse else iter(coords)
+
+    def iter_upmarks(self) -> Iterator[int]:
+        """
+        Iterate over the upmarks without materializing them.
+
+        Returns
+        -------
+        iterator of int
+            1-based indices of North steps, from the cache if present.
+        """
+        if self._upmarks is None:
+            return _iter_matches(self.bits, "1")
+        return iter(self._upmarks)
+
+    def iter_corners(self) -> Iterator[int]:
+        """
+        Iterate over the corners without materializing them.
+
+        Returns
+        -------
+        iterator of int
+            Indices of steps after which the direction changes, in
+            increasing order, from the cache if present.
+        """
+        if self._corners is None:
+            return merge(_iter_matches(self.bits, "01"), _iter_matches(self.bits, "10"))
+        return iter(self._corners)
+
+    def iter_inside_corners(self) -> Iterator[int]:
+        """
+        Iterate over the inside corners without materializing them.
+
+        Returns
+        -------
+        iterator of int
+            Indices of East-to-North transitions, from the cache if present.
+        """
+        if self._inside is None:
+            return _iter_matches(self.bits, "01")
+        return iter(self._inside)
+
+    @property
+    def ellmap(self) -> EllMap:
+        """Mapping from each height ``y >= 1`` to the ``x`` where it is first reached."""
+        return EllMap(self.upmarks)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Materialize every derived field as plain lists and dicts.
+
+        Returns
+        -------
+        dict[str, Any]
+            ``bits``, ``coords``, ``upmarks``, ``corners``, ``insideCorners``
+            and ``ellmap`` as built-in containers.
+        """
+        return {
+            "bits": self.bits,
+            "coords": list(self.coords),
+            "upmarks": list(self.upmarks),
+            "corners": list(self.corners),
+            "insideCorners": list(self.insideCorners),
+            "ellmap": dict(self.ellmap.items()),
+        }
 
     @staticmethod
-    def from_bits(bits: str) -> "LatticePath":
+    def from_bits(bits: str, engine: str = "auto") -> "LatticePath":
         """
         Create a lattice path from a bitstring.
 
@@ -47,58 +505,29 @@ class LatticePath:
         ----------
         bits : str
             Binary string encoding east (0) and north (1) steps.
+        engine : str, optional
+            ``"reference"`` (per-character loops), ``"bitmask"`` (big-integer
+            masks and byte-level prefix counts), or ``"auto"`` to use the
+            bitmask engine for inputs of at least ``BITMASK_THRESHOLD`` steps.
+            All engines produce identical results.
 
         Returns
         -------
         LatticePath
-            Parsed lattice path with derived annotations.
+            Parsed lattice path; derived annotations are computed on demand.
 
         Raises
         ------
         InputSpecError
-            If the string contains characters other than 0 or 1.
-        InvariantError
-            If derived path invariants do not hold.
+            If the string contains characters other than 0 or 1, or the
+            engine name is unknown.
         """
-        from .errors import InputSpecError, InvariantError
+        from .errors import InputSpecError
 
-        if any(b not in "01" for b in bits):
+        if engine == "auto":
+            engine = "bitmask" if len(bits) >= BITMASK_THRESHOLD else "reference"
+        if engine not in ENGINES:
+            raise InputSpecError(f"Unknown lattice path engine: {engine!r}.")
+        if not ENGINES[engine].validate(bits):
             raise InputSpecError("bits must be a binary string of '0' and '1'.")
-        x = y = 0
-        coords: List[Coord] = [(0, 0)]
-        upmarks: List[Upmark] = []
-        corners: List[int] = []
-        insideCorners: List[int] = []
-        prev = None
-        step_index = 0
-        for b in bits:
-            step_index += 1
-            if b == "0":
-                x += 1
-                cur = "E"
-            else:
-                y += 1
-                cur = "N"
-                upmarks.append(step_index)
-            coords.append((x, y))
-            if prev is not None and prev != cur:
-                corners.append(step_index - 1)
-            if prev == "E" and cur == "N":
-                insideCorners.append(step_index - 1)
-            prev = cur
-        ellmap: Dict[int, int] = {}
-        seenY: Dict[int, int] = {}
-        for (cx, cy) in coords:
-            if cy > 0 and cy not in seenY:
-                seenY[cy] = cx
-        if y > 0:
-            for level in range(1, y + 1):
-                ellmap[level] = seenY.get(level, 0)
-        if coords[0] != (0, 0):
-            raise InvariantError("coords[0] must be (0,0).")
-        if len(coords) != len(bits) + 1:
-            raise InvariantError("len(coords) must equal len(bits)+1.")
-        ex, ny = bits.count("0"), bits.count("1")
-        if coords[-1] != (ex, ny):
-            raise InvariantError("Endpoint mismatch with bit counts.")
-        return LatticePath(bits, coords, upmarks, corners, insideCorners, ellmap)
+        return LatticePath(bits, engine)
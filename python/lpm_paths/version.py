@@ -1,2 +1,2 @@
 __version__ = "0.0.1"  # Package version
-EMITTER_VERSION = "0.0.1"  # Cache format version
\ No newline at end of file
+EMITTER_VERSION = "0.0.5"
\ No newline at end of file
@@ -34,3 +34,40 @@ def test_between_from_json(use_temp_cache: Cache, tmp_path: Path) -> None:
     between_file = next((tmp_path / "cache").rglob("between-L-U-*.tex"))
     assert between_file.exists()
     assert "\\gdef\\lp@lastdeclaredbetweenfile" in resp
+
+
+def test_between_from_json_count(use_temp_cache: Cache, tmp_path: Path) -> None:
+    api.between_from_json(json.dumps({"L": "0000011111", "U": "1111100000", "count": True}))
+    assert next((tmp_path / "cache").rglob("between-L-U-*.tex")).exists()
+    geometry = next((tmp_path / "cache").rglob("geom-*.tex"))
+    assert "lp@between@count@@" in geometry.read_text() and "\\endcsname{252}" in geometry.read_text()
+    with pytest.raises(InputSpecError):
+        api.between_from_json(json.dumps({"L": "01", "U": "10", "count": "yes"}))
+
+
+def test_declare_paths_from_json_batches_and_dedupes(use_temp_cache: Cache, tmp_path: Path) -> None:
+    specs = [
+        {"bits": "01", "name": "a"},
+        {"bits": "0011", "name": "b"},
+        {"bits": "01", "name": "a"},
+    ]
+    resp = api.declare_paths_from_json(json.dumps(specs))
+    assert len(list((tmp_path / "cache").rglob("path-*.tex"))) == 2
+    assert resp.count("\\gdef\\lp@pathfile@a{") == 1
+    assert resp.count("\\gdef\\lp@lastdeclaredpathfile{") == 1
+    files = resp.split("\\gdef\\lp@lastdeclaredpathfiles{", 1)[1].split("}", 1)[0].split(",")
+    assert [Path(f).name.split("-")[1] for f in files] == ["a", "b"]
+
+
+def test_declare_paths_from_json_rejects_non_list(use_temp_cache: Cache) -> None:
+    with pytest.raises(InputSpecError):
+        api.declare_paths_from_json(json.dumps({"bits": "01", "name": "a"}))
+    with pytest.raises(InputSpecError):
+        api.declare_paths_from_json(json.dumps([{"bits": "01"}]))
+
+
+def test_declare_paths_from_json_bundle(use_temp_cache: Cache, tmp_path: Path) -> None:
+    specs = [{"bits": "01", "name": "a"}, {"bits": "0011", "name": "b"}]
+    resp = api.declare_paths_from_json(json.dumps(specs), bundle=True)
+    assert len(list((tmp_path / "cache").rglob("bundle-*.tex"))) == 1
+    assert "\\gdef\\lp@pathfile@b{" in resp
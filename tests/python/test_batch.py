@@ -0,0 +1,61 @@
+import json
+import random
+
+import pytest
+from lpm_paths.batch import PathBatch, has_numpy
+from lpm_paths.cache import Cache
+from lpm_paths.emitters.tex import TeXEmitter
+from lpm_paths.errors import InputSpecError
+from lpm_paths.manifest import batch_to_json_obj
+from lpm_paths.types import LatticePath
+
+BACKENDS = ["python", pytest.param("numpy", marks=pytest.mark.skipif(not has_numpy(), reason="numpy not installed"))]
+
+
+def random_bits(seed: int, count: int) -> list:
+    rng = random.Random(seed)
+    return ["".join(rng.choice("01") for _ in range(rng.randint(0, 12))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_batch_matches_lattice_path(backend):
+    bitstrings = random_bits(7, 200)
+    batch = PathBatch.from_bits(bitstrings, backend=backend)
+    assert len(batch) == len(bitstrings)
+    for i, bits in enumerate(bitstrings):
+        ref = LatticePath.from_bits(bits, engine="reference")
+        lp = batch[i]
+        assert batch.bits(i) == bits
+        assert lp.coords == ref.coords
+        assert lp.upmarks == ref.upmarks
+        assert lp.corners == ref.corners
+        assert lp.insideCorners == ref.insideCorners
+        assert lp.ellmap == ref.ellmap
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_batch_ellmap_table(backend):
+    bitstrings = ["0101", "", "110", "0011"]
+    paths, levels, xs = PathBatch.from_bits(bitstrings, backend=backend).ellmap_table()
+    rows = [(int(p), int(y), int(x)) for p, y, x in zip(paths, levels, xs)]
+    expected = [(i, y, x) for i, bits in enumerate(bitstrings) for y, x in LatticePath.from_bits(bits).ellmap.items()]
+    assert rows == expected
+
+
+def test_batch_rejects_invalid_bits():
+    with pytest.raises(InputSpecError):
+        PathBatch.from_bits(["01", "0x1"])
+    with pytest.raises(InputSpecError):
+        PathBatch.from_bits(["01"], backend="gpu")
+
+
+def test_batch_feeds_emitter_and_manifest(tmp_path):
+    batch = PathBatch.from_bits(["0101", "0011"])
+    emitter = TeXEmitter(Cache.make(str(tmp_path / "cache")))
+    glue = emitter.write_batch(batch, ["a", "b"], bundle=True)
+    assert "\\gdef\\lp@pathfile@b{" in glue
+    assert emitter.stats.misses == 2
+    shard = next((tmp_path / "cache").rglob("geom-*.json"))
+    assert json.loads(shard.read_text()) == json.loads(json.dumps(batch_to_json_obj(None, batch)))
+    with pytest.raises(InputSpecError):
+        emitter.write_batch(batch, ["a"])
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SUITE = Path(__file__).resolve().parents[2] / "benchmarks" / "suite.py"
+
+
+def _load_suite():
+    spec = importlib.util.spec_from_file_location("bench_suite", SUITE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _doc(cases: dict[str, tuple[float, float]]) -> dict:
+    return {"meta": {}, "results": {name: {"best": best, "calibration": cal} for name, (best, cal) in cases.items()}}
+
+
+def test_compare_flags_slowdowns_beyond_threshold() -> None:
+    suite = _load_suite()
+    base = _doc({"key_of/1000": (1e-3, 1e-3), "key_of/10": (1e-6, 1e-3)})
+    cur = _doc({"key_of/1000": (2e-3, 1e-3), "key_of/10": (2e-6, 1e-3)})
+    # The 10-step case doubles too, but stays below the noise floor.
+    assert suite.compare(base, cur, echo=False) == ["key_of/1000"]
+
+
+def test_compare_normalizes_by_calibration() -> None:
+    suite = _load_suite()
+    base = _doc({"key_of/1000": (1e-3, 1e-3)})
+    cur = _doc({"key_of/1000": (2e-3, 2e-3)})
+    assert suite.compare(base, cur, echo=False) == []
+    assert suite.compare(base, cur, normalize=False, echo=False) == ["key_of/1000"]
+
+
+def test_cli_run_and_compare(tmp_path: Path) -> None:
+    out = tmp_path / "run.json"
+    cmd = [sys.executable, str(SUITE)]
+    subprocess.run([*cmd, "run", "--quick", "--filter", "^sanitize_name/1000$", "--output", str(out)], check=True, capture_output=True)
+    doc = json.loads(out.read_text(encoding="utf-8"))
+    assert list(doc["results"]) == ["sanitize_name/1000"]
+    assert subprocess.run([*cmd, "compare", str(out), str(out)], capture_output=True).returncode == 0
+
+    faster = json.loads(out.read_text(encoding="utf-8"))
+    faster["results"]["sanitize_name/1000"]["best"] /= 1000
+    (tmp_path / "faster.json").write_text(json.dumps(faster), encoding="utf-8")
+    proc = subprocess.run([*cmd, "compare", str(tmp_path / "faster.json"), str(out)], capture_output=True, text=True)
+    assert proc.returncode == 1
+    assert "REGRESSION" in proc.stdout
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import itertools
+
 import pytest
-from lpm_paths.between import between_polygon
+from lpm_paths.between import between_polygon, between_region, iter_between_polygon
+from lpm_paths.enumerate import count_between
 from lpm_paths.errors import InputSpecError
+from lpm_paths.poset import leq
 
 
 def test_between_polygon_closed_loop():
@@ -17,3 +21,60 @@ def test_between_polygon_closed_loop():
 def test_between_polygon_requires_matching_endpoints():
     with pytest.raises(InputSpecError):
         between_polygon("0", "11")
+
+
+def test_iter_between_polygon_matches_list():
+    for lower, upper in [("", ""), ("0", "0"), ("0011", "0101"), ("000111", "101010")]:
+        assert list(iter_between_polygon(lower, upper)) == between_polygon(lower, upper)
+    assert between_polygon("0011", "0101") == [(0, 0), (1, 0), (1, 1), (2, 1), (2, 2), (2, 1), (2, 0), (1, 0), (0, 0)]
+
+
+def test_iter_between_polygon_validates_eagerly():
+    with pytest.raises(InputSpecError):
+        iter_between_polygon("01", "10x")
+
+
+def _shoelace(poly):
+    return abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(poly, poly[1:]))) // 2
+
+
+def _is_subsequence(short, full):
+    it = iter(full)
+    return all(v in it for v in short)
+
+
+def test_between_region_matches_full_polygon():
+    # Every comparable pair with up to 3 North and 3 East steps.
+    for n, m in itertools.product(range(4), range(4)):
+        words = ["".join(w) for w in itertools.product("01", repeat=n + m) if w.count("1") == n]
+        for lower, upper in itertools.product(words, words):
+            if not leq(lower, upper):
+                continue
+            region = between_region(lower, upper)
+            full = between_polygon(lower, upper)
+            poly = region.polygon()
+            assert poly[0] == poly[-1] == (0, 0)
+            assert _is_subsequence(poly, full) and len(poly) <= len(full)
+            cells = list(region.iter_cells())
+            assert region.area == len(cells) == len(set(cells)) == _shoelace(full)
+            assert region.count() == count_between(lower, upper)
+
+
+def test_between_region_corners_and_runs():
+    region = between_region("000111", "101010")
+    assert region.polygon() == [(0, 0), (0, 1), (1, 1), (1, 2), (2, 2), (2, 3), (3, 3), (3, 0), (0, 0)]
+    assert list(region.lower_levels) == [3, 3, 3] and list(region.upper_levels) == [0, 1, 2]
+    assert list(region.iter_row_runs()) == [(0, 2, 0), (1, 2, 1), (2, 2, 2)]
+    assert region.area == 6
+    assert between_region("", "").polygon() == [(0, 0)]
+
+
+def test_between_region_rejects_crossing_paths():
+    with pytest.raises(InputSpecError):
+        between_region("0110", "1001")
+    with pytest.raises(InputSpecError):
+        between_region("0101", "0011")
+    with pytest.raises(InputSpecError):
+        between_region("01", "011")
+    with pytest.raises(InputSpecError):
+        between_region("0a", "01")
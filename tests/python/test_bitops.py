@@ -0,0 +1,34 @@
+import random
+
+import pytest
+from lpm_paths import bitops
+from lpm_paths.errors import InputSpecError
+from lpm_paths.types import BITMASK_THRESHOLD, LatticePath
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 7, 64, 65, 300])
+def test_bitmask_engine_matches_reference(n):
+    rng = random.Random(n)
+    for _ in range(20):
+        bits = "".join(rng.choice("01") for _ in range(n))
+        ref = LatticePath.from_bits(bits, engine="reference")
+        fast = LatticePath.from_bits(bits, engine="bitmask")
+        assert fast.coords == ref.coords
+        assert fast.upmarks == ref.upmarks
+        assert fast.corners == ref.corners
+        assert fast.insideCorners == ref.insideCorners
+        assert fast.ellmap == ref.ellmap
+
+
+def test_auto_engine_switches_on_length():
+    assert LatticePath.from_bits("01").engine == "reference"
+    assert LatticePath.from_bits("0" * BITMASK_THRESHOLD).engine == "bitmask"
+
+
+def test_bitmask_validation_rejects_other_characters():
+    assert bitops.is_bitstring("0101")
+    assert not bitops.is_bitstring("01 1")
+    with pytest.raises(InputSpecError):
+        LatticePath.from_bits("01" * 100 + "2", engine="bitmask")
+    with pytest.raises(InputSpecError):
+        LatticePath.from_bits("01", engine="simd")
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import os
+import shutil
+
 import pytest
 from pathlib import Path
-from lpm_paths.cache import Cache, CacheFenceError, atomic_write
+from lpm_paths.cache import Cache, CacheFenceError, atomic_write, atomic_write_chunks, open_artifact
+from lpm_paths.emitters.tex import TeXEmitter
 
 
 def test_guard_path_rejects_escape(tmp_path: Path) -> None:
@@ -38,3 +42,69 @@ def test_atomic_write_replaces_file(tmp_path: Path) -> None:
     atomic_write(str(path), "second")
     assert path.read_text() == "second"
     assert not path.with_suffix(".txt.tmp").exists()
+
+
+def test_atomic_write_chunks_discards_partial_file(tmp_path: Path) -> None:
+    path = tmp_path / "value.txt"
+    atomic_write(str(path), "old")
+
+    def chunks():
+        yield "new "
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        atomic_write_chunks(str(path), chunks())
+    assert path.read_text() == "old"
+    assert not path.with_suffix(".txt.tmp").exists()
+    atomic_write_chunks(str(path), iter(["a", "b", "c"]))
+    assert path.read_text() == "abc"
+
+
+def test_file_plain_names_skip_resolution(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    monkeypatch.chdir(tmp_path)
+    cache = Cache.make("cache")
+    first = cache.file("path-demo-abc.tex")
+    calls = []
+    real = os.path.realpath
+    monkeypatch.setattr(os.path, "realpath", lambda p, *a, **k: calls.append(p) or real(p, *a, **k))
+    path = cache.file("path-demo-def.tex")
+    assert cache.tex_path(path) == "cache/path-demo-def.tex"
+    assert calls == []
+    assert os.path.dirname(path) == os.path.dirname(first) == real(str(tmp_path / "cache"))
+
+
+def test_file_non_plain_names_are_still_fenced(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    for name in ("..", "../escape.tex", "a/../../escape.tex", "/etc/passwd"):
+        with pytest.raises(CacheFenceError):
+            cache.file(name)
+    nested = cache.file("nested/data.txt")
+    assert cache.tex_path(nested).endswith("cache/nested/data.txt")
+
+
+def test_symlinks_in_cache_are_rejected(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "demo")
+    alias = next((tmp_path / "cache").glob("path-*.tex"))
+    target = tmp_path / "planted.tex"
+    target.write_bytes(alias.read_bytes())
+    alias.unlink()
+    alias.symlink_to(target)
+    with pytest.raises(CacheFenceError):
+        emitter.write_path("0101", "demo")
+    with pytest.raises(CacheFenceError):
+        open_artifact(str(alias))
+    with pytest.raises(CacheFenceError):
+        atomic_write(str(alias), "x")
+    assert target.read_bytes().endswith(b"\\makeatother\n")
+
+
+def test_writes_recreate_a_removed_cache(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "a")
+    shutil.rmtree(tmp_path / "cache")
+    emitter.write_path("0101", "a")
+    assert emitter.stats.misses == 2
+    assert len(list((tmp_path / "cache").glob("path-a-*.tex"))) == 1
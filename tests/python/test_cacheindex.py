@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from lpm_paths.cache import Cache
+from lpm_paths.cacheindex import CacheIndex, gc
+from lpm_paths.cachetool import main, parse_age, parse_size
+from lpm_paths.emitters.tex import TeXEmitter
+from lpm_paths.errors import InputSpecError
+
+
+def artifacts(root: Path) -> list[str]:
+    return sorted(p.name for p in root.iterdir() if p.name.startswith(("path-", "between-", "bundle-", "geom-")))
+
+
+def test_emitter_records_writes_and_hits(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "a")
+    emitter.write_path("0101", "a")
+    entries = CacheIndex(cache).load()
+    assert sorted(entries) == artifacts(tmp_path / "cache")
+    for entry in entries.values():
+        assert entry.size == os.path.getsize(tmp_path / "cache" / entry.file)
+        assert entry.accessed >= entry.created
+
+
+def test_flush_compacts_a_growing_log(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr("lpm_paths.cacheindex.COMPACT_MIN_BYTES", 2048)
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "a")
+    emitter.write_path("0011", "b")
+    log = tmp_path / "cache" / ".index.jsonl"
+    sizes = []
+    for _ in range(200):
+        emitter.write_path("0101", "a")
+        sizes.append(log.stat().st_size)
+    assert max(sizes) <= 4 * 2048 + 256
+    assert sorted(CacheIndex(cache).load()) == artifacts(tmp_path / "cache")
+
+
+def test_gc_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "old")
+    index = CacheIndex(cache)
+    entries = index.load()
+    for entry in entries.values():
+        entry.created = entry.accessed = 1000.0
+    index.compact(entries.values())
+    old = sorted(entries)
+    emitter.write_path("0011", "new")
+    new_size = sum(e.size for name, e in index.load().items() if name not in old)
+
+    preview = gc(cache, max_bytes=new_size, dry_run=True)
+    assert sorted(preview.removed) == old
+    assert len(artifacts(tmp_path / "cache")) == 6
+
+    result = gc(cache, max_bytes=new_size)
+    assert sorted(result.removed) == old
+    assert result.kept == new_size
+    assert not set(old) & set(artifacts(tmp_path / "cache"))
+    assert sorted(CacheIndex(cache).load()) == artifacts(tmp_path / "cache")
+
+
+def test_gc_keeps_geometry_of_recent_aliases(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "old")
+    emitter.write_path("0101", "new")
+    index = CacheIndex(cache)
+    entries = index.load()
+    for entry in entries.values():
+        if "-new-" not in entry.file:
+            entry.created = entry.accessed = 1000.0
+            os.utime(tmp_path / "cache" / entry.file, (1000.0, 1000.0))
+    index.compact(entries.values())
+    result = gc(cache, max_age=3600)
+    assert result.removed == [name for name in entries if "-old-" in name]
+    assert len(artifacts(tmp_path / "cache")) == 3
+
+    result = gc(cache, max_age=3600, now=time.time() + 7200)
+    assert len(result.removed) == 3
+    assert artifacts(tmp_path / "cache") == []
+
+
+def test_gc_evicts_geometry_after_its_aliases(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "a")
+    emitter.write_path("0101", "b")
+    geometry = sum(e.size for name, e in CacheIndex(cache).load().items() if name.startswith("geom-"))
+    assert len(gc(cache, max_bytes=geometry).removed) == 2
+    result = gc(cache, max_bytes=geometry - 1)
+    assert len(result.removed) == 2 and result.kept == 0
+    emitter.write_path("0101", "a")
+    assert emitter.stats.misses == 3 and emitter.stats.geometry_hits == 1
+
+
+def test_gc_max_age(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    TeXEmitter(cache).write_between("0011", "0101", "L", "U")
+    assert gc(cache, max_age=3600).removed == []
+    result = gc(cache, max_age=3600, now=time.time() + 7200)
+    assert len(result.removed) == 2
+    assert artifacts(tmp_path / "cache") == []
+    with pytest.raises(InputSpecError):
+        gc(cache, max_bytes=-1)
+
+
+def test_cli_gc(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    root = tmp_path / "cache"
+    TeXEmitter(Cache.make(str(root))).write_path("0101", "a")
+    assert main(["gc", "--root", str(root), "--max-size", "0"]) == 0
+    assert "removed 3 files" in capsys.readouterr().out
+    assert artifacts(root) == []
+    assert parse_size("2K") == 2048
+    assert parse_size("1.5MB") == 1536 * 1024
+    assert parse_age("2h") == 7200
+    assert parse_age("30") == 30
+
+
+@pytest.mark.parametrize("option, value", [("--max-size", "-5M"), ("--max-age", "-1d"), ("--max-size", "lots")])
+def test_cli_gc_rejects_bad_budgets(tmp_path: Path, capsys: pytest.CaptureFixture[str], option: str, value: str) -> None:
+    with pytest.raises(SystemExit) as exc:
+        main(["gc", "--root", str(tmp_path / "cache"), option, value])
+    assert exc.value.code == 2
+    assert "usage:" in capsys.readouterr().err
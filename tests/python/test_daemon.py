@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import stat
+import threading
+from pathlib import Path
+
+import pytest
+from lpm_paths import api, client
+from lpm_paths.daemon import DaemonServer, main
+from lpm_paths.errors import InputSpecError
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets unavailable")
+
+
+@pytest.fixture
+def daemon(tmp_path: Path, monkeypatch):
+    path = str(tmp_path / "d.sock")
+    monkeypatch.setenv(client.SOCKET_ENV, path)
+    monkeypatch.chdir(tmp_path)
+    server = DaemonServer(path)
+    thread = threading.Thread(target=server.serve, daemon=True)
+    thread.start()
+    yield server
+    client.request({"op": "stop"}, path=path, timeout=5.0)
+    thread.join(5.0)
+
+
+def test_call_falls_back_without_daemon(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "missing.sock"))
+    monkeypatch.chdir(tmp_path)
+    spec = json.dumps({"name": "demo", "bits": "0101"})
+    assert client.call("declare_path_from_json", spec) == api.declare_path_from_json(spec)
+    with pytest.raises(InputSpecError):
+        client.call("eval", spec)
+
+
+def test_daemon_serves_calls(daemon: DaemonServer, monkeypatch) -> None:
+    spec = json.dumps({"L": "0011", "U": "0101", "lname": "L", "uname": "U"})
+    glue = client.call("between_from_json", spec)
+    assert daemon.calls == 1
+    assert glue == api.between_from_json(spec)
+    specs = json.dumps([{"name": "a", "bits": "01"}, {"name": "b", "bits": "10"}])
+    assert "\\lp@lastdeclaredpathfiles" in client.call("declare_paths_from_json", specs, bundle=True)
+    assert daemon.calls == 2
+    with pytest.raises(InputSpecError, match="binary string"):
+        client.call("declare_path_from_json", json.dumps({"name": "x", "bits": "0x"}))
+    # A daemon running another emitter version is bypassed.
+    monkeypatch.setattr(client, "EMITTER_VERSION", "0.0.0")
+    client.call("declare_path_from_json", json.dumps({"name": "c", "bits": "0011"}))
+    assert daemon.calls == 2
+
+
+def test_cli_status_and_stop(daemon: DaemonServer, capsys: pytest.CaptureFixture[str]) -> None:
+    path = daemon.server_address
+    assert main(["status", "--socket", path]) == 0
+    out = capsys.readouterr().out
+    assert "calls" in out and "path memo" in out
+    with pytest.raises(OSError):
+        DaemonServer(path)
+    assert main(["stop", "--socket", path]) == 0
+    assert main(["status", "--socket", path + ".none"]) == 1
+
+
+def test_daemon_traces_when_client_asks(daemon: DaemonServer, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setenv("LPM_TRACE", "1")
+    client.call("declare_path_from_json", json.dumps({"name": "t", "bits": "0101"}))
+    assert daemon.calls == 1
+    assert (tmp_path / "lp-cache" / ".trace.jsonl").read_text().count("\n") == 1
+
+
+def test_default_socket_is_private(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv(client.SOCKET_ENV, raising=False)
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path / "run"))
+    assert client.default_socket_path() == str(tmp_path / "run" / "lpm-daemon.sock")
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    monkeypatch.setenv("TMPDIR", str(tmp_path))
+    path = client.default_socket_path()
+    assert Path(path).parent.name == f"lpm-daemon-{os.getuid()}"
+    server = DaemonServer(path)
+    try:
+        assert stat.S_IMODE(os.stat(Path(path).parent).st_mode) == 0o700
+        assert client.owned_socket(path)
+    finally:
+        server.server_close()
+    os.remove(path)
+    os.chmod(Path(path).parent, 0o755)
+    with pytest.raises(OSError, match="private"):
+        DaemonServer(path)
+
+
+def test_client_skips_foreign_or_fake_sockets(tmp_path: Path, monkeypatch) -> None:
+    fake = tmp_path / "fake.sock"
+    fake.write_text("")
+    assert not client.owned_socket(str(fake))
+    assert client.request({"op": "ping"}, path=str(fake)) is None
+    server = DaemonServer(str(tmp_path / "d.sock"))
+    uid = os.getuid()
+    monkeypatch.setattr(client.os, "getuid", lambda: uid + 1)
+    try:
+        assert not client.owned_socket(str(tmp_path / "d.sock"))
+        assert client.request({"op": "ping"}, path=str(tmp_path / "d.sock")) is None
+    finally:
+        server.server_close()
+
+
+def test_call_falls_back_when_daemon_hangs(tmp_path: Path, monkeypatch) -> None:
+    path = str(tmp_path / "hung.sock")
+    monkeypatch.setenv(client.SOCKET_ENV, path)
+    monkeypatch.setattr(client, "REPLY_TIMEOUT", 0.1)
+    monkeypatch.chdir(tmp_path)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(path)
+    listener.listen(1)
+    try:
+        spec = json.dumps({"name": "demo", "bits": "0101"})
+        assert client.call("declare_path_from_json", spec) == api.declare_path_from_json(spec)
+    finally:
+        listener.close()
@@ -1,19 +1,29 @@
 import json
+import re
 from pathlib import Path
 from lpm_paths.cache import Cache
 from lpm_paths.emitters.tex import TeXEmitter
 
 
-def make_emitter(tmp_path):
+def make_emitter(tmp_path, **kwargs):
     cache = Cache.make(str(tmp_path / "cache"))
-    return cache, TeXEmitter(cache)
+    return cache, TeXEmitter(cache, **kwargs)
+
+
+def resolve(alias_path):
+    """Text of the geometry an alias file points at, as if declared under the alias name."""
+    text = Path(alias_path).read_text()
+    ref = re.search(r"\\lp@inputgeometry\{([^}]*)\}", text).group(1)
+    names, ident = re.search(r"\\lp@alias(?:path|between)((?:\{[^}@]*\})+)\{(@[0-9a-f]+)\}", text).groups()
+    name = "@".join(re.findall(r"\{([^}]*)\}", names))
+    return (Path(alias_path).parent / Path(ref).name).read_text().replace(f"@{ident}", f"@{name}")
 
 
 def test_write_path_creates_files_and_macros(tmp_path):
     cache, emitter = make_emitter(tmp_path)
     g1, g2, g3 = emitter.write_path("0101", " Demo Name ")
     tex_file = next((tmp_path / "cache").rglob("path-*.tex"))
-    json_file = next((tmp_path / "cache").rglob("path-*.json"))
+    json_file = next((tmp_path / "cache").rglob("geom-*.json"))
     safe = "Demo_Name"
     expected_tex = cache.tex_path(str(tex_file))
     expected_json = cache.tex_path(str(json_file))
@@ -26,11 +36,16 @@ def test_write_path_creates_files_and_macros(tmp_path):
     assert f"\\gdef\\lp@lastdeclaredpathfile{{{expected_tex}}}" in g3
     assert g3.startswith("\\makeatletter")
     assert g3.rstrip().endswith("\\makeatother")
-    tex_body = tex_file.read_text()
+    alias = tex_file.read_text()
+    geometry = next((tmp_path / "cache").rglob("geom-*.tex"))
+    key = geometry.stem.split("-", 1)[1]
+    assert f"\\lp@inputgeometry{{{cache.tex_path(str(geometry))}}}{{lp@path@ready@@{key}}}" in alias
+    assert f"\\lp@aliaspath{{{safe}}}{{@{key}}}" in alias
+    tex_body = resolve(tex_file)
     assert f"\\csname lp@path@coords@{safe}" in tex_body
     assert f"\\expandafter\\gdef\\csname lp@path@ready@{safe}\\endcsname{{1}}" in tex_body
     data = json.loads(json_file.read_text())
-    assert data["name"] == " Demo Name "
+    assert "name" not in data
     assert data["bits"] == "0101"
     assert data["coords"][0] == [0, 0]
 
@@ -43,6 +58,264 @@ def test_write_between_records_polygon(tmp_path):
     assert f"\\gdef\\lp@lastdeclaredbetweenfile{{{expected}}}" in gdef
     assert gdef.startswith("\\makeatletter")
     assert gdef.rstrip().endswith("\\makeatother")
-    body = between_file.read_text()
-    assert "\\gdef\\lp@between@coords" in body
+    assert "\\lp@aliasbetween{L}{U}{@" in between_file.read_text()
+    body = resolve(between_file)
+    assert "\\gdef\\lp@between@coords" not in body
     assert "\\expandafter\\gdef\\csname lp@between@ready@L@U\\endcsname{1}" in body
+    assert "lp@between@count" not in body
+    assert "\\csname lp@between@coords@L@U\\endcsname{(0,0) (1,0) (1,1) (2,1) (2,2) (2,0) (0,0)}" in body
+    assert "\\expandafter\\gdef\\csname lp@between@area@L@U\\endcsname{1}" in body
+    assert "\\expandafter\\gdef\\csname lp@between@cells@L@U\\endcsname{1/1/0}" in body
+    emitter.write_between("0011", "0101", "L", "U", count=True)
+    counted = [f for f in (tmp_path / "cache").rglob("between-*.tex") if f != between_file]
+    assert len(counted) == 1
+    assert "\\expandafter\\gdef\\csname lp@between@count@L@U\\endcsname{2}" in resolve(counted[0])
+    assert len(list((tmp_path / "cache").rglob("geom-*.tex"))) == 2
+
+
+def test_write_path_reuses_cached_artifacts(tmp_path, monkeypatch):
+    cache, emitter = make_emitter(tmp_path)
+    first = emitter.write_path("0101", "demo")
+    assert (emitter.stats.hits, emitter.stats.misses) == (0, 1)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("cache hit must not re-render")
+
+    monkeypatch.setattr("lpm_paths.emitters.tex.LatticePath.from_bits", fail)
+    monkeypatch.setattr("lpm_paths.emitters.tex.atomic_write", fail)
+    monkeypatch.setattr("lpm_paths.emitters.tex.atomic_write_chunks", fail)
+    again = TeXEmitter(cache)
+    assert again.write_path("0101", "demo") == first
+    assert (again.stats.hits, again.stats.misses) == (1, 0)
+
+
+def test_write_path_rebuilds_truncated_artifact(tmp_path):
+    cache, emitter = make_emitter(tmp_path)
+    emitter.write_path("0101", "demo")
+    tex_file = next((tmp_path / "cache").rglob("path-*.tex"))
+    tex_file.write_text("\\makeatletter\n")
+    emitter.write_path("0101", "demo")
+    assert emitter.stats.misses == 2
+    assert tex_file.read_text().endswith("\\makeatother\n")
+
+
+def test_rename_reuses_geometry(tmp_path, monkeypatch):
+    cache, emitter = make_emitter(tmp_path)
+    emitter.write_path("0011" * 100, "old name")
+
+    def fail(*args, **kwargs):
+        raise AssertionError("a rename must not re-render the geometry")
+
+    monkeypatch.setattr("lpm_paths.emitters.tex.LatticePath.from_bits", fail)
+    monkeypatch.setattr("lpm_paths.emitters.tex.atomic_write_chunks", fail)
+    renamed = TeXEmitter(cache)
+    renamed.write_path("0011" * 100, "new name")
+    assert (renamed.stats.misses, renamed.stats.geometry_hits) == (1, 1)
+    [geometry] = (tmp_path / "cache").rglob("geom-*.tex")
+    old, new = sorted((tmp_path / "cache").rglob("path-*.tex"))
+    assert resolve(old).replace("@new_name", "@old_name") == resolve(new).replace("@new_name", "@old_name")
+    assert new.stat().st_size * 5 < geometry.stat().st_size
+
+
+def test_write_between_shares_geometry_across_names(tmp_path):
+    cache, emitter = make_emitter(tmp_path)
+    emitter.write_between("0011", "0101", "L", "U")
+    emitter.write_between("0011", "0101", "A", "B")
+    assert (emitter.stats.misses, emitter.stats.geometry_hits) == (2, 1)
+    assert len(list((tmp_path / "cache").rglob("geom-*.tex"))) == 1
+    assert len(list((tmp_path / "cache").rglob("between-*.tex"))) == 2
+
+
+def test_missing_geometry_is_rebuilt(tmp_path):
+    cache, emitter = make_emitter(tmp_path)
+    emitter.write_path("0101", "demo")
+    emitter.write_between("0011", "0101", "L", "U")
+    geometry = sorted((tmp_path / "cache").rglob("geom-*"))
+    for path in geometry:
+        path.unlink()
+    emitter.write_path("0101", "demo")
+    emitter.write_between("0011", "0101", "L", "U")
+    assert (emitter.stats.hits, emitter.stats.misses, emitter.stats.geometry_hits) == (0, 4, 0)
+    assert sorted((tmp_path / "cache").rglob("geom-*")) == geometry
+    assert all(path.read_text().endswith(("\\makeatother\n", "}")) for path in geometry)
+
+
+def test_write_between_reuses_cached_artifact(tmp_path):
+    cache, emitter = make_emitter(tmp_path)
+    first = emitter.write_between("0011", "0101", "L", "U")
+    assert emitter.write_between("0011", "0101", "L", "U") == first
+    assert (emitter.stats.hits, emitter.stats.misses) == (1, 1)
+
+
+def test_write_bundle_writes_single_shard(tmp_path):
+    cache, emitter = make_emitter(tmp_path)
+    glue = emitter.write_bundle([("0101", "a", None), ("0011", "b", None)])
+    shards = list((tmp_path / "cache").rglob("bundle-*.tex"))
+    assert len(shards) == 1
+    assert not list((tmp_path / "cache").rglob("path-*.tex"))
+    ref = cache.tex_path(str(shards[0]))
+    assert f"\\gdef\\lp@pathfile@a{{{ref}}}" in glue
+    assert f"\\gdef\\lp@lastdeclaredpathfiles{{{ref}}}" in glue
+    body = shards[0].read_text()
+    key = shards[0].stem.split("-", 1)[1]
+    assert f"\\csname lp@bundle@index@{key}\\endcsname{{a,b}}" in body
+    assert body.count("\\lp@aliaspath{") == 2
+    geometry = next((tmp_path / "cache").rglob("geom-*.tex"))
+    assert "\\lp@inputgeometry{" + cache.tex_path(str(geometry)) + "}" in body
+    assert "lp@path@ready@@" in geometry.read_text()
+    data = json.loads(geometry.with_suffix(".json").read_text())
+    assert [p["bits"] for p in data["paths"]] == ["0101", "0011"]
+    assert all("name" not in p for p in data["paths"])
+
+
+def test_write_bundle_shards_and_reuses(tmp_path):
+    cache, emitter = make_emitter(tmp_path)
+    specs = [("01", "a", None), ("0011", "b", None), ("10", "c", None)]
+    first = emitter.write_bundle(specs, shard_size=2)
+    assert len(list((tmp_path / "cache").rglob("bundle-*.tex"))) == 2
+    assert emitter.write_bundle(specs, shard_size=2) == first
+    assert (emitter.stats.hits, emitter.stats.misses) == (3, 3)
+
+
+def test_write_path_json_matches_canonical_manifest(tmp_path):
+    from lpm_paths.manifest import to_json_obj
+    from lpm_paths.types import LatticePath
+
+    cache, emitter = make_emitter(tmp_path)
+    emitter.write_path("0110100", "caf\u00e9")
+    json_file = next((tmp_path / "cache").rglob("geom-*.json"))
+    expected = json.dumps(
+        to_json_obj(None, LatticePath.from_bits("0110100")),
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    assert json_file.read_text(encoding="utf-8") == expected
+
+
+def test_write_path_streams_long_paths(tmp_path):
+    import tracemalloc
+
+    cache, emitter = make_emitter(tmp_path, emission="expanded")
+    bits = "0011" * 2_500
+    tracemalloc.start()
+    emitter.write_path(bits, "long")
+    emitter.write_between("0" * 5_000 + "1" * 5_000, bits, "L", "U")
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    tex_file = max((tmp_path / "cache").rglob("geom-*.tex"), key=lambda f: f.stat().st_size)
+    assert tex_file.stat().st_size > 500_000
+    # Materializing the rendered body would take tens of megabytes.
+    assert peak < 250_000
+
+
+def test_compact_emission_stores_lists_only(tmp_path):
+    _, compact = make_emitter(tmp_path)
+    texpath = compact._emit_path("0101", "p", None)[1]
+    body = resolve(texpath)
+    assert "\\expandafter\\gdef\\csname lp@path@upmarks@p\\endcsname{2,4}" in body
+    assert "\\expandafter\\gdef\\csname lp@path@insidecornerpoints@p\\endcsname{1/0,2/1}" in body
+    assert "\\fill" not in body and "\\node" not in body and "stepmarks" not in body
+
+    _, expanded = make_emitter(tmp_path, emission="expanded")
+    expanded_path = expanded._emit_path("0101", "p", None)[1]
+    assert expanded_path != texpath
+    expanded_body = resolve(expanded_path)
+    assert "\\node[lp/upmark label] at (1,0.5) {2};" in expanded_body
+    assert "lp@path@insidecornercoord@p@1\\endcsname{(1,0)}" in expanded_body
+    assert "insidecornerpoints" not in expanded_body
+
+    bits = "0011" * 500
+    sizes = [Path(e._emit_path(bits, "long", None)[2]).with_suffix(".tex").stat().st_size for e in (compact, expanded)]
+    assert sizes[0] * 5 < sizes[1]
+
+
+def test_corner_plot_keeps_only_corners(tmp_path):
+    _, emitter = make_emitter(tmp_path)
+    body = resolve(emitter._emit_path("0011100", "p", None)[1])
+    assert "\\csname lp@path@plot@p\\endcsname{(0,0) (2,0) (2,3) (4,3)}" in body
+    assert "\\csname lp@path@coords@p\\endcsname{(0,0) (1,0) (2,0) (2,1)" in body
+    assert "lp@path@plot@e\\endcsname{(0,0)}" in resolve(emitter._emit_path("", "e", None)[1])
+
+    _, full = make_emitter(tmp_path, corner_plot=False)
+    texpath = full._emit_path("0011100", "p", None)[1]
+    assert "lp@path@plot@" not in resolve(texpath)
+
+
+def test_lod_emits_envelope_and_keeps_full_manifest(tmp_path):
+    import pytest
+    from lpm_paths.between import between_region
+    from lpm_paths.errors import InputSpecError
+
+    bits = "0011" * 1_000
+    _, emitter = make_emitter(tmp_path, lod_max_vertices=50)
+    _, texpath, jsonpath = emitter._emit_path(bits, "p", None)
+    body = resolve(texpath)
+    assert "\\csname lp@path@lod@p\\endcsname{" in body
+    assert "upmarks" not in body and "insidecorner" not in body and "lp@path@plot@" not in body
+    coords = body.split("lp@path@coords@p\\endcsname{", 1)[1].split("}", 1)[0]
+    assert coords.startswith("(0,0) ") and coords.endswith("(2000,2000)")
+    assert len(coords.split()) <= 50
+    assert len(json.loads(Path(jsonpath).read_text())["coords"]) == 4_001
+
+    _, small = make_emitter(tmp_path, lod_max_vertices=50)
+    _, texpath, _ = small._emit_path("0011", "q", None)
+    assert "lp@path@lod@" not in resolve(texpath)
+
+    lower = "0" * 2_000 + "1" * 2_000
+    emitter.write_between(lower, bits, "L", "U")
+    between = resolve(next((tmp_path / "cache").rglob("between-*.tex")))
+    assert "lp@between@lod@L@U" in between and "lp@between@cells@L@U" not in between
+    area = between_region(lower, bits).area
+    assert f"\\csname lp@between@area@L@U\\endcsname{{{area}}}" in between
+
+    with pytest.raises(InputSpecError, match="LOD tolerance"):
+        make_emitter(tmp_path, lod_tolerance=0)
+
+
+def test_unknown_emission_mode(tmp_path):
+    import pytest
+    from lpm_paths.errors import InputSpecError
+
+    with pytest.raises(InputSpecError, match="emission mode"):
+        make_emitter(tmp_path, emission="terse")
+
+
+def test_sanitized_name_collisions_use_single_registry(tmp_path):
+    from lpm_paths.names import NameRegistry
+
+    cache, emitter = make_emitter(tmp_path)
+    g1, _, _ = emitter.write_path("01", "demo path")
+    assert "PackageWarning" not in g1
+    g1, _, _ = emitter.write_path("0011", "demo-path")
+    assert "Sanitized path name 'demo_path' collides" in g1
+    assert not (tmp_path / "cache" / ".names").exists()
+
+    emitter.names.flush()
+    fresh = NameRegistry(cache)
+    assert fresh.record("path", "demo_path", "demo-path") is None
+    assert fresh.record("path", "demo_path", "demo path") == "demo-path"
+
+
+def test_name_registry_survives_chdir(tmp_path, monkeypatch):
+    from lpm_paths.names import NameRegistry
+
+    for doc in ("a", "b"):
+        (tmp_path / doc).mkdir()
+    monkeypatch.chdir(tmp_path / "a")
+    registry = NameRegistry(Cache.make())
+    registry.record("path", "from_a", "from a")
+    monkeypatch.chdir(tmp_path / "b")
+    registry.flush()
+    assert json.loads((tmp_path / "a" / "lp-cache" / ".names.json").read_text()) == {"path": {"from_a": "from a"}}
+    assert not (tmp_path / "b" / "lp-cache").exists()
+
+
+def test_name_registry_imports_legacy_files(tmp_path):
+    from lpm_paths.names import NameRegistry
+
+    cache, _ = make_emitter(tmp_path)
+    legacy = tmp_path / "cache" / ".names" / "path"
+    legacy.mkdir(parents=True)
+    (legacy / "demo_path.json").write_text(json.dumps({"original": "demo path"}))
+    assert NameRegistry(cache).record("path", "demo_path", "demo-path") == "demo path"
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import itertools
+import math
+import tracemalloc
+from itertools import islice
+
+import pytest
+from lpm_paths import enumerate as enum
+from lpm_paths.enumerate import (
+    count_between,
+    count_levels,
+    envelope_bounds,
+    iter_between_deltas,
+    iter_between_paths,
+    level_bounds,
+)
+from lpm_paths.errors import InputSpecError
+from lpm_paths.types import LatticePath
+
+
+def _brute_between(lower: str, upper: str) -> list[str]:
+    lo = LatticePath.from_bits(lower).coords
+    hi = LatticePath.from_bits(upper).coords
+    out = []
+    for ones in itertools.combinations(range(len(lower)), lower.count("1")):
+        bits = "".join("1" if i in ones else "0" for i in range(len(lower)))
+        ys = [y for _, y in LatticePath.from_bits(bits).coords]
+        if all(lo[i][1] <= ys[i] <= hi[i][1] for i in range(len(ys))):
+            out.append(bits)
+    return sorted(out)
+
+
+def _column_heights(bits: str) -> list[int]:
+    heights, y = [], 0
+    for step in bits:
+        if step == "1":
+            y += 1
+        else:
+            heights.append(y)
+    return heights
+
+
+REGIONS = [
+    ("", ""),
+    ("000", "000"),
+    ("0011", "0101"),
+    ("0011", "1100"),
+    ("000111", "101010"),
+    ("00101101", "11010010"),
+    ("0001011", "1101000"),
+    ("00001111", "11110000"),
+]
+
+
+@pytest.mark.parametrize("lower,upper", REGIONS)
+def test_lex_order_matches_sorted_brute_force(lower, upper):
+    paths = list(iter_between_paths(lower, upper))
+    assert paths == _brute_between(lower, upper)
+    assert paths[0] == lower and paths[-1] == upper
+
+
+@pytest.mark.parametrize("lower,upper", REGIONS)
+def test_gray_order_moves_one_east_step(lower, upper):
+    paths = list(iter_between_paths(lower, upper, order="gray"))
+    assert sorted(paths) == _brute_between(lower, upper)
+    assert paths[0] == upper
+    for a, b in zip(paths, paths[1:]):
+        changed = [i for i, (x, y) in enumerate(zip(_column_heights(a), _column_heights(b))) if x != y]
+        assert len(changed) == 1
+
+
+def test_gray_order_exhaustive_small_regions():
+    # Every pair of paths with up to 3 North and 3 East steps.
+    for n, m in itertools.product(range(4), range(4)):
+        words = ["".join(w) for w in itertools.product("01", repeat=n + m) if w.count("1") == n]
+        for lower, upper in itertools.product(words, words):
+            try:
+                paths = list(iter_between_paths(lower, upper, order="gray"))
+            except InputSpecError:
+                continue
+            assert len(set(paths)) == len(paths) == len(_brute_between(lower, upper))
+            for a, b in zip(paths, paths[1:]):
+                ha, hb = _column_heights(a), _column_heights(b)
+                assert sum(x != y for x, y in zip(ha, hb)) == 1
+
+
+def test_deltas_list_only_changed_levels():
+    deltas = list(iter_between_deltas("0011", "0101"))
+    assert deltas[0].rank == 0 and deltas[0].changes == ((1, 2), (2, 2))
+    assert [d.rank for d in deltas] == list(range(len(deltas)))
+    ell = dict(deltas[0].changes)
+    for delta in deltas[1:]:
+        assert delta.changes
+        for level, x in delta.changes:
+            assert ell[level] != x
+            ell[level] = x
+    assert ell == dict(LatticePath.from_bits("0101").ellmap)
+
+
+def test_level_bounds_and_validation():
+    assert level_bounds("0011", "0101") == ([1, 2], [2, 2])
+    with pytest.raises(InputSpecError):
+        iter_between_deltas("0101", "0011")  # upper below lower; raised eagerly
+    with pytest.raises(InputSpecError):
+        iter_between_paths("01", "011")
+    with pytest.raises(InputSpecError):
+        iter_between_deltas("01", "10", order="revolving")
+
+
+def test_enumeration_memory_is_constant():
+    lower, upper = "0" * 12 + "1" * 12, "1" * 12 + "0" * 12
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in islice(iter_between_deltas(lower, upper, order="gray"), 50_000))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert count == 50_000
+    assert peak < 100_000
+
+
+@pytest.mark.parametrize("lower,upper", REGIONS)
+def test_count_matches_enumeration(lower, upper):
+    assert count_between(lower, upper) == len(_brute_between(lower, upper))
+
+
+def test_count_large_region_is_exact():
+    n = 1500
+    lower, upper = "0" * n + "1" * n, "1" * n + "0" * n
+    assert count_between(lower, upper) == math.comb(2 * n, n)
+    # Dyck paths: weakly above the staircase NENE..., counted by Catalan numbers.
+    assert count_between("10" * 200, "1" * 200 + "0" * 200) == math.comb(400, 200) // 201
+
+
+def test_count_reuses_shared_checkpoints(monkeypatch):
+    enum._COUNT_MEMO.clear()
+    upper = "1" * 300 + "0" * 301
+    assert count_between("0" * 300 + "1" * 300 + "0", upper) == math.comb(600, 300)
+    assert len(enum._COUNT_MEMO) == 300 // enum.COUNT_CHECKPOINT + 1
+    # Only the last level differs, so counting resumes from the last full checkpoint.
+    lower = "0" * 300 + "1" * 299 + "01"
+    calls = []
+    real = enum.accumulate
+    monkeypatch.setattr(enum, "accumulate", lambda xs: calls.append(1) or real(xs))
+    total = count_between(lower, upper)
+    assert len(calls) == 300 % enum.COUNT_CHECKPOINT
+    enum._COUNT_MEMO.clear()
+    assert count_between(lower, upper) == total
+
+
+def test_envelope_bounds_allow_crossing_paths():
+    assert envelope_bounds("0110", "1001") == ([0, 1], [1, 2])
+    assert count_levels(*envelope_bounds("0110", "1001")) == 4
+    with pytest.raises(InputSpecError):
+        count_levels([1, 0], [2, 2])
@@ -14,3 +14,54 @@ def test_make_lattice_path_parses_bits():
 def test_make_lattice_path_validates_bits():
     with pytest.raises(InputSpecError):
         LatticePath.from_bits("10a1")
+
+
+def test_lattice_path_derived_fields_are_lazy_and_cached():
+    lp = LatticePath.from_bits("0011010")
+    assert lp.corners == [2, 4, 5, 6]
+    assert lp.insideCorners == [2, 5]
+    assert lp.coords[2:4] == [(2, 0), (2, 1)]
+    assert list(reversed(lp.coords))[0] == (4, 3)
+    assert lp.ellmap == {1: 2, 2: 2, 3: 3}
+    assert lp.upmarks is not lp.upmarks
+    assert lp.upmarks == lp.upmarks
+
+
+def test_coords_index_bounds_match_list():
+    lp = LatticePath.from_bits("0101")
+    assert lp.coords[-5] == (0, 0)
+    for index in (-6, 5):
+        with pytest.raises(IndexError):
+            lp.coords[index]
+
+
+@pytest.mark.parametrize("bits", ["", "0", "0011010", "1100", "01" * 40])
+def test_iter_corners_matches_corners(bits):
+    fresh = LatticePath.from_bits(bits)
+    assert list(fresh.iter_corners()) == list(LatticePath.from_bits(bits).corners)
+    fresh.corners
+    assert list(fresh.iter_corners()) == list(fresh.corners)
+
+
+def test_lattice_path_is_immutable_and_hashable():
+    lp = LatticePath.from_bits("0101")
+    with pytest.raises(AttributeError):
+        lp.bits = "1"  # type: ignore[misc]
+    assert lp == LatticePath.from_bits("0101")
+    assert {lp: 1}[LatticePath.from_bits("0101")] == 1
+
+
+def test_lattice_path_memory_is_compact():
+    import tracemalloc
+
+    bits = "01" * 50_000
+    tracemalloc.start()
+    lp = LatticePath.from_bits(bits)
+    lp.coords
+    lp.upmarks
+    lp.insideCorners
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert lp.coords[-1] == (50_000, 50_000)
+    # A list of coordinate tuples alone would take several megabytes.
+    assert peak < 1_500_000
@@ -1,3 +1,7 @@
+import pytest
+
+from lpm_paths import hashing
+from lpm_paths.errors import InputSpecError
 from lpm_paths.hashing import key_of
 
 
@@ -5,4 +9,27 @@ def test_key_of_deterministic_for_equivalent_objects():
     a = {"name": "demo", "coords": [(0, 0), (1, 0)], "flags": [1, 2]}
     b = {"flags": [1, 2], "coords": [(0, 0), (1, 0)], "name": "demo"}
     assert key_of(a) == key_of(b)
-    assert len(key_of(a)) == 64
\ No newline at end of file
+    assert len(key_of(a)) == 64
+
+def test_structured_key_streams_bits_and_accepts_digests(monkeypatch):
+    fields = {"op": "path_geometry", "ver": "x"}
+    bits = "01" * 1000
+    key = hashing.structured_key(fields, {"bits": bits})
+    assert len(key) == 64
+    assert key == hashing.structured_key(dict(reversed(fields.items())), {"bits": hashing.bits_digest(bits)})
+    assert key != hashing.structured_key(fields, {"bits": bits + "0"})
+    assert key != hashing.structured_key(fields, {"other": bits})
+    assert key != key_of({**fields, "bits": bits})
+    # Long inputs are hashed in chunks with the same result.
+    monkeypatch.setattr(hashing, "_CHUNK", 7)
+    assert hashing.structured_key(fields, {"bits": bits}) == key
+    with pytest.raises(InputSpecError):
+        hashing.structured_key(fields, {"bits": b"short"})
+    with pytest.raises(InputSpecError):
+        hashing.bits_digest(None)
+
+
+def test_structured_key_depends_on_scheme(monkeypatch):
+    key = hashing.structured_key({}, {"bits": "0101"})
+    monkeypatch.setattr(hashing, "_KEY_PERSON", b"lpm-key/3")
+    assert hashing.structured_key({}, {"bits": "0101"}) != key
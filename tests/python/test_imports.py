@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+import lpm_paths
+import pytest
+
+PYTHON_DIR = Path(__file__).resolve().parents[2] / "python"
+
+# Cold ``import lpm_paths`` took about 150 ms when it loaded every submodule
+# (and NumPy); it now takes a few milliseconds. The budget leaves room for
+# slow CI machines while still catching a return to eager imports.
+IMPORT_BUDGET_MS = 50.0
+
+HEAVY = ("json", "numpy", "dataclasses", "hashlib", "lpm_paths.api", "lpm_paths.emitters.tex", "lpm_paths.types")
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(PYTHON_DIR))
+    return subprocess.run([sys.executable, *flags, "-c", code], env=env, capture_output=True, text=True, check=True)
+
+
+def _loaded_after(statement: str) -> set[str]:
+    code = f"import sys; before = set(sys.modules); {statement}; print(*sorted(set(sys.modules) - before))"
+    return set(_run(code).stdout.split())
+
+
+@pytest.mark.parametrize("statement", ["import lpm_paths", "import lpm_paths.doctor"])
+def test_entry_points_import_only_what_they_use(statement: str) -> None:
+    loaded = _loaded_after(statement)
+    assert not loaded & set(HEAVY)
+
+
+def test_client_skips_the_emitter() -> None:
+    loaded = _loaded_after("import lpm_paths.client")
+    assert "lpm_paths.client" in loaded
+    assert not loaded & {"numpy", "lpm_paths.api", "lpm_paths.emitters.tex", "tempfile", "typing"}
+
+
+def test_lazy_exports_resolve() -> None:
+    from lpm_paths.api import declare_path_from_json
+    from lpm_paths.batch import PathBatch
+
+    assert lpm_paths.declare_path_from_json is declare_path_from_json
+    assert lpm_paths.PathBatch is PathBatch
+    assert set(lpm_paths.__all__) <= set(dir(lpm_paths))
+    with pytest.raises(AttributeError):
+        lpm_paths.no_such_name
+
+
+def test_import_time_budget() -> None:
+    times = []
+    for _ in range(5):
+        log = _run("import lpm_paths", "-X", "importtime").stderr
+        line = next(line for line in reversed(log.splitlines()) if line.rstrip().endswith("| lpm_paths"))
+        times.append(int(line.split("|")[1]) / 1000)
+    assert statistics.median(times) < IMPORT_BUDGET_MS, times
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+from lpm_paths.between import between_region
+from lpm_paths.errors import InputSpecError
+from lpm_paths.lod import between_envelope, choose_cell, exact_vertices, staircase_envelope
+from lpm_paths.types import LatticePath
+
+
+def _sample(polyline):
+    """Points every half unit along a polyline."""
+    points = []
+    for (a, b), (c, d) in zip(polyline, polyline[1:]):
+        n = 2 * max(abs(c - a), abs(d - b))
+        points.extend((a + (c - a) * t / n, b + (d - b) * t / n) for t in range(n))
+    points.append(polyline[-1])
+    return points
+
+
+def _hausdorff(p, q):
+    def one_way(a, b):
+        return max(min(max(abs(x - u), abs(y - v)) for u, v in b) for x, y in a)
+
+    return max(one_way(p, q), one_way(q, p))
+
+
+def test_cell_one_gives_corner_only_path():
+    assert staircase_envelope("", 1) == [(0, 0)]
+    assert staircase_envelope("0011100", 1) == [(0, 0), (2, 0), (2, 3), (4, 3)]
+    assert exact_vertices("0011100") == 4
+
+
+def test_envelope_is_staircase_within_tolerance():
+    rng = random.Random(7)
+    for _ in range(200):
+        bits = "".join(rng.choice("01") for _ in range(rng.randint(1, 50)))
+        cell = rng.randint(1, 8)
+        env = staircase_envelope(bits, cell)
+        assert env[0] == (0, 0) and env[-1] == (bits.count("0"), bits.count("1"))
+        for (a, b), (c, d) in zip(env, env[1:]):
+            assert (a == c) != (b == d) and c >= a and d >= b
+        assert len(env) <= len(bits) // cell + 3
+        assert _hausdorff(_sample(list(LatticePath.from_bits(bits).coords)), _sample(env)) <= cell
+
+
+def test_choose_cell_respects_budget():
+    bits = "01" * 5_000
+    assert choose_cell([bits]) == 1
+    assert choose_cell([bits], tolerance=4) == 4
+    assert choose_cell(["0011"], max_vertices=8) == 1
+    cell = choose_cell([bits], max_vertices=100)
+    assert len(staircase_envelope(bits, cell)) <= 100
+    assert choose_cell([bits], tolerance=1_000, max_vertices=100) == 1_000
+    both = choose_cell([bits, bits[::-1]], max_vertices=100)
+    assert len(between_envelope(bits, bits[::-1], both)) <= 100
+    with pytest.raises(InputSpecError):
+        choose_cell([bits], tolerance=0)
+    with pytest.raises(InputSpecError):
+        choose_cell([bits], max_vertices=5)
+
+
+def test_between_envelope_matches_region_layout():
+    assert between_envelope("0011", "0101", 1) == between_region("0011", "0101").polygon()
+    assert between_envelope("", "", 3) == [(0, 0)]
+    poly = between_envelope("0" * 10 + "1" * 10, "1" * 10 + "0" * 10, 4)
+    assert poly == [(0, 0), (0, 8), (8, 8), (8, 10), (10, 10), (10, 8), (8, 8), (8, 0), (0, 0)]
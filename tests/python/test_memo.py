@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import pytest
+
+from lpm_paths.between import between_polygon
+from lpm_paths.cache import Cache
+from lpm_paths.emitters.tex import TeXEmitter
+from lpm_paths.errors import InputSpecError
+from lpm_paths.memo import PATH_MEMO, PathMemo, estimate_bytes
+from lpm_paths.types import LatticePath
+
+
+def test_interns_paths_and_counts_hits() -> None:
+    memo = PathMemo()
+    first = memo.get("0101")
+    assert memo.get("0101") is first
+    assert first == LatticePath.from_bits("0101")
+    assert (memo.stats.hits, memo.stats.misses, memo.stats.entries) == (1, 1, 1)
+    assert memo.stats.bytes == estimate_bytes("0101")
+    assert memo.get("0101", engine="reference") is not first
+    with pytest.raises(InputSpecError):
+        memo.get("01x")
+    assert "01x" not in memo and len(memo) == 1
+
+
+def test_evicts_least_recently_used_by_entries_and_bytes() -> None:
+    memo = PathMemo(max_entries=2)
+    memo.get("01")
+    memo.get("10")
+    memo.get("01")
+    memo.get("0011")
+    assert "10" not in memo and "01" in memo and memo.stats.evictions == 1
+
+    memo = PathMemo(max_bytes=estimate_bytes("0" * 1000) + estimate_bytes("1" * 10))
+    memo.get("1" * 10)
+    memo.get("0" * 1000)
+    assert len(memo) == 2
+    memo.get("0" * 999 + "1")
+    assert list(memo._paths) == ["0" * 999 + "1"]
+    memo.get("0" * 10**5)
+    assert "0" * 10**5 not in memo and memo.stats.bytes <= memo.max_bytes
+
+    memo.resize(max_entries=0)
+    assert len(memo) == 0 and memo.stats.entries == 0
+    with pytest.raises(InputSpecError, match="max_bytes"):
+        memo.resize(max_bytes=-1)
+
+
+def test_shared_by_emitter_and_between(tmp_path) -> None:
+    PATH_MEMO.clear()
+    emitter = TeXEmitter(Cache.make(str(tmp_path / "cache")))
+    emitter.write_path("0011", "L")
+    emitter.write_path("0101", "U")
+    between_polygon("0011", "0101")
+    assert (PATH_MEMO.stats.hits, PATH_MEMO.stats.misses) == (2, 2)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import json
+from collections import Counter
+
+import pytest
+from lpm_paths.cache import Cache
+from lpm_paths.emitters.tex import TeXEmitter
+from lpm_paths.errors import InputSpecError
+from lpm_paths.poset import (
+    box_covers,
+    box_elements,
+    box_size,
+    down_covers,
+    element_index,
+    grade,
+    grade_sizes,
+    leq,
+    up_covers,
+)
+
+
+def test_leq_compares_prefix_heights():
+    assert leq("0011", "0101") and leq("0101", "1100") and leq("0110", "0110")
+    assert not leq("0101", "0011")
+    # Crossing paths are incomparable.
+    assert not leq("0110", "1001") and not leq("1001", "0110")
+    with pytest.raises(InputSpecError):
+        leq("01", "011")
+
+
+@pytest.mark.parametrize("north,east", [(0, 0), (0, 3), (1, 4), (2, 2), (3, 3), (3, 4)])
+def test_box_covers_match_pairwise_comparison(north, east):
+    elements = list(box_elements(north, east))
+    assert elements == sorted(elements) and len(elements) == box_size(north, east)
+    index = {bits: i for i, bits in enumerate(elements)}
+    assert all(element_index(bits) == i for bits, i in index.items())
+    expected = {
+        (index[a], index[b])
+        for a in elements
+        for b in elements
+        if a != b and leq(a, b) and grade(b) == grade(a) + 1
+    }
+    covers = list(box_covers(north, east))
+    assert len(covers) == len(expected) and set(covers) == expected
+    for bits in elements:
+        ups = {index[u] for u in up_covers(bits)}
+        downs = {index[d] for d in down_covers(bits)}
+        assert ups == {b for a, b in expected if a == index[bits]}
+        assert downs == {a for a, b in expected if b == index[bits]}
+    counts = Counter(grade(bits) for bits in elements)
+    assert grade_sizes(north, east) == [counts[g] for g in range(north * east + 1)]
+
+
+def test_box_validation():
+    with pytest.raises(InputSpecError):
+        box_covers(-1, 2)
+    with pytest.raises(InputSpecError):
+        box_elements(20, 20)
+
+
+def test_write_hasse_streams_and_caches(tmp_path):
+    emitter = TeXEmitter(Cache.make(str(tmp_path / "cache")))
+    glue = emitter.write_hasse(2, 2, "Gr 2,4")
+    assert "\\gdef\\lp@lastdeclaredhassefile{" in glue and "\\gdef\\lp@hassejson@Gr_2_4{" in glue
+    tex = next((tmp_path / "cache").rglob("hasse-*.tex")).read_text()
+    assert "\\csname lp@hasse@nodes@Gr_2_4\\endcsname{0/0/0,1/0/1,2/-0.5/2,3/0.5/2,4/0/3,5/0/4}" in tex
+    assert "\\csname lp@hasse@edges@Gr_2_4\\endcsname{0/1,1/3,1/2,2/4,3/4,4/5}" in tex
+    assert "\\csname lp@hasse@ready@Gr_2_4\\endcsname{1}" in tex
+    data = json.loads(next((tmp_path / "cache").rglob("hasse-*.json")).read_text())
+    assert data["elements"] == list(box_elements(2, 2))
+    assert data["covers"] == [list(c) for c in box_covers(2, 2)]
+    assert data["grades"] == [0, 1, 2, 2, 3, 4]
+    assert emitter.write_hasse(2, 2, "Gr 2,4") == glue
+    assert (emitter.stats.hits, emitter.stats.misses) == (1, 1)
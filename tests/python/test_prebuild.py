@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from lpm_paths import api
+from lpm_paths.prebuild import collect_declarations, iter_snippets, main, parse_snippet
+
+TEX_SOURCE = Path(__file__).resolve().parents[2] / "tex" / "latex" / "lpmres" / "lpmres-python.code.tex"
+
+PATH_SNIPPET = (
+    'import json; from lpm_paths import declare_path_from_json; spec = {{"name": r"""{name}""", '
+    '"bits": r"""{bits}"""}}; print(declare_path_from_json(json.dumps(spec, ensure_ascii=False)))'
+)
+BETWEEN_SNIPPET = (
+    'import json; from lpm_paths import between_from_json; spec = {"L": r"""0011""", "U": r"""0101""", '
+    '"lname": r"""L""", "uname": r"""U""", "count": True}; '
+    "print(between_from_json(json.dumps(spec, ensure_ascii=False)))"
+)
+HASSE_SNIPPET = (
+    'import json; from lpm_paths.api import hasse_from_json; spec = {"name": r"""H""", '
+    '"north": int(r"""2"""), "east": int(r"""2""")}; print(hasse_from_json(json.dumps(spec, ensure_ascii=False)))'
+)
+
+
+def _write_pytxcode(path: Path, snippets: list[str]) -> None:
+    lines = []
+    for i, code in enumerate(snippets):
+        lines += [f"=>PYTHONTEX#py#default#default#0#c####doc.tex#{i + 1}#", code]
+    lines += ["=>PYTHONTEX:SETTINGS#", "version=0.18", "outputdir=pythontex-files-doc"]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_parse_snippets_and_dedupe(tmp_path: Path) -> None:
+    snippets = [
+        PATH_SNIPPET.format(name="a", bits="0101"),
+        "print(1 + 1)",
+        PATH_SNIPPET.format(name="a", bits="0101"),
+        PATH_SNIPPET.format(name="b", bits="0011"),
+        BETWEEN_SNIPPET,
+        HASSE_SNIPPET,
+    ]
+    source = tmp_path / "doc.pytxcode"
+    _write_pytxcode(source, snippets)
+    assert list(iter_snippets(source.read_text())) == snippets
+    declarations, found, skipped = collect_declarations(str(source))
+    assert (found, skipped) == (5, 0)
+    assert [d.builder for d in declarations] == [
+        "declare_path_from_json",
+        "declare_path_from_json",
+        "between_from_json",
+        "hasse_from_json",
+    ]
+    assert json.loads(declarations[2].spec_json)["count"] is True
+    assert json.loads(declarations[3].spec_json) == {"name": "H", "north": 2, "east": 2}
+    assert parse_snippet("declare_path_from_json(json.dumps(make_spec()))") is None
+    assert parse_snippet("this is not python") is None
+    via_client = parse_snippet(
+        'from lpm_paths.client import call; spec = {"name": r"""c""", "bits": r"""01"""}; '
+        'print(call("declare_path_from_json", json.dumps(spec)))'
+    )
+    assert via_client is not None and via_client.builder == "declare_path_from_json"
+
+
+def paths_snippet(items: str) -> str:
+    # The snippet ``\lpDeclarePaths`` writes, taken from the package source.
+    for line in TEX_SOURCE.read_text(encoding="utf-8").splitlines():
+        if "declare_paths_from_json" in line:
+            return line.split("\\pyc{", 1)[1].rsplit("}%", 1)[0].replace("#1", items)
+    raise AssertionError("no \\lpDeclarePaths snippet")
+
+
+def test_parse_declare_paths_lists(tmp_path: Path) -> None:
+    decl = parse_snippet(paths_snippet("a = 0101, b=0011 ,"))
+    assert decl is not None and decl.builder == "declare_paths_from_json"
+    assert json.loads(decl.spec_json) == [{"name": "a", "bits": "0101"}, {"name": "b", "bits": "0011"}]
+    assert decl.options == (("bundle", True),)
+    altered = paths_snippet("a=01").replace('rsplit("="', 'rsplit(":"')
+    assert parse_snippet(altered) is None
+    source = tmp_path / "doc.pytxcode"
+    _write_pytxcode(source, [paths_snippet("a=01"), altered, paths_snippet(" a = 01 ")])
+    declarations, found, skipped = collect_declarations(str(source))
+    assert (len(declarations), found, skipped) == (1, 2, 1)
+
+
+def test_cli_builds_cache_for_pythontex(tmp_path: Path, monkeypatch, capsys: pytest.CaptureFixture[str]) -> None:
+    source = tmp_path / "doc.pytxcode"
+    _write_pytxcode(
+        source,
+        [PATH_SNIPPET.format(name=f"p{i}", bits="01" * (i + 1)) for i in range(6)]
+        + [BETWEEN_SNIPPET, HASSE_SNIPPET, paths_snippet("q=0110,r=1001")],
+    )
+    monkeypatch.chdir(tmp_path)
+    assert main(["doc", "--jobs", "2"]) == 0
+    out = capsys.readouterr().out
+    assert "built 9 unique of 9 declarations on 2 workers" in out and "builder CPU time" in out
+    cache = tmp_path / "lp-cache"
+    assert len(list(cache.glob("bundle-*.tex"))) == 1
+    assert len(list(cache.glob("path-*.tex"))) == 6
+    assert not list(cache.glob("*.tmp"))
+    assert set(json.loads((cache / ".names.json").read_text())["path"]) == {f"p{i}" for i in range(6)} | {"q", "r"}
+
+    # The pythontex run that follows is served from the cache.
+    def fail(*args, **kwargs):
+        raise AssertionError("artifact should already be cached")
+
+    monkeypatch.setattr("lpm_paths.emitters.tex.atomic_write_chunks", fail)
+    api.declare_path_from_json(json.dumps({"name": "p3", "bits": "01" * 4}))
+    api.between_from_json(json.dumps({"L": "0011", "U": "0101", "lname": "L", "uname": "U", "count": True}))
+    api.declare_paths_from_json(json.dumps([{"name": "q", "bits": "0110"}, {"name": "r", "bits": "1001"}]), bundle=True)
+
+
+def test_cli_reports_failures(tmp_path: Path, monkeypatch, capsys: pytest.CaptureFixture[str]) -> None:
+    _write_pytxcode(tmp_path / "doc.pytxcode", [PATH_SNIPPET.format(name="bad", bits="01x")])
+    monkeypatch.chdir(tmp_path)
+    assert main([str(tmp_path / "doc.pytxcode"), "--jobs", "1"]) == 1
+    assert "declare_path_from_json" in capsys.readouterr().err
+    assert main(["missing"]) == 1
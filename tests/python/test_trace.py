@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from lpm_paths.api import between_from_json, declare_path_from_json
+from lpm_paths.cache import Cache
+from lpm_paths.cachetool import main
+from lpm_paths.emitters.tex import TeXEmitter
+from lpm_paths.trace import NULL_TRACER, PHASES, TRACE_ENV, TRACE_FILENAME, load_trace, summarize, trace_enabled
+
+
+@pytest.mark.parametrize("value, enabled", [(None, False), ("", False), ("0", False), ("off", False), ("1", True), ("yes", True)])
+def test_trace_enabled_reads_environment(monkeypatch, value: str | None, enabled: bool) -> None:
+    if value is None:
+        monkeypatch.delenv(TRACE_ENV, raising=False)
+    else:
+        monkeypatch.setenv(TRACE_ENV, value)
+    assert trace_enabled() is enabled
+
+
+def test_tracing_is_off_by_default(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.delenv(TRACE_ENV, raising=False)
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache)
+    emitter.write_path("0101", "a")
+    emitter.write_path("0101", "a")
+    assert emitter.trace is NULL_TRACER
+    assert not (tmp_path / "cache" / TRACE_FILENAME).exists()
+    sizes = sum(p.stat().st_size for pattern in ("path-*", "geom-*") for p in (tmp_path / "cache").glob(pattern))
+    assert (emitter.stats.bytes_written, emitter.stats.files_touched) == (sizes, 4)
+
+
+def test_records_phases_and_counters(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache, trace=True)
+    emitter.write_path("0011", "demo path")
+    emitter.write_path("0011", "demo path")
+    written = sum(p.stat().st_size for pattern in ("path-*", "geom-*") for p in (tmp_path / "cache").glob(pattern))
+    emitter.write_between("0011", "1100", "L", "U", count=True)
+    miss, hit, between = load_trace(str(tmp_path / "cache" / TRACE_FILENAME))
+
+    assert (miss["op"], miss["name"], miss["hit"], miss["files"]) == ("path", "demo path", False, 3)
+    assert miss["bytes"] == written
+    assert {"key", "probe", "parse", "render", "write", "index", "names"} <= set(miss["phases"])
+    assert set(miss["phases"]) <= set(PHASES)
+    assert sum(miss["phases"].values()) == pytest.approx(miss["total"])
+    assert miss["file"].startswith("path-demo_path-")
+
+    assert (hit["hit"], hit["bytes"], hit["files"]) == (True, 0, 1)
+    assert "render" not in hit["phases"]
+    assert between["op"] == "between" and "count" in between["phases"]
+
+
+def test_records_lod_vertex_counts(tmp_path: Path) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache, trace=True, lod_tolerance=10)
+    emitter.write_path("01" * 500, "big")
+    emitter.write_path("", "empty")
+    big, empty = load_trace(str(tmp_path / "cache" / TRACE_FILENAME))
+    assert big["lod"] == {"paths": 1, "cell": 10, "vertices": 101, "source_vertices": 1001}
+    assert "lod" in big["phases"] and "lod" not in empty
+    assert summarize([big, empty]).lod == {"paths": 1, "vertices": 101, "source_vertices": 1001}
+
+
+def test_api_charges_json_decoding(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(TRACE_ENV, "1")
+    declare_path_from_json(json.dumps({"bits": "0101", "name": "a"}))
+    between_from_json(json.dumps({"L": "0011", "U": "0101"}))
+    records = load_trace(str(tmp_path / "lp-cache" / TRACE_FILENAME))
+    assert [r["op"] for r in records] == ["path", "between"]
+    assert all(r["phases"]["json"] > 0 for r in records)
+
+
+def test_summarize_and_stats_cli(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    cache = Cache.make(str(tmp_path / "cache"))
+    emitter = TeXEmitter(cache, trace=True)
+    for i in range(4):
+        emitter.write_path("01" * (10 ** i), f"p{i}")
+    emitter.write_path("0101", "again")
+    emitter.write_bundle([("0011", "a", None), ("0101", "b", None)])
+    path = str(tmp_path / "cache" / TRACE_FILENAME)
+
+    summary = summarize(load_trace(path), top=2)
+    assert (summary.calls, summary.misses, summary.ops) == (6, 6, {"path": 5, "bundle": 1})
+    assert summary.bytes_written == emitter.stats.bytes_written
+    assert [r["name"] for r in summary.slowest][0] == "p3"
+    assert list(summary.phases)[0] == "key"
+
+    assert main(["stats", "--root", str(tmp_path / "cache"), "--top", "1", "--reset"]) == 0
+    out = capsys.readouterr().out
+    assert "6 declarations (bundle 1, path 5)" in out and "0 hits, 6 misses" in out
+    assert "'p3' miss" in out and "'2 paths'" not in out
+    assert not os.path.exists(path)
+    assert main(["stats", "--root", str(tmp_path / "cache")]) == 1
+    with pytest.raises(SystemExit) as exc:
+        main(["stats", "--root", str(tmp_path / "cache"), "--top", "-5"])
+    assert exc.value.code == 2 and "count must not be negative" in capsys.readouterr().err